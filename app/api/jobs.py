@@ -0,0 +1,416 @@
+import itertools
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.responses import StreamingResponse
+from app.api import profiler
+from app.api.pipeline_stats import pid_alive
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+# Shared by every uvicorn worker: any of them can answer for any job
+JOBS_DIR = BASE_DIR / "logs" / "jobs"
+MAX_JOBS = 50               # finished jobs beyond this are deleted, oldest first
+KEEPALIVE_SECONDS = 15.0
+POLL_SECONDS = 0.5          # how often followers in other workers look for new lines
+JOB_ID_PATTERN = re.compile(r"^[0-9]+-[0-9]+-[0-9]+$")
+
+# =========================
+# JOB LOG
+# =========================
+
+class JobLog:
+    """
+    Append-only line log of one job, stored as logs/jobs/<id>.log.
+
+    Offset N is the N-th line of the file, and the whole output is kept, so a
+    reader can resume from any offset it saw. The worker running the job
+    appends and wakes its own followers; followers in other workers poll the
+    file. `done` tells readers whether the job has finished writing.
+    """
+
+    def __init__(self, path, done=None):
+        self.path = Path(path)
+        self._done = done
+        self._file = None
+        self._lines = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @property
+    def owned(self):
+        return self._done is None
+
+    @property
+    def next_offset(self):
+        if self.owned:
+            with self._cond:
+                return self._lines
+        return sum(1 for _ in self._complete_lines())
+
+    @property
+    def closed(self):
+        if self.owned:
+            with self._cond:
+                return self._closed
+        return self._done()
+
+    def append(self, line):
+        with self._cond:
+            self._file.write(line.rstrip("\r\n") + "\n")
+            self._file.flush()
+            self._lines += 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._closed = True
+            self._cond.notify_all()
+
+    def _complete_lines(self, f=None):
+        """Lines that end in a newline; a line still being written by another process is left for later."""
+        if f is None:
+            try:
+                with open(self.path, "rb") as f:
+                    yield from self._complete_lines(f)
+            except FileNotFoundError:
+                pass
+            return
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                return
+            yield raw[:-1].decode("utf-8", errors="replace")
+
+    def read(self, offset=0, limit=None):
+        """Return (first offset returned, lines)."""
+        offset = max(offset, 0)
+        end = None if limit is None else offset + limit
+        return offset, list(itertools.islice(self._complete_lines(), offset, end))
+
+    def tail(self, count):
+        return list(deque(self._complete_lines(), maxlen=count))
+
+    def text(self):
+        return "".join(line + "\n" for line in self._complete_lines())
+
+    def _wait(self, timeout):
+        if self.owned:
+            with self._cond:
+                self._cond.wait(timeout)
+        else:
+            time.sleep(timeout)
+
+    def follow(self, offset=0, timeout=KEEPALIVE_SECONDS):
+        """
+        Yield (offset, line) from `offset` until the job is done and the file drained.
+        Yields (None, None) after `timeout` seconds without output so callers can send keepalives.
+        """
+        line_offset = 0
+        partial = b""
+        draining = False
+        idle_since = time.monotonic()
+        with open(self.path, "rb") as f:
+            while True:
+                raw = f.readline()
+                if raw.endswith(b"\n"):
+                    raw, partial = partial + raw, b""
+                    if line_offset >= offset:
+                        yield line_offset, raw[:-1].decode("utf-8", errors="replace")
+                    line_offset += 1
+                    idle_since = time.monotonic()
+                    continue
+                partial += raw
+                if draining:
+                    return
+                if self.closed:
+                    # One more pass picks up lines written just before the job finished
+                    draining = True
+                    continue
+                self._wait(POLL_SECONDS)
+                if time.monotonic() - idle_since >= timeout:
+                    yield None, None
+                    idle_since = time.monotonic()
+
+# =========================
+# JOBS
+# =========================
+
+class Job:
+    """
+    A job and its status, saved as logs/jobs/<id>.json next to its log.
+
+    The worker that runs the job holds the live object and rewrites the
+    status file on every change; other workers load read-only copies.
+    """
+
+    def __init__(self, job_id, name, worker=None, done=None):
+        self.id = job_id
+        self.name = name
+        self.worker = os.getpid() if worker is None else worker
+        self.status = "running"
+        self.returncode = None
+        self.pid = None
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.log = JobLog(JOBS_DIR / f"{job_id}.log", done=done)
+
+    @staticmethod
+    def status_path(job_id):
+        return JOBS_DIR / f"{job_id}.json"
+
+    @classmethod
+    def load(cls, job_id):
+        """Read-only copy of a job from its status file, or None when there is no such job."""
+        try:
+            with open(cls.status_path(job_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        job = cls(job_id, data["name"], worker=data["worker"], done=lambda: cls.finished(job_id))
+        for key in ("status", "returncode", "pid", "error", "started_at", "finished_at"):
+            setattr(job, key, data.get(key))
+        if job.status == "running" and not pid_alive(job.worker):
+            # The worker died mid-job and never wrote the final status
+            job.status = "lost"
+            job.error = f"Worker {job.worker} berhenti sebelum job selesai."
+        return job
+
+    @classmethod
+    def finished(cls, job_id):
+        job = cls.load(job_id)
+        return job is None or job.status != "running"
+
+    def current(self):
+        """Latest state: self in the worker running the job, a fresh copy elsewhere."""
+        if self.log.owned:
+            return self
+        return Job.load(self.id) or self
+
+    def save(self):
+        data = {key: value for key, value in self.to_dict().items() if not key.startswith("log_")}
+        path = self.status_path(self.id)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def set_pid(self, pid):
+        self.pid = pid
+        self.save()
+
+    def finish(self, status, returncode=None, error=None):
+        self.status = status
+        if returncode is not None:
+            self.returncode = returncode
+        self.error = error
+        self.finished_at = time.time()
+        self.save()
+        self.log.close()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "worker": self.worker,
+            "status": self.status,
+            "returncode": self.returncode,
+            "pid": self.pid,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "log_next_offset": self.log.next_offset
+        }
+
+class JobRegistry:
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, name):
+        with self._lock:
+            job = Job(f"{os.getpid()}-{int(time.time())}-{next(self._ids)}", name)
+            job.log.open()
+            job.save()
+            self._jobs[job.id] = job
+            self._prune()
+            return job
+
+    def _prune(self):
+        finished = [job for job in self._load_all() if job.status != "running"]
+        for old in sorted(finished, key=lambda j: j.started_at)[:max(len(finished) - self.max_jobs, 0)]:
+            for path in (Job.status_path(old.id), old.log.path):
+                path.unlink(missing_ok=True)
+            self._jobs.pop(old.id, None)
+
+    def _load_all(self):
+        jobs = []
+        for status_file in JOBS_DIR.glob("*.json"):
+            job = self._jobs.get(status_file.stem) or Job.load(status_file.stem)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and JOB_ID_PATTERN.match(job_id):
+            job = Job.load(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} tidak ditemukan.")
+        return job
+
+    def list(self):
+        with self._lock:
+            jobs = self._load_all()
+        return sorted(jobs, key=lambda j: j.started_at, reverse=True)
+
+    def start(self, name, target, *args):
+        """Run target(job, *args) on a background thread; exceptions mark the job as failed."""
+        job = self.create(name)
+
+        def runner():
+            try:
+                target(job, *args)
+                if job.status == "running":
+                    job.finish("succeeded")
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                job.log.append(f"[job {job.id} gagal: {detail}]")
+                job.finish("failed", error=detail)
+
+        threading.Thread(target=runner, name=f"job-{job.id}", daemon=True).start()
+        return job
+
+JOBS = JobRegistry()
+
+def run_process(job, args, cwd=None, echo=None):
+    """Run a child process, streaming its merged stdout/stderr into job.log line by line; returns the exit code."""
+    process = subprocess.Popen(
+        # Python scripts start under the profiler agent so /jobs/{id}/profile can sample them later
+        profiler.wrap_command(args),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+        # The scripts report progress with print(); unbuffered so lines reach job.log as they are written
+        env={**os.environ, "PYTHONUNBUFFERED": "1"}
+    )
+    job.set_pid(process.pid)
+    for line in iter(process.stdout.readline, ''):
+        job.log.append(line)
+        if echo is not None:
+            echo(line.strip())
+    process.stdout.close()
+    returncode = process.wait()
+    job.returncode = returncode
+    return returncode
+
+# =========================
+# STREAMING RESPONSES
+# =========================
+
+def stream_text(job, offset=0):
+    """
+    Chunked text/plain tail of a job's log; ends when the job finishes with a
+    "[job <status>: returncode <n>]" line, e.g. "[job failed: returncode 1]".
+    """
+    def generate():
+        for _, line in job.log.follow(offset):
+            if line is not None:
+                yield line + "\n"
+        # The response is already a 200, so the last line tells clients how the job ended
+        final = job.current()
+        yield f"[job {final.status}: returncode {final.returncode}]\n"
+
+    # identity encoding keeps GZipMiddleware from buffering the live tail
+    return StreamingResponse(generate(), media_type="text/plain", headers={"X-Job-Id": job.id, "Content-Encoding": "identity"})
+
+def stream_events(job, offset=0):
+    """Server-Sent Events tail; each event id is the line offset, so EventSource reconnects resume via Last-Event-ID."""
+    def generate():
+        for line_offset, line in job.log.follow(offset):
+            if line is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"id: {line_offset}\ndata: {line}\n\n"
+        yield f"event: end\ndata: {json.dumps(job.current().to_dict())}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"X-Job-Id": job.id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# =========================
+# ENDPOINTS
+# =========================
+
+@router.get("/")
+def list_jobs():
+    return [job.to_dict() for job in JOBS.list()]
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    return JOBS.get(job_id).to_dict()
+
+@router.get("/{job_id}/log")
+def get_job_log(job_id: str, offset: int = 0, follow: bool = True):
+    job = JOBS.get(job_id)
+    if follow:
+        return stream_text(job, offset)
+    start, lines = job.log.read(offset)
+    return {"offset": start, "next_offset": start + len(lines), "lines": lines, "status": job.status}
+
+@router.get("/{job_id}/events")
+def get_job_events(job_id: str, offset: int = 0, last_event_id: Optional[str] = Header(None)):
+    job = JOBS.get(job_id)
+    if last_event_id is not None and last_event_id.isdigit():
+        offset = int(last_event_id) + 1
+    return stream_events(job, offset)
+
+@router.post("/{job_id}/profile")
+def profile_job(
+    job_id: str,
+    seconds: float = Query(profiler.DEFAULT_SECONDS, gt=0, le=profiler.MAX_SECONDS),
+    interval_ms: float = Query(profiler.DEFAULT_INTERVAL * 1000, ge=profiler.MIN_INTERVAL * 1000),
+    memory: bool = Query(False, description="Also report the top tracemalloc allocation sites of the window"),
+    top: int = Query(profiler.TOP_ALLOCATIONS, ge=1, le=200),
+    format: str = Query("json", pattern="^(json|collapsed)$")
+):
+    """
+    Sample the running job's process for `seconds` and return its stacks.
+    format=collapsed returns "stack count" lines for flamegraph.pl or speedscope.
+    """
+    job = JOBS.get(job_id)
+    if job.status != "running" or job.pid is None:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} tidak sedang berjalan.")
+    try:
+        result = profiler.request_profile(job.pid, seconds, interval_ms / 1000, memory, top)
+    except profiler.ProfilerError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse(profiler.to_collapsed(result))
+    return dict(result, job_id=job.id)
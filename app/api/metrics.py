@@ -0,0 +1,70 @@
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from prometheus_client import CollectorRegistry, REGISTRY, multiprocess
+from app.api.pipeline_stats import PipelineStatsCollector, pid_alive
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+PID_FILE_PATTERN = re.compile(r"_(\d+)\.db$")
+
+# =========================
+# REGISTRY
+# =========================
+
+def multiprocess_dir():
+    return os.environ.get(MULTIPROC_DIR_ENV) or None
+
+def metrics_registry():
+    """
+    Registry to serve on /metrics.
+
+    With several uvicorn workers (PROMETHEUS_MULTIPROC_DIR set) every worker
+    writes its metric values to files in that directory, so each scrape builds
+    a fresh registry that aggregates all of them, whichever worker answers.
+    Otherwise this is the default in-process registry.
+    """
+    if multiprocess_dir() is None:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(PipelineStatsCollector())
+    return registry
+
+if multiprocess_dir() is None:
+    # Stats files written by the scraper / cleaner processes, read at scrape time
+    REGISTRY.register(PipelineStatsCollector())
+
+# =========================
+# LIFECYCLE
+# =========================
+
+def prepare_multiprocess_dir(path):
+    """Empty the metric directory before any worker starts; stale files would be summed into fresh values."""
+    path = Path(path)
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+def reap_dead_workers():
+    """Drop live-gauge files of workers that died without a clean shutdown (e.g. restarted by the supervisor)."""
+    directory = multiprocess_dir()
+    if directory is None or not Path(directory).exists():
+        return
+    pids = set()
+    for metric_file in Path(directory).glob("*.db"):
+        match = PID_FILE_PATTERN.search(metric_file.name)
+        if match:
+            pids.add(int(match.group(1)))
+    for pid in pids:
+        if pid != os.getpid() and not pid_alive(pid):
+            multiprocess.mark_process_dead(pid, directory)
+            logger.info(f"Metric file worker {pid} yang sudah mati dibersihkan.")
+
+def mark_worker_dead():
+    directory = multiprocess_dir()
+    if directory is not None:
+        multiprocess.mark_process_dead(os.getpid(), directory)
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+from pathlib import Path
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+STATS_DIR = BASE_DIR / "logs" / "stats"
+
+def read_stats_files(stats_dir=STATS_DIR):
+    """Load every stats file published by the scraping / cleaning child processes."""
+    stats = []
+    if not Path(stats_dir).exists():
+        return stats
+    for stats_file in sorted(Path(stats_dir).glob("*.json")):
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                stats.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading {stats_file}: {e}")
+    return stats
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def component_running(stats):
+    """A process that crashed never clears its "running" flag, so the publishing pid must still exist."""
+    if not stats.get("progress", {}).get("running"):
+        return False
+    pid = stats.get("pid")
+    return isinstance(pid, int) and pid_alive(pid)
+
+class PipelineStatsCollector:
+    """Expose the child processes' stats files as Prometheus metrics at scrape time."""
+
+    def __init__(self, stats_dir=STATS_DIR):
+        self.stats_dir = stats_dir
+
+    def collect(self):
+        rate = GaugeMetricFamily("scraper_request_rate", "Laju request per detik saat ini (AIMD) per host", labels=["component", "host"])
+        concurrency = GaugeMetricFamily("scraper_concurrency_limit", "Batas request paralel saat ini (AIMD) per host", labels=["component", "host"])
+        latency = GaugeMetricFamily("scraper_last_latency_seconds", "Waktu respons terakhir per host", labels=["component", "host"])
+        requests = CounterMetricFamily("scraper_requests", "Jumlah request ke host", labels=["component", "host"])
+        errors = CounterMetricFamily("scraper_request_errors", "Jumlah request gagal ke host", labels=["component", "host"])
+        backoffs = CounterMetricFamily("scraper_backoff_events", "Jumlah backoff AIMD per host", labels=["component", "host"])
+        page_bytes = GaugeMetricFamily("scraper_page_bytes_avg", "Rata-rata byte yang ditransfer per halaman", labels=["component", "profile"])
+        page_load = GaugeMetricFamily("scraper_page_load_seconds_avg", "Rata-rata waktu muat per halaman", labels=["component", "profile"])
+        pages_loaded = CounterMetricFamily("scraper_pages_loaded", "Jumlah halaman yang dimuat browser", labels=["component", "profile"])
+        running = GaugeMetricFamily("pipeline_component_running", "1 selama proses pipeline sedang berjalan", labels=["component"])
+        articles_stored = GaugeMetricFamily("scraper_articles_stored", "Jumlah artikel tersimpan (store + file lama)", labels=["component"])
+        articles_scraped = CounterMetricFamily("scraper_articles_scraped", "Artikel berhasil diambil pada run ini", labels=["component"])
+        articles_failed = CounterMetricFamily("scraper_articles_failed", "Artikel gagal diambil pada run ini", labels=["component"])
+        articles_rate = GaugeMetricFamily("scraper_articles_per_second", "Laju artikel per detik (jendela 60 detik)", labels=["component"])
+        pages_done = CounterMetricFamily("scraper_result_pages_done", "Halaman hasil issue selesai pada run ini", labels=["component"])
+        pages_remaining = GaugeMetricFamily("scraper_result_pages_remaining", "Perkiraan halaman hasil issue yang tersisa", labels=["component"])
+        issues_remaining = GaugeMetricFamily("scraper_issues_remaining", "Issue terjadwal yang belum selesai", labels=["component"])
+        articles_cleaned = GaugeMetricFamily("cleaner_articles_cleaned", "Jumlah artikel di cleaned_articles.json", labels=["component"])
+        articles_merged = GaugeMetricFamily("cleaner_articles_merged_last_run", "Artikel baru yang digabung pada run terakhir", labels=["component"])
+        cleaning_seconds = GaugeMetricFamily("cleaner_last_run_seconds", "Durasi run cleaning terakhir", labels=["component"])
+        scraped_count = GaugeMetricFamily("scraped_article_count", "Jumlah artikel hasil scraping (sebelum cleaning)")
+        cleaned_count = GaugeMetricFamily("cleaned_article_count", "Jumlah artikel setelah cleaning")
+        totals = {"scraped": 0, "cleaned": 0}
+
+        progress_metrics = (
+            ("articles_stored", articles_stored),
+            ("articles_scraped", articles_scraped),
+            ("articles_failed", articles_failed),
+            ("articles_per_second", articles_rate),
+            ("pages_done", pages_done),
+            ("pages_remaining", pages_remaining),
+            ("issues_remaining", issues_remaining),
+            ("articles_cleaned", articles_cleaned),
+            ("articles_merged_last_run", articles_merged),
+            ("seconds_last_run", cleaning_seconds),
+        )
+
+        for stats in read_stats_files(self.stats_dir):
+            component = stats.get("component", "unknown")
+            for host, snapshot in stats.get("rate_control", {}).items():
+                labels = [component, host]
+                rate.add_metric(labels, snapshot.get("rate", 0.0))
+                concurrency.add_metric(labels, snapshot.get("concurrency", 0))
+                latency.add_metric(labels, snapshot.get("last_latency", 0.0))
+                requests.add_metric(labels, snapshot.get("requests", 0))
+                errors.add_metric(labels, snapshot.get("errors", 0))
+                backoffs.add_metric(labels, snapshot.get("backoff_events", 0))
+
+            page_stats = stats.get("page_load")
+            if page_stats:
+                labels = [component, page_stats.get("profile", "unknown")]
+                page_bytes.add_metric(labels, page_stats.get("bytes_per_page", 0.0))
+                page_load.add_metric(labels, page_stats.get("load_seconds_per_page", 0.0))
+                pages_loaded.add_metric(labels, page_stats.get("pages", 0))
+
+            progress = stats.get("progress")
+            if progress:
+                totals["scraped"] += progress.get("articles_stored", 0)
+                totals["cleaned"] += progress.get("articles_cleaned", 0)
+                running.add_metric([component], 1 if component_running(stats) else 0)
+                for key, metric in progress_metrics:
+                    if key in progress:
+                        metric.add_metric([component], progress[key])
+
+        yield rate
+        yield concurrency
+        yield latency
+        yield requests
+        yield errors
+        yield backoffs
+        yield page_bytes
+        yield page_load
+        yield pages_loaded
+        scraped_count.add_metric([], totals["scraped"])
+        cleaned_count.add_metric([], totals["cleaned"])
+        yield scraped_count
+        yield cleaned_count
+        yield running
+        for _, metric in progress_metrics:
+            yield metric
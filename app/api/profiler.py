@@ -0,0 +1,240 @@
+import atexit
+import json
+import os
+import runpy
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+# Standard library only: job child processes start through this file without the API's dependencies
+
+SOCKET_DIR = Path(os.environ.get("JOB_PROFILER_DIR") or Path(tempfile.gettempdir()) / "job-profiler")
+ENABLED = os.environ.get("JOB_PROFILER", "on").lower() not in ("0", "off", "false", "no")
+
+DEFAULT_SECONDS = 10.0
+MAX_SECONDS = 120.0
+DEFAULT_INTERVAL = 0.01     # 100 samples per second
+MIN_INTERVAL = 0.001
+MAX_STACK_DEPTH = 128
+TOP_FRAMES = 20
+TOP_ALLOCATIONS = 20
+MAX_REQUEST_BYTES = 4096
+
+class ProfilerError(Exception):
+    pass
+
+LAUNCHER_FILES = {__file__, runpy.__file__, "<frozen runpy>"}
+
+def socket_path(pid):
+    return SOCKET_DIR / f"{pid}.sock"
+
+# =========================
+# SAMPLING (child side)
+# =========================
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+def collapse(frame):
+    """Root-first frame labels of one stack, joined the way flame graph tools expect."""
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    # The main thread starts in run_script and runpy; the job's own frames are what matter
+    while len(frames) > 1 and frames[0].f_code.co_filename in LAUNCHER_FILES:
+        frames.pop(0)
+    return ";".join(frame_label(frame) for frame in frames)
+
+def sample_stacks(seconds, interval, skip_threads):
+    """
+    Sample every thread's Python stack with sys._current_frames() for `seconds`.
+    Returns {"thread;outer frame;...;inner frame": samples}, the collapsed format
+    flamegraph.pl and speedscope read.
+    """
+    stacks = Counter()
+    samples = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident in skip_threads:
+                continue
+            name = names.get(ident, f"thread-{ident}")
+            stacks[f"{name};{collapse(frame)}"] += 1
+        samples += 1
+        time.sleep(interval)
+    return stacks, samples
+
+def top_allocations(snapshot, limit):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+def profile(request, skip_threads):
+    seconds = min(max(float(request.get("seconds", DEFAULT_SECONDS)), 0.1), MAX_SECONDS)
+    interval = max(float(request.get("interval", DEFAULT_INTERVAL)), MIN_INTERVAL)
+    memory = bool(request.get("memory", False))
+
+    # tracemalloc only sees allocations made while it runs, so the snapshot
+    # shows what this window allocated and still holds at its end
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        stacks, samples = sample_stacks(seconds, interval, skip_threads)
+        allocations = None
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            allocations = {
+                "traced_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": top_allocations(tracemalloc.take_snapshot(), int(request.get("top", TOP_ALLOCATIONS)))
+            }
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    # Self samples per innermost frame: the hot spots without drawing the graph
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+
+    return {
+        "pid": os.getpid(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "interval": interval,
+        "samples": samples,
+        "stacks": dict(stacks.most_common()),
+        "top_frames": [{"frame": frame, "samples": count} for frame, count in leaves.most_common(TOP_FRAMES)],
+        "memory": allocations
+    }
+
+class Agent:
+    """Listens on the process's socket; one profile at a time, answered on the same connection."""
+
+    def __init__(self, path):
+        self.path = path
+        self.busy = threading.Lock()
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def start(self):
+        SOCKET_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # A leftover socket with our pid belongs to a dead process
+        self.path.unlink(missing_ok=True)
+        self.server.bind(str(self.path))
+        self.server.listen()
+        atexit.register(self.path.unlink, missing_ok=True)
+        threading.Thread(target=self.serve, name="job-profiler", daemon=True).start()
+
+    def serve(self):
+        while True:
+            connection, _ = self.server.accept()
+            threading.Thread(target=self.handle, args=(connection,), name="job-profiler-request", daemon=True).start()
+
+    def handle(self, connection):
+        with connection:
+            try:
+                request = json.loads(connection.makefile("r", encoding="utf-8").readline(MAX_REQUEST_BYTES))
+                if not self.busy.acquire(blocking=False):
+                    response = {"error": "busy"}
+                else:
+                    try:
+                        skip = {thread.ident for thread in threading.enumerate() if thread.name.startswith("job-profiler")}
+                        response = profile(request, skip)
+                    finally:
+                        self.busy.release()
+            except Exception as e:
+                response = {"error": str(e)}
+            connection.sendall(json.dumps(response).encode("utf-8"))
+
+def install():
+    """
+    Start the idle listener for this process. Nothing is sampled or traced
+    until a profile is requested, and then only for the requested window.
+    """
+    if not ENABLED or not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        agent = Agent(socket_path(os.getpid()))
+        agent.start()
+        return agent
+    except OSError as e:
+        print(f"Profiler tidak aktif: {e}", file=sys.stderr)
+        return None
+
+def run_script(path, argv):
+    """Run a script as __main__, with the argv and sys.path[0] it would get from `python path`."""
+    install()
+    sys.argv = [path, *argv]
+    sys.path[0] = str(Path(path).resolve().parent)
+    runpy.run_path(path, run_name="__main__")
+
+# =========================
+# CLIENT (API side)
+# =========================
+
+def wrap_command(args):
+    """Start `python script.py ...` commands through this file so the job can be profiled later."""
+    if ENABLED and len(args) >= 2 and args[0] == sys.executable and str(args[1]).endswith(".py"):
+        return [args[0], str(Path(__file__).resolve()), *args[1:]]
+    return list(args)
+
+def request_profile(pid, seconds=DEFAULT_SECONDS, interval=DEFAULT_INTERVAL, memory=False, top=TOP_ALLOCATIONS):
+    """Ask the agent in process `pid` for a profile; blocks for about `seconds`."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise ProfilerError("Profiling butuh Unix domain socket, tidak tersedia di platform ini.")
+    request = {"seconds": seconds, "interval": interval, "memory": memory, "top": top}
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # A large heap makes the tracemalloc snapshot slow, so allow extra time for it
+    client.settimeout(seconds + (60 if memory else 10))
+    try:
+        client.connect(str(socket_path(pid)))
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := client.recv(65536):
+            chunks.append(chunk)
+    except (FileNotFoundError, ConnectionRefusedError):
+        raise ProfilerError(f"Proses {pid} tidak menjalankan profiler (sudah selesai atau dimulai tanpa profiler).")
+    except socket.timeout:
+        raise ProfilerError(f"Profiler di proses {pid} tidak menjawab.")
+    finally:
+        client.close()
+
+    if not chunks:
+        raise ProfilerError(f"Proses {pid} selesai sebelum profilnya terkirim.")
+    response = json.loads(b"".join(chunks).decode("utf-8"))
+    if "error" in response:
+        raise ProfilerError(
+            "Profil lain sedang berjalan untuk proses ini." if response["error"] == "busy" else response["error"]
+        )
+    return response
+
+def to_collapsed(result):
+    """Text for flamegraph.pl / speedscope: one "stack count" line per distinct stack."""
+    return "".join(f"{stack} {count}\n" for stack, count in result["stacks"].items())
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python app/api/profiler.py script.py [args...]")
+        sys.exit(2)
+    run_script(sys.argv[1], sys.argv[2:])
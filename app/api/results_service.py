@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+router = APIRouter()
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+LOG_DIR = BASE_DIR / "logs"
+CLEAN_DATA_DIR = BASE_DIR / "data" / "cleaned"
+CLUSTERED_DIR = CLEAN_DATA_DIR / "clustered"
+TOPICMODELLING_DIR = CLEAN_DATA_DIR / "topic-modelling"
+TOPIC_INFO_PATH = LOG_DIR / "topic_info.json"
+TOPICS_OVER_TIME_PATH = TOPICMODELLING_DIR / "topics_over_time.json"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# =========================
+# ARTIFACT CACHE
+# =========================
+
+class ArtifactCache:
+    """
+    Parsed modelling artifacts kept in memory, keyed by path.
+
+    An entry is reused while the file's (mtime, size) is unchanged, so a new
+    modelling run is picked up on the next request and every other request
+    skips the JSON parse. The version string doubles as the ETag base. An
+    optional transform runs once per version, on the parsed JSON.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, transform=None):
+        """Return (parsed JSON, version), or raise 404 when the artifact does not exist."""
+        path = Path(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"Artifact {path.name} belum tersedia.")
+        version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[1] == version:
+            return entry
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError):
+            # Caught mid-write by a writer that does not replace the file atomically:
+            # keep serving the last complete version if there is one
+            if entry is not None:
+                return entry
+            raise HTTPException(status_code=503, detail=f"Artifact {path.name} sedang ditulis, coba lagi.",
+                                headers={"Retry-After": "5"})
+        if transform is not None:
+            data = transform(data)
+        entry = (data, version)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+CACHE = ArtifactCache()
+
+# =========================
+# RESPONSE HELPERS
+# =========================
+
+def make_etag(*parts):
+    return 'W/"' + hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:24] + '"'
+
+def not_modified(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+def conditional_json(request, etag, build):
+    """304 when the client already has this version, otherwise the JSON from build()."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+def parse_fields(fields):
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+def select_fields(item, fields):
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+def paginate(items, offset, limit, fields):
+    return {
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": [select_fields(item, fields) for item in items[offset:offset + limit]]
+    }
+
+def parse_ids(values):
+    try:
+        return {int(value) for value in parse_fields(values)} if values else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Daftar id tidak valid: {values}")
+
+def cluster_articles_path(cluster_id):
+    return CLUSTERED_DIR / f"cluster_{cluster_id}.json"
+
+def cluster_topics_path(cluster_id):
+    return TOPICMODELLING_DIR / f"cluster_{cluster_id}_topics.json"
+
+def legacy_cluster_topics_path(cluster_id):
+    return CLUSTERED_DIR / f"cluster_{cluster_id}_topics.json"
+
+def from_topic_info_records(cluster_id):
+    """Convert the older BERTopic get_topic_info() records to the {"cluster", "topics"} layout."""
+    def transform(records):
+        return {
+            "cluster": cluster_id,
+            "topics": [
+                {
+                    "topic": int(record["Topic"]),
+                    "count": int(record.get("Count", 0)),
+                    "name": str(record.get("Name", record["Topic"])),
+                    "terms": [{"term": term, "weight": None} for term in record.get("Representation") or []],
+                    "representative_docs": record.get("Representative_Docs") or []
+                }
+                for record in records
+            ]
+        }
+    return transform
+
+def load_cluster_topics(cluster_id):
+    """Topics of a cluster from the latest modelling run, else from the older clustered/ artifact."""
+    path = cluster_topics_path(cluster_id)
+    if not path.exists() and legacy_cluster_topics_path(cluster_id).exists():
+        return CACHE.get(legacy_cluster_topics_path(cluster_id), transform=from_topic_info_records(cluster_id))
+    return CACHE.get(path)
+
+# =========================
+# ENDPOINTS
+# =========================
+
+@router.get("/summary")
+def get_summary(request: Request, fields: Optional[str] = None):
+    """Run summary from topic_info.json (scores, cluster count, per-cluster info)."""
+    summary, version = CACHE.get(TOPIC_INFO_PATH)
+    selected = parse_fields(fields)
+    etag = make_etag("summary", version, fields)
+    return conditional_json(request, etag, lambda: dict(select_fields(summary, selected), version=version))
+
+@router.get("/clusters")
+def list_clusters(request: Request):
+    summary, version = CACHE.get(TOPIC_INFO_PATH)
+    etag = make_etag("clusters", version)
+
+    def build():
+        clusters = [
+            dict(info, cluster=int(cluster_id) if str(cluster_id).isdigit() else cluster_id)
+            for cluster_id, info in summary.get("cluster_info", {}).items()
+        ]
+        return {"version": version, "clusters": clusters}
+
+    return conditional_json(request, etag, build)
+
+@router.get("/clusters/{cluster_id}/articles")
+def get_cluster_articles(
+    request: Request,
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated, e.g. article,year")
+):
+    """Articles assigned to a cluster, one page at a time."""
+    articles, version = CACHE.get(cluster_articles_path(cluster_id))
+    etag = make_etag("articles", cluster_id, version, offset, limit, fields)
+    return conditional_json(
+        request, etag,
+        lambda: dict(paginate(articles, offset, limit, parse_fields(fields)), cluster=cluster_id, version=version)
+    )
+
+@router.get("/clusters/{cluster_id}/topics")
+def get_cluster_topics(
+    request: Request,
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated, e.g. topic,name,terms"),
+    top_terms: Optional[int] = Query(None, ge=1)
+):
+    """Topics found in a cluster with their top terms."""
+    data, version = load_cluster_topics(cluster_id)
+    etag = make_etag("topics", cluster_id, version, offset, limit, fields, top_terms)
+
+    def build():
+        topics = data.get("topics", [])
+        if top_terms is not None:
+            topics = [dict(topic, terms=topic.get("terms", [])[:top_terms]) for topic in topics]
+        return dict(paginate(topics, offset, limit, parse_fields(fields)), cluster=cluster_id, version=version)
+
+    return conditional_json(request, etag, build)
+
+@router.get("/clusters/{cluster_id}/topics/{topic_id}")
+def get_topic(request: Request, cluster_id: int, topic_id: int, fields: Optional[str] = None):
+    data, version = load_cluster_topics(cluster_id)
+    topic = next((t for t in data.get("topics", []) if t.get("topic") == topic_id), None)
+    if topic is None:
+        raise HTTPException(status_code=404, detail=f"Topic {topic_id} tidak ada di cluster {cluster_id}.")
+    etag = make_etag("topic", cluster_id, topic_id, version, fields)
+    return conditional_json(request, etag, lambda: dict(select_fields(topic, parse_fields(fields)), version=version))
+
+@router.get("/topics-over-time")
+def get_topics_over_time(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated topic ids, e.g. 0,1,2"),
+    years: Optional[str] = Query(None, description="Comma-separated years, e.g. 2018,2019")
+):
+    """Per-year topic frequencies and top words from temporal.py, optionally narrowed to some topics and years."""
+    data, version = CACHE.get(TOPICS_OVER_TIME_PATH)
+    etag = make_etag("topics-over-time", version, topics, years)
+
+    def build():
+        selected_topics, selected_years = parse_ids(topics), parse_ids(years)
+        columns = [i for i, year in enumerate(data["years"]) if selected_years is None or year in selected_years]
+        series = [
+            dict(topic,
+                 frequency=[topic["frequency"][i] for i in columns],
+                 words=[topic["words"][i] for i in columns])
+            for topic in data["topics"] if selected_topics is None or topic["topic"] in selected_topics
+        ]
+        return dict(
+            data,
+            years=[data["years"][i] for i in columns],
+            articles_per_year=[data["articles_per_year"][i] for i in columns],
+            topics=series,
+            version=version
+        )
+
+    return conditional_json(request, etag, build)
@@ -1,13 +1,10 @@
-import subprocess
 import logging
 import sys
 import os
-import time
-import json
-from prometheus_client import Summary, Gauge
+from prometheus_client import Summary
 from pathlib import Path
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from starlette.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException
+from app.api.jobs import JOBS, run_process, stream_text
 
 router = APIRouter()
 
@@ -32,10 +29,11 @@ logger = logging.getLogger(__name__)
 
 # Prometheus metrics
 SCRAPING_DURATION = Summary("scraping_duration_seconds", "Waktu scraping artikel (getTitle)")
-SCRAPED_ARTICLE_COUNT = Gauge("scraped_article_count", "Jumlah artikel hasil scraping (sebelum cleaning)")
-CLEANED_ARTICLE_COUNT = Gauge("cleaned_article_count", "Jumlah artikel setelah cleaning")
+# scraped_article_count / cleaned_article_count and the live scraper stats are exposed by
+# PipelineStatsCollector (app/api/metrics.py) from the counters the child processes publish
 
-def run_script(script_name: str) -> str:
+def run_script(script_name: str, job=None):
+    """Run a scraping script, streaming its output into `job` (a new job when omitted); returns the job."""
     script_path = SCRAPPING_DIR / script_name
 
     if not script_path.exists():
@@ -43,116 +41,52 @@ def run_script(script_name: str) -> str:
         raise HTTPException(status_code=400, detail=f"Script {script_name} tidak ditemukan.")
 
     logger.info(f"Menjalankan script: {script_name}")
+    if job is None:
+        job = JOBS.create(script_name)
+    job.log.append(f"=== {script_name} ===")
     
     # Only measure scraping duration for getTitle.py
     if script_name == "getTitle.py":
         with SCRAPING_DURATION.time():
-            process = subprocess.Popen(
-                [sys.executable, str(script_path)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            output = ""
-            for line in iter(process.stdout.readline, ''):
-                logger.info(line.strip())
-                output += line
-
-            process.stdout.close()
-            process.wait()
+            returncode = run_process(job, [sys.executable, str(script_path)], echo=logger.info)
     else:
-        process = subprocess.Popen(
-            [sys.executable, str(script_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-
-        output = ""
-        for line in iter(process.stdout.readline, ''):
-            logger.info(line.strip())
-            output += line
-
-        process.stdout.close()
-        process.wait()
-
-    if process.returncode == 0:
+        returncode = run_process(job, [sys.executable, str(script_path)], echo=logger.info)
+
+    if returncode == 0:
         logger.info(f"Script {script_name} selesai tanpa error.\n")
     else:
         logger.error(f"Script {script_name} gagal dijalankan.\n")
         raise HTTPException(status_code=500, detail=f"Script {script_name} gagal dijalankan.")
 
-    # Update metrics after successful execution
-    if script_name == "getTitle.py":
-        try:
-            # Count total scraped articles from output directory
-            total_scraped = 0
-            if OUTPUT_DIR.exists():
-                for json_file in OUTPUT_DIR.glob("scraped_articles_*.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            article_data = json.load(f)
-                            if isinstance(article_data, dict):
-                                total_scraped += 1
-                            elif isinstance(article_data, list):
-                                total_scraped += len(article_data)
-                    except Exception as e:
-                        logger.error(f"Error reading {json_file}: {e}")
-                        continue
-            
-            SCRAPED_ARTICLE_COUNT.set(total_scraped)
-            logger.info(f"Updated scraped article count: {total_scraped}")
-        except Exception as e:
-            logger.error(f"Error updating scraped article count metric: {e}")
-    
-    elif script_name == "cleaningdata.py":
-        try:
-            # Count cleaned articles from cleaned_articles.json
-            cleaned_file = CLEANED_DIR / "cleaned_articles.json"
-            total_cleaned = 0
-            if cleaned_file.exists():
-                with open(cleaned_file, 'r', encoding='utf-8') as f:
-                    cleaned_data = json.load(f)
-                    if isinstance(cleaned_data, list):
-                        total_cleaned = len(cleaned_data)
-                    elif isinstance(cleaned_data, dict):
-                        total_cleaned = 1
-            
-            CLEANED_ARTICLE_COUNT.set(total_cleaned)
-            logger.info(f"Updated cleaned article count: {total_cleaned}")
-        except Exception as e:
-            logger.error(f"Error updating cleaned article count metric: {e}")
-
-    return output
-
-def run_title_and_cleaning():
+    return job
+
+def run_title_and_cleaning(job=None):
     logger.info("Memulai scraping judul...")
-    title_output = run_script("getTitle.py")
+    job = run_script("getTitle.py", job)
 
     logger.info("Memulai proses cleaning data...")
-    cleaning_output = run_script("cleaningdata.py")
+    run_script("cleaningdata.py", job)
 
     logger.info("Scraping judul dan cleaning data selesai.")
-    return title_output + "\n" + cleaning_output
+    return job
 
-def run_all_processes():
+def run_all_processes(job=None):
     logger.info("Memulai seluruh rangkaian proses...")
 
     logger.info("Memulai proses scraping link artikel...")
-    links_output = run_script("getLinks.py")
+    job = run_script("getLinks.py", job)
 
-    title_and_cleaning_output = run_title_and_cleaning()
+    run_title_and_cleaning(job)
 
     logger.info("Seluruh proses selesai.")
-    return links_output + title_and_cleaning_output
+    return job
+
+def run_script_job(job, script_name):
+    run_script(script_name, job)
+    logger.info(f"{script_name} selesai.")
 
 @router.post("/run-scrapping-processes/")
-async def run_all(background_tasks: BackgroundTasks):
+async def run_all():
     logger.info("Menerima permintaan untuk menjalankan seluruh rangkaian proses.")
 
     logger.info(f"Base directory: {BASE_DIR}")
@@ -160,31 +94,41 @@ async def run_all(background_tasks: BackgroundTasks):
     logger.info(f"Isi folder scrapping: {os.listdir(SCRAPPING_DIR) if SCRAPPING_DIR.exists() else 'Directory not found'}")
 
     try:
-        background_tasks.add_task(run_all_processes)
-        logger.info("Background task berhasil ditambahkan.")
+        job = JOBS.start("run-scrapping-processes", run_all_processes)
+        logger.info(f"Background job {job.id} berhasil ditambahkan.")
     except Exception as e:
         logger.exception("Gagal menambahkan background task!")
         raise HTTPException(status_code=500, detail=str(e))
 
-    return {"message": "Proses dijalankan di background, tunggu hingga selesai."}
+    return {
+        "message": "Proses dijalankan di background, tunggu hingga selesai.",
+        "job_id": job.id,
+        "log_url": f"/jobs/{job.id}/events"
+    }
 
 @router.post("/scrape-links/")
-async def scrape_links():
+def scrape_links():
     logger.info("Memulai proses scraping link artikel...")
-    output = run_script("getLinks.py")
+    job = JOBS.create("getLinks.py")
+    try:
+        run_script("getLinks.py", job)
+    except HTTPException as e:
+        job.finish("failed", error=e.detail)
+        raise
+    job.finish("succeeded")
     logger.info("Proses scraping link artikel selesai.")
-    return {"output": output}
+    # Read back from logs/jobs/<id>.log, which holds the script's complete output
+    return {"output": job.log.text(), "job_id": job.id, "returncode": job.returncode}
 
 @router.post("/scrape-titles/")
 async def scrape_titles():
     logger.info("Memulai scraping judul")
-    output = run_script("getTitle.py")
-    logger.info("Scraping judul selesai.")
-    return StreamingResponse(iter([output]), media_type="text/plain")
+    # Output is streamed while the script runs; reconnect with /jobs/{X-Job-Id}/log?offset=N
+    job = JOBS.start("getTitle.py", run_script_job, "getTitle.py")
+    return stream_text(job)
 
 @router.post("/cleaning-only/")
 async def run_cleaning_only():
     logger.info("Menjalankan proses cleaning data saja...")
-    output = run_script("cleaningdata.py")
-    logger.info("Cleaning data selesai.")
-    return StreamingResponse(iter([output]), media_type="text/plain")
\ No newline at end of file
+    job = JOBS.start("cleaningdata.py", run_script_job, "cleaningdata.py")
+    return stream_text(job)
\ No newline at end of file
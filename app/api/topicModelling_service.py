@@ -1,10 +1,10 @@
 from fastapi import APIRouter, HTTPException
-import subprocess
 import sys
 import time
 import json
 from prometheus_client import Summary, Gauge
 from pathlib import Path
+from app.api.jobs import JOBS, run_process, stream_text
 
 router = APIRouter()
 
@@ -13,29 +13,27 @@ input_path = BASE_DIR / "data" / "cleaned" / "cleaned_articles.json"
 logs_dir = BASE_DIR / "logs"
 
 MODELLING_DURATION = Summary("modelling_duration_seconds", "Durasi proses topic modelling")
-COHERENCE_SCORE = Gauge("coherence_score", "Coherence Score")
-SILHOUETTE_SCORE = Gauge("silhouette_score", "Silhouette Score")
-TOTAL_TOPICS = Gauge("total_topics", "Total number of topics generated")
-TOTAL_CLUSTERS = Gauge("total_clusters", "Total number of clusters")
+# Set by whichever worker ran the model; with several workers the latest value wins
+COHERENCE_SCORE = Gauge("coherence_score", "Coherence Score", multiprocess_mode="mostrecent")
+SILHOUETTE_SCORE = Gauge("silhouette_score", "Silhouette Score", multiprocess_mode="mostrecent")
+TOTAL_TOPICS = Gauge("total_topics", "Total number of topics generated", multiprocess_mode="mostrecent")
+TOTAL_CLUSTERS = Gauge("total_clusters", "Total number of clusters", multiprocess_mode="mostrecent")
 
 @MODELLING_DURATION.time()
-def run_topic_modelling(input_path: str):
-    try:
-        result = subprocess.run(
-            [sys.executable, 'src/modelling/TopicModelling.py', str(input_path)], 
-            check=True,
-            capture_output=True,
-            text=True,
-            cwd=BASE_DIR
-        )
-        print(f"Topic modelling output: {result.stdout}")
-        if result.stderr:
-            print(f"Topic modelling stderr: {result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Topic Modelling failed with return code {e.returncode}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
-        raise HTTPException(status_code=500, detail=f"Topic Modelling failed: {e.stderr}")
+def run_topic_modelling(input_path: str, job=None):
+    if job is None:
+        job = JOBS.create("TopicModelling.py")
+    # Output is streamed into the job log (and echoed here) while the model runs
+    returncode = run_process(
+        job,
+        [sys.executable, 'src/modelling/TopicModelling.py', str(input_path)],
+        cwd=BASE_DIR,
+        echo=print
+    )
+    if returncode != 0:
+        print(f"Topic Modelling failed with return code {returncode}")
+        tail = job.log.tail(20)
+        raise HTTPException(status_code=500, detail="Topic Modelling failed: " + "\n".join(tail))
 
     # Update metrics from the generated files
     try:
@@ -92,11 +90,55 @@ def run_topic_modelling(input_path: str):
         TOTAL_TOPICS.set(0)
         TOTAL_CLUSTERS.set(0)
 
+def run_topic_modelling_job(job, input_path):
+    run_topic_modelling(input_path, job)
+
 @router.post("/run-topic-modelling/")
-async def run_topic_modelling_endpoint():
+def run_topic_modelling_endpoint(stream: bool = False):
     if not input_path.exists():
         raise HTTPException(status_code=400, detail=f"Input path does not exist: {input_path}")
 
-    run_topic_modelling(input_path)
+    if stream:
+        # Tail the output live; reconnect with /jobs/{X-Job-Id}/log?offset=N
+        job = JOBS.start("TopicModelling.py", run_topic_modelling_job, input_path)
+        return stream_text(job)
+
+    job = JOBS.create("TopicModelling.py")
+    try:
+        run_topic_modelling(input_path, job)
+    except HTTPException as e:
+        job.finish("failed", error=e.detail)
+        raise
+    job.finish("succeeded")
+
+    return {"status": "success", "message": "Topic Modelling completed successfully!", "job_id": job.id}
+
+
+def run_topics_over_time(job, refit=False):
+    args = [sys.executable, 'src/modelling/temporal.py', str(input_path)]
+    if refit:
+        args.append('--refit')
+    returncode = run_process(job, args, cwd=BASE_DIR, echo=print)
+    if returncode != 0:
+        tail = job.log.tail(20)
+        raise HTTPException(status_code=500, detail="Topics over time failed: " + "\n".join(tail))
+
+@router.post("/run-topics-over-time/")
+def run_topics_over_time_endpoint(refit: bool = False, stream: bool = False):
+    """Update the per-year topic series; only years with new or removed articles are recomputed unless refit."""
+    if not input_path.exists():
+        raise HTTPException(status_code=400, detail=f"Input path does not exist: {input_path}")
+
+    if stream:
+        job = JOBS.start("temporal.py", run_topics_over_time, refit)
+        return stream_text(job)
+
+    job = JOBS.create("temporal.py")
+    try:
+        run_topics_over_time(job, refit)
+    except HTTPException as e:
+        job.finish("failed", error=e.detail)
+        raise
+    job.finish("succeeded")
 
-    return {"status": "success", "message": "Topic Modelling completed successfully!"}
\ No newline at end of file
+    return {"status": "success", "message": "Topics over time updated successfully!", "job_id": job.id}
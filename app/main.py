@@ -1,17 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import Response
+from fastapi.middleware.gzip import GZipMiddleware
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from app.api.metrics import metrics_registry, reap_dead_workers, mark_worker_dead
 from app.api.scrapping_service import router as scrapping_router
 from app.api.topicModelling_service import router as modelling_router  
+from app.api.jobs import router as jobs_router
+from app.api.results_service import router as results_router
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Multi-worker mode (PROMETHEUS_MULTIPROC_DIR): clear leftovers of crashed workers, retire ours on exit
+    reap_dead_workers()
+    yield
+    mark_worker_dead()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 app.include_router(scrapping_router, prefix="/scrapping")
 app.include_router(modelling_router, prefix="/modelling", tags=["modelling"])
+app.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
+app.include_router(results_router, prefix="/results", tags=["results"])
 
 @app.get("/metrics")
 def metrics():
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,28 @@
+import argparse
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MULTIPROC_DIR = BASE_DIR / "logs" / "prometheus_multiproc"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API, optionally across several uvicorn workers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", 1)))
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Must be set before prometheus_client is imported anywhere, so every worker writes to the shared directory
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(DEFAULT_MULTIPROC_DIR))
+
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        from app.api.metrics import prepare_multiprocess_dir
+        prepare_multiprocess_dir(multiproc_dir)
+
+    import uvicorn
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
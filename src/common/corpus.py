@@ -0,0 +1,80 @@
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from textclean import ARROW_STRING
+
+# Low-cardinality fields stored dictionary-encoded (pandas category): one copy of each distinct value
+CATEGORY_COLUMNS = ("publisher", "journal_conference_name", "year", "group_name", "Tahun")
+
+# Placeholders the scrapers write when a field could not be extracted
+PLACEHOLDER_PATTERN = "not found|tidak ditemukan"
+
+# =========================
+# LOADING
+# =========================
+
+def compact_frame(df):
+    """
+    Convert a DataFrame to the corpus layout: category columns dictionary-encoded,
+    every other text column as Arrow-backed strings held in contiguous buffers.
+    """
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORY_COLUMNS:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[column] = series.astype(ARROW_STRING).astype("category")
+        elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            df[column] = series.astype(ARROW_STRING)
+    return df
+
+def table_to_frame(table):
+    """Arrow table to DataFrame without falling back to Python string objects."""
+    columns = {}
+    for name in table.column_names:
+        column = table[name]
+        if name in CATEGORY_COLUMNS and pa.types.is_string(column.type):
+            column = pc.dictionary_encode(column)
+        columns[name] = column
+    table = pa.table(columns)
+    return table.to_pandas(
+        types_mapper=lambda arrow_type: ARROW_STRING if arrow_type in (pa.string(), pa.large_string()) else None,
+        self_destruct=True
+    )
+
+def load_corpus(path):
+    """Load a JSON array of articles into a compact, Arrow-backed DataFrame."""
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    if isinstance(records, dict):
+        records = [records]
+    try:
+        table = pa.Table.from_pylist(records)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Heterogeneous fields (e.g. a number where text is expected): let pandas infer per column
+        return compact_frame(pd.DataFrame(records))
+    del records
+    return compact_frame(table_to_frame(table))
+
+# =========================
+# FILTERS
+# =========================
+
+def _arrow(series):
+    return pa.array(series.astype(ARROW_STRING))
+
+def non_blank_mask(series):
+    """True where the text has at least one non-whitespace character (nulls are False)."""
+    return pc.fill_null(pc.match_substring_regex(_arrow(series), r"\S"), False).to_numpy(zero_copy_only=False)
+
+def placeholder_mask(series, pattern=PLACEHOLDER_PATTERN):
+    """True where the text contains a scraper placeholder, matched case-insensitively without a lowered copy."""
+    return pc.fill_null(
+        pc.match_substring_regex(_arrow(series), pattern, ignore_case=True), False
+    ).to_numpy(zero_copy_only=False)
+
+def memory_per_article(df):
+    """Bytes held per row, string buffers included; reported when the corpus is loaded."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
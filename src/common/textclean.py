@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Arrow-backed strings: the str accessor runs in Arrow's C++ kernels instead of per-cell Python calls
+ARROW_STRING = pd.StringDtype("pyarrow")
+
+AUTHOR_SEPARATOR = ","
+AUTHOR_JOINER = ", "
+AUTHOR_STRIP_CHARS = " ;"
+
+# =========================
+# SCALAR REFERENCE
+# =========================
+
+def remove_backslashes(data):
+    if isinstance(data, str):
+        data = data.replace("\\/", "/").replace("\\", "")
+    return data
+
+def clean_authors(author_str):
+    if pd.isna(author_str):
+        return ""
+    
+    authors = [author.strip(AUTHOR_STRIP_CHARS) for author in author_str.split(AUTHOR_SEPARATOR) if author.strip(AUTHOR_STRIP_CHARS)]
+    unique_authors = AUTHOR_JOINER.join(sorted(set(authors)))
+    return unique_authors
+
+# =========================
+# VECTORIZED KERNELS
+# =========================
+
+def text_kind(series):
+    """'string' for all-text columns (nulls allowed), 'mixed' when text shares the column with other values, else None."""
+    if isinstance(series.dtype, pd.StringDtype):
+        return "string"
+    if series.dtype != object:
+        return None
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind == "string":
+        return "string"
+    if kind.startswith("mixed"):
+        return "mixed"
+    return None
+
+def to_arrow_text(series):
+    return series if series.dtype == ARROW_STRING else series.astype(ARROW_STRING)
+
+def remove_backslashes_column(series):
+    """Column-wise remove_backslashes for a text column; returns an Arrow-backed string Series."""
+    return (
+        to_arrow_text(series)
+        .str.replace("\\/", "/", regex=False)
+        .str.replace("\\", "", regex=False)
+    )
+
+def clean_authors_column(series):
+    """
+    Column-wise clean_authors: split on commas, trim spaces/semicolons, drop
+    empties, then de-duplicate and sort each row's names before joining.
+
+    Sorting is by UTF-8 bytes, which matches Python's code point ordering.
+    """
+    values = pa.array(to_arrow_text(series).fillna(""), type=pa.string())
+    parts = pc.split_pattern(values, AUTHOR_SEPARATOR)
+    names = pc.utf8_trim(pc.list_flatten(parts), characters=AUTHOR_STRIP_CHARS)
+    rows = pc.list_parent_indices(parts)
+    keep = pc.not_equal(names, "")
+
+    table = pa.table({"row": rows.filter(keep), "name": names.filter(keep)})
+    table = table.take(pc.sort_indices(table, sort_keys=[("row", "ascending"), ("name", "ascending")]))
+    rows = table["row"].to_numpy()
+    names = table["name"].combine_chunks()
+
+    # Drop repeats of the same name within a row (adjacent after sorting)
+    if len(rows) > 1:
+        repeated = np.zeros(len(rows), dtype=bool)
+        repeated[1:] = (rows[1:] == rows[:-1]) & pc.equal(names[1:], names[:-1]).to_numpy(zero_copy_only=False)
+        rows, names = rows[~repeated], names.filter(pa.array(~repeated))
+
+    offsets = np.searchsorted(rows, np.arange(len(series) + 1)).astype(np.int32)
+    joined = pc.binary_join(pa.ListArray.from_arrays(pa.array(offsets), names), AUTHOR_JOINER)
+
+    return pd.Series(pd.array(joined, dtype=ARROW_STRING), index=series.index, name=series.name)
+
+def clean_text_columns(df, columns=None):
+    """
+    Apply remove_backslashes to the text columns of df (all of them by default).
+
+    Pure text columns are converted to Arrow strings and cleaned column-wise;
+    columns mixing text with other values keep the per-cell path so non-text
+    cells pass through unchanged. Other columns are left alone.
+    """
+    df = df.copy()
+    for column in (df.columns if columns is None else columns):
+        kind = text_kind(df[column])
+        if kind == "string":
+            df[column] = remove_backslashes_column(df[column])
+        elif kind == "mixed":
+            df[column] = df[column].map(remove_backslashes)
+    return df
+
+def records_for_json(df):
+    """DataFrame rows as dicts with missing values (NaN / pd.NA) turned into None for json.dump."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
@@ -2,10 +2,11 @@ import mlflow
 import mlflow.sklearn
 from bertopic import BERTopic
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import json
+import hashlib
+import os
+import subprocess
 import sys
 from pathlib import Path
 from sklearn.decomposition import PCA
@@ -15,31 +16,42 @@ from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from umap import UMAP
 
-# Set up paths
-if len(sys.argv) > 1:
-    input_file = Path(sys.argv[1])
-    BASE_DIR = input_file.parent.parent.parent
-else:
-    BASE_DIR = Path(__file__).resolve().parent.parent.parent
-    input_file = BASE_DIR / "data" / "cleaned" / "cleaned_articles.json"
-
-RAW_DATA_DIR = BASE_DIR / "data" / "raw"
-CLEAN_DATA_DIR = BASE_DIR / "data" / "cleaned"
-CLUSTERED_DIR = CLEAN_DATA_DIR / "clustered"
-TOPICMODELLING_DIR = CLEAN_DATA_DIR / "topic-modelling"
-LOG_DIR = BASE_DIR / "logs"
-DATA_PATH = input_file
-
-# Create directories
-CLUSTERED_DIR.mkdir(parents=True, exist_ok=True)
-TOPICMODELLING_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+# Shared Arrow-backed corpus layer (src/common)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from corpus import load_corpus, non_blank_mask, placeholder_mask, memory_per_article
+from textclean import records_for_json
+
+# BERTopic's default English model, also used by preprocessing.apply_bert
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+def configure_paths(input_file=None):
+    """Point the data/output paths at input_file's project (default: this repo) and create the output dirs."""
+    global BASE_DIR, RAW_DATA_DIR, CLEAN_DATA_DIR, CLUSTERED_DIR, TOPICMODELLING_DIR, LOG_DIR, DATA_PATH
+    if input_file is not None:
+        input_file = Path(input_file)
+        BASE_DIR = input_file.parent.parent.parent
+    else:
+        BASE_DIR = Path(__file__).resolve().parent.parent.parent
+        input_file = BASE_DIR / "data" / "cleaned" / "cleaned_articles.json"
+
+    RAW_DATA_DIR = BASE_DIR / "data" / "raw"
+    CLEAN_DATA_DIR = BASE_DIR / "data" / "cleaned"
+    CLUSTERED_DIR = CLEAN_DATA_DIR / "clustered"
+    TOPICMODELLING_DIR = CLEAN_DATA_DIR / "topic-modelling"
+    LOG_DIR = BASE_DIR / "logs"
+    DATA_PATH = input_file
+
+    # Create directories
+    CLUSTERED_DIR.mkdir(parents=True, exist_ok=True)
+    TOPICMODELLING_DIR.mkdir(parents=True, exist_ok=True)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+# Set up paths (the command line input file, if any, is applied in __main__)
+configure_paths()
 
 def load_articles(path):
-    """Load articles from a JSON file and convert to DataFrame."""
-    with open(path, encoding="utf-8") as f:
-        articles = json.load(f)
-    df = pd.DataFrame(articles)
+    """Load articles from a JSON file into a compact Arrow-backed DataFrame."""
+    df = load_corpus(path)
     
     # Handle different column names
     if 'title' in df.columns:
@@ -51,12 +63,10 @@ def load_articles(path):
     if 'abstract' in df.columns:
         df['article'] = df['abstract'].fillna(df['article'])
     
-    # Clean the data
-    df = df[df['article'].notna()]
-    df = df[df['article'].str.strip() != '']
-    df = df[~df['article'].str.lower().str.contains('not found|tidak ditemukan')]
+    # Clean the data: one combined mask computed on the Arrow buffers, applied once
+    df = df[non_blank_mask(df['article']) & ~placeholder_mask(df['article'])]
     
-    print(f"Loaded {len(df)} articles for processing")
+    print(f"Loaded {len(df)} articles for processing ({memory_per_article(df) / 1024:.1f} KiB per article in memory)")
     return df
 
 def vectorize_and_reduce(df):
@@ -76,12 +86,18 @@ def perform_clustering(features_pca, n_clusters):
     silhouette = silhouette_score(features_pca, labels)
     return labels, kmeans.cluster_centers_, silhouette
 
+def write_json_atomically(path, data):
+    """Write to a temporary file and move it over path, so the API never reads a half-written artifact."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
 def save_clustered_data(df, clustered_dir):
     """Save each cluster's data to individual files."""
     for cluster in df["cluster"].unique():
-        cluster_data = df[df["cluster"] == cluster].to_dict(orient="records")
-        with open(clustered_dir / f"cluster_{cluster}.json", "w", encoding="utf-8") as f:
-            json.dump(cluster_data, f, indent=4, ensure_ascii=False)
+        cluster_data = records_for_json(df[df["cluster"] == cluster])
+        write_json_atomically(clustered_dir / f"cluster_{cluster}.json", cluster_data)
         print(f"Saved cluster {cluster} with {len(cluster_data)} articles")
 
 def calculate_cosine_similarity_coherence(topic_terms, vectorizer):
@@ -129,58 +145,161 @@ def get_topic_coherence_from_bertopic(topic_model, cluster_data):
         print(f"Error getting coherence from BERTopic: {e}")
         return 0.0
 
-def analyze_topics_per_cluster(df, n_clusters, save_dir):
-    """Analyze topics for each cluster and save visualizations."""
+def save_topic_terms(topic_model, cluster, save_dir, top_n=10):
+    """Save each topic's size, name and top terms to cluster_<n>_topics.json."""
+    topics = []
+    for _, row in topic_model.get_topic_info().iterrows():
+        terms = topic_model.get_topic(row["Topic"]) or []
+        topics.append({
+            "topic": int(row["Topic"]),
+            "count": int(row["Count"]),
+            "name": str(row.get("Name", row["Topic"])),
+            "terms": [{"term": term, "weight": float(weight)} for term, weight in terms[:top_n]]
+        })
+    write_json_atomically(save_dir / f"cluster_{cluster}_topics.json", {"cluster": int(cluster), "topics": topics})
+
+def embed_documents(documents, cache_dir=None):
+    """
+    Sentence embeddings for documents. With cache_dir, embeddings are stored as
+    <sha1 of model and texts>.npy and reused while the documents are unchanged.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        digest = hashlib.sha1(EMBEDDING_MODEL.encode("utf-8"))
+        for document in documents:
+            digest.update(b"\0" + document.encode("utf-8"))
+        cache_path = Path(cache_dir) / f"{digest.hexdigest()}.npy"
+        if cache_path.exists():
+            print(f"Loaded cached embeddings: {cache_path.name}")
+            return np.load(cache_path)
+
+    from sentence_transformers import SentenceTransformer
+    embeddings = SentenceTransformer(EMBEDDING_MODEL).encode(documents, show_progress_bar=True)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_path, embeddings)
+    return embeddings
+
+def fit_cluster_topic_model(cluster_data, embeddings=None, n_neighbors=15, n_components=5, min_topic_size=2, knn=None, verbose=True):
+    """
+    Fit BERTopic on one cluster's documents. n_neighbors is capped to the cluster size.
+    knn is an optional precomputed (indices, distances) neighbour graph with at least
+    n_neighbors columns, so UMAP skips its own nearest-neighbour search.
+    """
+    # Adjust UMAP parameters based on cluster size
+    n_neighbors = min(n_neighbors, len(cluster_data) - 1)
+    if n_neighbors < 2:
+        n_neighbors = 2
+
+    precomputed_knn = (None, None, None)
+    if knn is not None:
+        precomputed_knn = (knn[0][:, :n_neighbors], knn[1][:, :n_neighbors], None)
+
+    umap_model = UMAP(n_neighbors=n_neighbors, n_components=n_components, min_dist=0.1, metric='cosine',
+                      random_state=42, precomputed_knn=precomputed_knn)
+    vectorizer_model = CountVectorizer(ngram_range=(1, 2), stop_words="english", max_features=100)
+
+    topic_model = BERTopic(
+        vectorizer_model=vectorizer_model,
+        umap_model=umap_model,
+        min_topic_size=min_topic_size,
+        verbose=verbose
+    )
+
+    topic_model.fit_transform(cluster_data, embeddings)
+    return topic_model
+
+def save_cluster_points(save_dir, features_pca, labels, centroids):
+    """Save the PCA coordinates, cluster labels and centroids that visualize.py plots."""
+    tmp_path = save_dir / ".cluster_points.tmp.npz"
+    np.savez(tmp_path, points=features_pca.astype(np.float32), labels=labels.astype(np.int32), centroids=centroids)
+    os.replace(tmp_path, save_dir / "cluster_points.npz")
+
+def launch_visualization(save_dir, wait=False):
+    """
+    Run visualize.py on save_dir in its own process, logging to logs/visualize.log.
+    Its output does not go to our stdout, so callers streaming this script's output are not held open.
+    """
+    with open(LOG_DIR / "visualize.log", "a", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).with_name("visualize.py")), str(save_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    print(f"Visualization stage started (pid {process.pid}), log: {LOG_DIR / 'visualize.log'}")
+    if wait:
+        process.wait()
+    return process
+
+def analyze_cluster_topics(cluster, cluster_data, save_dir, embeddings=None):
+    """Fit, score and save the topic model of one cluster; returns (topic model or None, coherence score)."""
+    print(f"\nAnalyzing topics for Cluster {cluster}")
+
+    if len(cluster_data) < 2:
+        print(f"Data too small for Cluster {cluster}. Skipping.")
+        return None, 0.0
+
+    try:
+        topic_model = fit_cluster_topic_model(cluster_data, embeddings=embeddings)
+
+        coherence_score = get_topic_coherence_from_bertopic(topic_model, cluster_data)
+        print(f"Coherence Score for Cluster {cluster}: {coherence_score:.4f}")
+
+        # Topic terms for the results API and the visualization stage
+        try:
+            save_topic_terms(topic_model, cluster, save_dir)
+        except Exception as e:
+            print(f"Error saving topic terms for cluster {cluster}: {e}")
+
+        return topic_model, coherence_score
+    except Exception as e:
+        print(f"Error processing cluster {cluster}: {e}")
+        return None, 0.0
+
+def analyze_topics_per_cluster(df, n_clusters, save_dir, embeddings=None):
+    """Fit a topic model for each cluster and save its topic terms."""
     topic_models = {}
     cluster_coherence_scores = {}
     
     for cluster in range(n_clusters):
-        print(f"\nAnalyzing topics for Cluster {cluster}")
-        cluster_data = df[df["cluster"] == cluster]["article"].tolist()
-        
-        if len(cluster_data) < 2:
-            print(f"Data too small for Cluster {cluster}. Skipping.")
-            cluster_coherence_scores[cluster] = 0.0
-            continue
-        
-        try:
-            # Adjust UMAP parameters based on cluster size
-            n_neighbors = min(15, len(cluster_data) - 1)
-            if n_neighbors < 2:
-                n_neighbors = 2
-                
-            umap_model = UMAP(n_neighbors=n_neighbors, n_components=5, min_dist=0.1, metric='cosine', random_state=42)
-            vectorizer_model = CountVectorizer(ngram_range=(1, 2), stop_words="english", max_features=100)
-            
-            topic_model = BERTopic(
-                vectorizer_model=vectorizer_model,
-                umap_model=umap_model,
-                min_topic_size=2,
-                verbose=True
-            )
-            
-            topics, probs = topic_model.fit_transform(cluster_data)
+        in_cluster = (df["cluster"] == cluster).to_numpy()
+        cluster_data = df.loc[in_cluster, "article"].tolist()
+        cluster_embeddings = None if embeddings is None else embeddings[in_cluster]
+
+        topic_model, coherence_score = analyze_cluster_topics(cluster, cluster_data, save_dir, cluster_embeddings)
+        cluster_coherence_scores[cluster] = coherence_score
+        if topic_model is not None:
             topic_models[cluster] = topic_model
-            
-            coherence_score = get_topic_coherence_from_bertopic(topic_model, cluster_data)
-            cluster_coherence_scores[cluster] = coherence_score
-            print(f"Coherence Score for Cluster {cluster}: {coherence_score:.4f}")
-            
-            # Save topic visualization
-            try:
-                fig = topic_model.visualize_barchart(top_n_topics=min(3, len(topic_model.get_topics())))
-                fig.write_html(save_dir / f"cluster_{cluster}_topics.html")
-                print(f"Visualization saved: cluster_{cluster}_topics.html")
-            except Exception as e:
-                print(f"Error saving visualization for cluster {cluster}: {e}")
-                
-        except Exception as e:
-            print(f"Error processing cluster {cluster}: {e}")
-            cluster_coherence_scores[cluster] = 0.0
 
     return topic_models, cluster_coherence_scores
 
+def summarize_results(df, n_clusters, silhouette, cluster_coherence_scores, cluster_topic_counts):
+    """The topic_info.json document: overall scores plus size, coherence and topic count per cluster."""
+    results = {
+        "silhouette_score": silhouette,
+        "n_clusters": n_clusters,
+        "total_articles": len(df),
+        "cluster_info": {}
+    }
+
+    # Calculate overall coherence score
+    coherence_scores = [score for score in cluster_coherence_scores.values() if score > 0]
+    results["coherence_score"] = np.mean(coherence_scores) if coherence_scores else 0.0
+
+    # Add cluster-specific information
+    for cluster_id in range(n_clusters):
+        results["cluster_info"][cluster_id] = {
+            "size": int((df["cluster"] == cluster_id).sum()),
+            "coherence_score": cluster_coherence_scores.get(cluster_id, 0.0),
+            "topics_count": cluster_topic_counts.get(cluster_id, 0)
+        }
+    return results
+
 if __name__ == "__main__":
+    configure_paths(sys.argv[1] if len(sys.argv) > 1 else None)
     print(f"Starting topic modeling with input file: {DATA_PATH}")
     
     if not DATA_PATH.exists():
@@ -208,49 +327,20 @@ if __name__ == "__main__":
         # Save clustered data
         save_clustered_data(df, CLUSTERED_DIR)
 
-        # Create and save clustering visualization
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x=features_pca[:, 0], y=features_pca[:, 1], hue=cluster_labels, palette="tab10", alpha=0.7)
-        plt.scatter(centroids[:, 0], centroids[:, 1], c='black', marker='X', s=300, label="Centroids")
-        plt.title("Cluster Visualization with KMeans")
-        plt.xlabel("PCA Component 1")
-        plt.ylabel("PCA Component 2")
-        plt.legend()
-        plt.savefig(TOPICMODELLING_DIR / "clustering_visualization.png", dpi=150, bbox_inches='tight')
-        plt.close()
-        print("Clustering visualization saved")
+        # Points for the clustering plot, drawn later by visualize.py
+        save_cluster_points(TOPICMODELLING_DIR, features_pca, cluster_labels, centroids)
 
         # Analyze topics for each cluster
         topic_models, cluster_coherence_scores = analyze_topics_per_cluster(df, n_clusters, TOPICMODELLING_DIR)
 
         # Prepare results for saving
-        results = {
-            "silhouette_score": silhouette,
-            "n_clusters": n_clusters,
-            "total_articles": len(df),
-            "cluster_info": {}
-        }
-
-        # Calculate overall coherence score
-        coherence_scores = [score for score in cluster_coherence_scores.values() if score > 0]
-        overall_coherence = np.mean(coherence_scores) if coherence_scores else 0.0
-        results["coherence_score"] = overall_coherence
-
-        # Add cluster-specific information
-        for cluster_id in range(n_clusters):
-            cluster_size = len(df[df["cluster"] == cluster_id])
-            coherence = cluster_coherence_scores.get(cluster_id, 0.0)
-            
-            results["cluster_info"][cluster_id] = {
-                "size": cluster_size,
-                "coherence_score": coherence,
-                "topics_count": len(topic_models[cluster_id].get_topics()) if cluster_id in topic_models else 0
-            }
+        topic_counts = {cluster_id: len(model.get_topics()) for cluster_id, model in topic_models.items()}
+        results = summarize_results(df, n_clusters, silhouette, cluster_coherence_scores, topic_counts)
+        overall_coherence = results["coherence_score"]
 
         # Save results
         json_output_path = LOG_DIR / "topic_info.json"
-        with open(json_output_path, "w", encoding="utf-8") as json_file:
-            json.dump(results, json_file, indent=4, ensure_ascii=False)
+        write_json_atomically(json_output_path, results)
 
         print(f"\nResults saved to: {json_output_path}")
         print(f"Overall Coherence Score: {overall_coherence:.4f}")
@@ -258,6 +348,11 @@ if __name__ == "__main__":
         print(f"Number of Clusters: {n_clusters}")
         print("Topic modeling completed successfully!")
 
+        # Plots are rendered off the critical path, after the results above are on disk
+        visualize_mode = os.environ.get("TOPIC_VISUALIZE", "async")
+        if visualize_mode != "off":
+            launch_visualization(TOPICMODELLING_DIR, wait=visualize_mode == "sync")
+
     except Exception as e:
         print(f"Error during topic modeling: {e}")
         import traceback
@@ -2,7 +2,9 @@ import os
 import json
 import pandas as pd
 import re
+import sys
 import nltk
+from functools import lru_cache
 from pathlib import Path
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer
@@ -11,6 +13,11 @@ from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.stem import PorterStemmer
 
+# Cleaning kernels shared with src/scrapping/cleaningdata.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from textclean import clean_authors_column
+from corpus import load_corpus
+
 nltk.download("punkt")
 nltk.download("stopwords")
 nltk.download("wordnet")
@@ -21,6 +28,7 @@ RAW_DATA_DIR = BASE_DIR / "data" / "raw"
 DATA_PATH = RAW_DATA_DIR / "scrapped_articles.json"
 CLEANED_DATA_DIR = BASE_DIR / "data" / "cleaned"
 CLEANED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+BERT_MODEL = "all-MiniLM-L6-v2"
 
 stop_words = set(stopwords.words("english"))
 stop_words.update(["using"])
@@ -33,13 +41,6 @@ def check_files():
     for file in RAW_DATA_DIR.iterdir():
         print("-", file.name)
 
-def clean_authors(author_str):
-    if pd.isna(author_str):
-        return ""
-    authors = [author.strip(" ;") for author in author_str.split(",") if author.strip(" ;")]
-    unique_authors = ", ".join(sorted(set(authors)))
-    return unique_authors
-
 def preprocess_text(text):
     text = text.lower()
     text = re.sub(r"[^a-z\s]", "", text)
@@ -55,18 +56,15 @@ def load_data():
         check_files()
         raise FileNotFoundError(f"File '{DATA_PATH}' tidak ditemukan. Pastikan nama dan lokasi benar.")
     
-    with open(DATA_PATH, encoding="utf-8") as f:
-        articles = json.load(f)
+    df = load_corpus(DATA_PATH)
 
-    df = pd.DataFrame(articles)
-
-    df = df[df["Judul"].str.lower().str.strip() != "judul tidak ditemukan"]
+    df = df[(df["Judul"].str.lower().str.strip() != "judul tidak ditemukan").fillna(True)]
 
     if "Judul" not in df.columns:
         raise KeyError("Kolom 'Judul' tidak ditemukan dalam dataset.")
     
-    df["Author"] = df.get("Author", "").apply(clean_authors)
-    df = df[df["Judul"].str.lower().str.strip() != "judul tidak ditemukan"]
+    df["Author"] = clean_authors_column(df["Author"]) if "Author" in df.columns else ""
+    df = df[(df["Judul"].str.lower().str.strip() != "judul tidak ditemukan").fillna(True)]
     df = df.drop_duplicates(subset=["Judul"], keep="first")
 
     df.rename(columns={"Judul": "article"}, inplace=True)
@@ -87,10 +85,14 @@ def apply_tfidf(df):
     tfidf_matrix = vectorizer.fit_transform(df["article"])
     return pd.DataFrame(tfidf_matrix.toarray(), columns=vectorizer.get_feature_names_out())
 
+@lru_cache(maxsize=1)
+def load_bert_model():
+    """The SentenceTransformer model, loaded once per process (sharded workers embed many batches)."""
+    return SentenceTransformer(BERT_MODEL)
+
 def apply_bert(df):
     """Get BERT embeddings using SentenceTransformer."""
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-    bert_embeddings = model.encode(df["article"].tolist(), show_progress_bar=True)
+    bert_embeddings = load_bert_model().encode(df["article"].tolist(), show_progress_bar=True)
     return pd.DataFrame(bert_embeddings)
 
 if __name__ == "__main__":
@@ -0,0 +1,460 @@
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import TopicModelling as tm
+
+DEFAULT_SHARED_DIR = tm.BASE_DIR / "data" / "cleaned" / "shards"
+EMBED_SHARD_SIZE = 2000     # documents per embedding task
+LEASE_SECONDS = 120.0       # a lease not renewed for this long belongs to a dead or stalled worker
+HEARTBEAT_SECONDS = 10.0
+RESTORE_GRACE_SECONDS = 0.5
+POLL_SECONDS = 1.0
+
+# Shared directory layout:
+#   plan.json, documents.json        written by plan()
+#   tasks/<task>.json                task specs (embed-NNNNN, then topics-NNNNN once embeddings are merged)
+#   leases/<task>.lease              held by the worker running the task
+#   results/<task>.json              written last, marks the task as done (<task>.error.json if it failed)
+#   embeddings.npy, labels.npy       merged by the coordinator, read by topic tasks
+#   complete.json                    written by the coordinator when the run has finished; workers then exit
+
+# =========================
+# FILES
+# =========================
+
+def write_json_atomically(path, data):
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def save_array_atomically(path, array):
+    tmp_path = path.with_name(f".{path.stem}.{uuid.uuid4().hex}.tmp.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def shared_dirs(root):
+    return root / "tasks", root / "leases", root / "results"
+
+# =========================
+# LEASES
+# =========================
+
+class Lease:
+    """
+    Exclusive claim on a task: <task>.lease created with O_CREAT | O_EXCL, so exactly one
+    worker's create succeeds. The holder touches the file every few seconds. A lease
+    whose mtime is older than lease_seconds is broken by the next worker that wants the task.
+
+    Breaking renames the lease to a tombstone name unique to this worker, so only one
+    worker can move a given lease file away. If the moved file turns out to be fresh
+    (another worker broke the stale lease and created its own in between), it is put
+    back instead of deleted.
+    """
+
+    def __init__(self, path, worker_id, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = min(HEARTBEAT_SECONDS, lease_seconds / 3)
+        self.token = uuid.uuid4().hex
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def acquire(self):
+        if not self._create() and not (self._break_if_expired() and self._create()):
+            return False
+        self._thread = threading.Thread(target=self._heartbeat, name=f"lease-{self.path.stem}", daemon=True)
+        self._thread.start()
+        return True
+
+    def release(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._owned():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _create(self):
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "worker": self.worker_id,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "token": self.token,
+                "acquired_at": time.time()
+            }, f)
+        return True
+
+    def _break_if_expired(self):
+        try:
+            age = time.time() - os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return True
+        if age < self.lease_seconds:
+            return False
+
+        tombstone = self.path.with_name(f"{self.path.name}.broken.{self.token}")
+        try:
+            os.rename(self.path, tombstone)
+        except FileNotFoundError:
+            # Another worker moved it first; the O_EXCL create decides who gets the task
+            return True
+        try:
+            # What was renamed may be a lease created after the stat above
+            age = time.time() - os.stat(tombstone).st_mtime
+            if age < self.lease_seconds:
+                self._restore(tombstone)
+                return False
+            try:
+                holder = read_json(tombstone).get("worker")
+            except (OSError, ValueError):
+                holder = None
+            print(f"[{self.worker_id}] Lease {self.path.stem} dari {holder} kedaluwarsa ({age:.0f}s), diambil alih")
+        finally:
+            try:
+                os.remove(tombstone)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _restore(self, tombstone):
+        """Put a live lease back where its holder expects it, unless a newer one already took its place."""
+        try:
+            os.link(tombstone, self.path)
+        except FileExistsError:
+            pass
+
+    def _owned(self):
+        try:
+            return read_json(self.path).get("token") == self.token
+        except (OSError, ValueError):
+            return False
+
+    def _still_owned(self):
+        if self._owned():
+            return True
+        # A worker checking a stale-looking lease moves it away for a moment before putting it back
+        time.sleep(RESTORE_GRACE_SECONDS)
+        return self._owned()
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            if not self._still_owned():
+                self.lost = True
+                print(f"[{self.worker_id}] Lease {self.path.stem} hilang; hasil tugas tetap ditulis")
+                return
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                pass
+
+# =========================
+# WORKER
+# =========================
+
+def pending_tasks(root):
+    tasks_dir, _, results_dir = shared_dirs(root)
+    for task_path in sorted(tasks_dir.glob("*.json")):
+        task_id = task_path.stem
+        if not (results_dir / f"{task_id}.json").exists() and not (results_dir / f"{task_id}.error.json").exists():
+            yield task_id, task_path
+
+def claim_next_task(root, worker_id, lease_seconds=LEASE_SECONDS):
+    _, leases_dir, _ = shared_dirs(root)
+    for task_id, task_path in pending_tasks(root):
+        lease = Lease(leases_dir / f"{task_id}.lease", worker_id, lease_seconds)
+        if lease.acquire():
+            # Finished by someone else between the listing and our claim
+            if (root / "results" / f"{task_id}.json").exists():
+                lease.release()
+                continue
+            return read_json(task_path), lease
+    return None, None
+
+def run_embed_task(root, task):
+    # Imported here: preprocessing loads NLTK data and sentence-transformers on import
+    from preprocessing import apply_bert
+
+    documents = read_json(root / "documents.json")[task["start"]:task["stop"]]
+    embeddings = apply_bert(pd.DataFrame({"article": documents})).to_numpy(dtype=np.float32)
+    save_array_atomically(root / "results" / f"{task['id']}.npy", embeddings)
+    return {"rows": len(documents)}
+
+def run_topics_task(root, task):
+    cluster = task["cluster"]
+    documents = read_json(root / "documents.json")
+    labels = np.load(root / "labels.npy")
+    embeddings = np.load(root / "embeddings.npy", mmap_mode="r")
+    rows = np.flatnonzero(labels == cluster)
+
+    # analyze_cluster_topics writes cluster_<n>_topics.json next to the task results
+    topic_model, coherence = tm.analyze_cluster_topics(
+        cluster, [documents[i] for i in rows], root / "results", np.asarray(embeddings[rows])
+    )
+    return {
+        "cluster": cluster,
+        "size": int(len(rows)),
+        "coherence_score": float(coherence),
+        "topics_count": len(topic_model.get_topics()) if topic_model is not None else 0
+    }
+
+TASK_RUNNERS = {"embed": run_embed_task, "topics": run_topics_task}
+
+def run_worker(root, worker_id=None, lease_seconds=LEASE_SECONDS):
+    """Claim and run tasks from the shared directory until the coordinator marks the run complete."""
+    root = Path(root)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    results_dir = root / "results"
+    print(f"[{worker_id}] Worker started on {root}")
+
+    completed = 0
+    while not (root / "complete.json").exists():
+        task, lease = claim_next_task(root, worker_id, lease_seconds) if (root / "plan.json").exists() else (None, None)
+        if task is None:
+            time.sleep(POLL_SECONDS)
+            continue
+
+        started = time.perf_counter()
+        print(f"[{worker_id}] Running {task['id']}")
+        try:
+            result = TASK_RUNNERS[task["stage"]](root, task)
+            result.update(task=task["id"], worker=worker_id, seconds=time.perf_counter() - started)
+            write_json_atomically(results_dir / f"{task['id']}.json", result)
+            completed += 1
+            print(f"[{worker_id}] Finished {task['id']} in {result['seconds']:.1f}s")
+        except Exception as e:
+            print(f"[{worker_id}] Task {task['id']} gagal: {e}")
+            write_json_atomically(results_dir / f"{task['id']}.error.json", {
+                "task": task["id"], "worker": worker_id, "error": str(e), "traceback": traceback.format_exc()
+            })
+        finally:
+            lease.release()
+
+    print(f"[{worker_id}] Run complete, {completed} tasks done by this worker")
+    return completed
+
+# =========================
+# COORDINATOR
+# =========================
+
+def plan_run(input_path, root, shard_size=EMBED_SHARD_SIZE, n_clusters=None, reset=False):
+    """Split the corpus into embedding tasks on the shared directory."""
+    root = Path(root)
+    if reset and root.exists():
+        shutil.rmtree(root)
+    if (root / "plan.json").exists():
+        raise FileExistsError(f"{root} already holds a run; use --reset to start over")
+
+    tm.configure_paths(input_path)
+    df = tm.load_articles(tm.DATA_PATH)
+    documents = df["article"].tolist()
+    if len(documents) < 3:
+        raise ValueError("Not enough data for clustering. Need at least 3 articles.")
+
+    tasks_dir, leases_dir, results_dir = shared_dirs(root)
+    for directory in (tasks_dir, leases_dir, results_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    write_json_atomically(root / "documents.json", documents)
+    embed_tasks = []
+    for shard, start in enumerate(range(0, len(documents), shard_size)):
+        task = {"id": f"embed-{shard:05d}", "stage": "embed", "start": start, "stop": min(start + shard_size, len(documents))}
+        write_json_atomically(tasks_dir / f"{task['id']}.json", task)
+        embed_tasks.append(task["id"])
+
+    # Written last: workers only start claiming once the plan exists
+    write_json_atomically(root / "plan.json", {
+        "input": str(Path(tm.DATA_PATH).resolve()),
+        "documents": len(documents),
+        "n_clusters": n_clusters or min(3, len(documents)),
+        "embed_tasks": embed_tasks,
+        "created_at": time.time()
+    })
+    print(f"Planned {len(embed_tasks)} embedding tasks for {len(documents)} articles in {root}")
+
+def wait_for_tasks(root, task_ids, timeout=None, check=None):
+    """Block until every task has a result; raises if any task failed. check() is called on every poll."""
+    results_dir = root / "results"
+    deadline = None if timeout is None else time.time() + timeout
+    remaining = set(task_ids)
+    while remaining:
+        for task_id in sorted(remaining):
+            error_path = results_dir / f"{task_id}.error.json"
+            if error_path.exists():
+                raise RuntimeError(f"Task {task_id} failed: {read_json(error_path)['error']}")
+            if (results_dir / f"{task_id}.json").exists():
+                remaining.discard(task_id)
+        if remaining:
+            if check is not None:
+                check()
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError(f"Tasks not finished: {', '.join(sorted(remaining))}")
+            time.sleep(POLL_SECONDS)
+    return [read_json(results_dir / f"{task_id}.json") for task_id in task_ids]
+
+def coordinate(root, timeout=None, check=None):
+    """
+    Merge the embedding tasks, cluster, hand out one topic task per cluster, and merge
+    their results into the same outputs TopicModelling.py writes. Merges follow task id
+    order, so the outputs do not depend on which worker ran what or when.
+    """
+    root = Path(root)
+    plan = read_json(root / "plan.json")
+    tm.configure_paths(plan["input"])
+    try:
+        df = tm.load_articles(tm.DATA_PATH)
+        if df["article"].tolist() != read_json(root / "documents.json"):
+            raise ValueError(f"{tm.DATA_PATH} changed since the run was planned")
+
+        started = time.perf_counter()
+        wait_for_tasks(root, plan["embed_tasks"], timeout, check)
+        embeddings = np.concatenate([np.load(root / "results" / f"{task_id}.npy") for task_id in plan["embed_tasks"]])
+        save_array_atomically(root / "embeddings.npy", embeddings)
+        print(f"Merged {len(plan['embed_tasks'])} embedding tasks {embeddings.shape} in {time.perf_counter() - started:.1f}s")
+
+        _, features_pca = tm.vectorize_and_reduce(df)
+        n_clusters = plan["n_clusters"]
+        cluster_labels, centroids, silhouette = tm.perform_clustering(features_pca, n_clusters)
+        df["cluster"] = cluster_labels
+        save_array_atomically(root / "labels.npy", cluster_labels)
+        print(f"\nSilhouette Score: {silhouette:.4f}")
+
+        topic_tasks = []
+        for cluster in range(n_clusters):
+            task = {"id": f"topics-{cluster:05d}", "stage": "topics", "cluster": cluster}
+            write_json_atomically(root / "tasks" / f"{task['id']}.json", task)
+            topic_tasks.append(task["id"])
+
+        tm.save_clustered_data(df, tm.CLUSTERED_DIR)
+        tm.save_cluster_points(tm.TOPICMODELLING_DIR, features_pca, cluster_labels, centroids)
+
+        started = time.perf_counter()
+        topic_results = wait_for_tasks(root, topic_tasks, timeout, check)
+        for result in topic_results:
+            topics_file = root / "results" / f"cluster_{result['cluster']}_topics.json"
+            if topics_file.exists():
+                tmp_path = tm.TOPICMODELLING_DIR / f".{topics_file.name}.{uuid.uuid4().hex}.tmp"
+                shutil.copyfile(topics_file, tmp_path)
+                os.replace(tmp_path, tm.TOPICMODELLING_DIR / topics_file.name)
+        print(f"Merged {len(topic_tasks)} topic tasks in {time.perf_counter() - started:.1f}s")
+
+        results = tm.summarize_results(
+            df, n_clusters, silhouette,
+            {result["cluster"]: result["coherence_score"] for result in topic_results},
+            {result["cluster"]: result["topics_count"] for result in topic_results}
+        )
+        json_output_path = tm.LOG_DIR / "topic_info.json"
+        write_json_atomically(json_output_path, results)
+
+        print(f"\nResults saved to: {json_output_path}")
+        print(f"Overall Coherence Score: {results['coherence_score']:.4f}")
+        print(f"Silhouette Score: {silhouette:.4f}")
+        print(f"Number of Clusters: {n_clusters}")
+    except Exception as e:
+        write_json_atomically(root / "complete.json", {"status": "failed", "error": str(e), "finished_at": time.time()})
+        raise
+
+    write_json_atomically(root / "complete.json", {"status": "succeeded", "finished_at": time.time()})
+
+    visualize_mode = os.environ.get("TOPIC_VISUALIZE", "async")
+    if visualize_mode != "off":
+        tm.launch_visualization(tm.TOPICMODELLING_DIR, wait=visualize_mode == "sync")
+    return results
+
+def worker_command(root, worker_id, lease_seconds):
+    return [sys.executable, str(Path(__file__).resolve()), "worker", "--shared-dir", str(root),
+            "--worker-id", worker_id, "--lease-seconds", str(lease_seconds)]
+
+def run_local(input_path, root, workers, shard_size=EMBED_SHARD_SIZE, n_clusters=None, lease_seconds=LEASE_SECONDS):
+    """Plan, start `workers` local worker processes standing in for nodes, and coordinate."""
+    root = Path(root)
+    plan_run(input_path, root, shard_size, n_clusters, reset=True)
+    processes = [subprocess.Popen(worker_command(root, f"local-{i}", lease_seconds)) for i in range(workers)]
+
+    def check_workers():
+        if all(process.poll() is not None for process in processes):
+            raise RuntimeError("All local workers exited before the run finished")
+
+    try:
+        return coordinate(root, check=check_workers)
+    finally:
+        for process in processes:
+            try:
+                process.wait(timeout=POLL_SECONDS * 10)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded embedding and per-cluster topic modelling over a shared directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command):
+        command.add_argument("--shared-dir", default=str(DEFAULT_SHARED_DIR), help="Directory every worker can read and write")
+
+    plan_parser = commands.add_parser("plan", help="Split the corpus into embedding tasks")
+    plan_parser.add_argument("input", nargs="?", help="cleaned_articles.json (default: data/cleaned/cleaned_articles.json)")
+    plan_parser.add_argument("--shard-size", type=int, default=EMBED_SHARD_SIZE)
+    plan_parser.add_argument("--n-clusters", type=int)
+    plan_parser.add_argument("--reset", action="store_true", help="Delete an earlier run in the shared directory")
+    add_common(plan_parser)
+
+    worker_parser = commands.add_parser("worker", help="Claim and run tasks until the run is complete")
+    worker_parser.add_argument("--worker-id")
+    worker_parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    add_common(worker_parser)
+
+    coordinate_parser = commands.add_parser("coordinate", help="Merge task results and write the modelling outputs")
+    coordinate_parser.add_argument("--timeout", type=float)
+    add_common(coordinate_parser)
+
+    local_parser = commands.add_parser("run-local", help="plan + N local worker processes + coordinate")
+    local_parser.add_argument("input", nargs="?")
+    local_parser.add_argument("--workers", type=int, default=2)
+    local_parser.add_argument("--shard-size", type=int, default=EMBED_SHARD_SIZE)
+    local_parser.add_argument("--n-clusters", type=int)
+    local_parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    add_common(local_parser)
+
+    args = parser.parse_args()
+    try:
+        if args.command == "plan":
+            plan_run(args.input, args.shared_dir, args.shard_size, args.n_clusters, args.reset)
+        elif args.command == "worker":
+            run_worker(args.shared_dir, args.worker_id, args.lease_seconds)
+        elif args.command == "coordinate":
+            coordinate(args.shared_dir, args.timeout)
+        else:
+            run_local(args.input, args.shared_dir, args.workers, args.shard_size, args.n_clusters, args.lease_seconds)
+    except Exception as e:
+        print(f"Error during sharded topic modeling: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
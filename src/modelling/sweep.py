@@ -0,0 +1,255 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import mlflow
+import numpy as np
+from umap.umap_ import nearest_neighbors
+
+import TopicModelling as tm
+
+# =========================
+# SEARCH SPACE
+# =========================
+
+DEFAULT_GRID = {
+    "n_clusters": [2, 3, 4, 5],
+    "n_neighbors": [5, 10, 15],
+    "n_components": [5],
+    "min_topic_size": [2, 5, 10]
+}
+OBJECTIVES = ("coherence_score", "silhouette_score")
+EXPERIMENT_NAME = "topic-modelling-sweep"
+
+def parse_values(text):
+    return sorted({int(value) for value in text.split(",") if value.strip()})
+
+def build_trials(grid, n_trials=None, seed=42):
+    """All grid combinations, or a random sample of n_trials of them (random search)."""
+    keys = list(grid)
+    trials = [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+    if n_trials is not None and n_trials < len(trials):
+        trials = random.Random(seed).sample(trials, n_trials)
+    return trials
+
+# =========================
+# SHARED PRECOMPUTATION
+# =========================
+
+def precompute(documents, features_pca, embeddings, trials):
+    """
+    Everything trials have in common, computed once in the parent: KMeans labels and
+    silhouette per n_clusters, and per cluster a cosine kNN graph at the largest
+    n_neighbors in the search (smaller settings use its leading columns).
+    """
+    max_neighbors = max(trial["n_neighbors"] for trial in trials)
+    clusterings = {}
+    for n_clusters in sorted({trial["n_clusters"] for trial in trials}):
+        started = time.perf_counter()
+        labels, _, silhouette = tm.perform_clustering(features_pca, n_clusters)
+        clusters = {}
+        for cluster in range(n_clusters):
+            rows = np.flatnonzero(labels == cluster)
+            knn = None
+            if len(rows) >= 2:
+                knn_indices, knn_dists, _ = nearest_neighbors(
+                    embeddings[rows], min(max_neighbors, len(rows)), "cosine", {}, False, np.random.RandomState(42)
+                )
+                knn = (knn_indices, knn_dists)
+            clusters[cluster] = {"rows": rows, "knn": knn}
+        clusterings[n_clusters] = {
+            "silhouette": float(silhouette),
+            "clusters": clusters,
+            "seconds": time.perf_counter() - started
+        }
+        print(f"n_clusters={n_clusters}: silhouette {silhouette:.4f}, kNN graphs k={max_neighbors} ready")
+    return clusterings
+
+# Set in each pool worker by init_worker; pickled once per worker, not per trial
+SHARED = {}
+
+def init_worker(documents, embeddings, clusterings):
+    warnings.filterwarnings("ignore", message=".*knn_search_index.*")
+    SHARED.update(documents=documents, embeddings=embeddings, clusterings=clusterings)
+
+def run_trial(trial):
+    """Fit one topic model per cluster for a configuration and score it."""
+    started = time.perf_counter()
+    documents, embeddings = SHARED["documents"], SHARED["embeddings"]
+    clustering = SHARED["clusterings"][trial["n_clusters"]]
+
+    per_cluster = {}
+    for cluster, info in clustering["clusters"].items():
+        rows = info["rows"]
+        if len(rows) < 2:
+            per_cluster[cluster] = {"size": int(len(rows)), "coherence_score": 0.0, "topics_count": 0}
+            continue
+        cluster_data = [documents[i] for i in rows]
+        try:
+            topic_model = tm.fit_cluster_topic_model(
+                cluster_data,
+                embeddings=embeddings[rows],
+                n_neighbors=trial["n_neighbors"],
+                n_components=trial["n_components"],
+                min_topic_size=trial["min_topic_size"],
+                knn=info["knn"],
+                verbose=False
+            )
+            coherence = float(tm.get_topic_coherence_from_bertopic(topic_model, cluster_data))
+            topics_count = len(topic_model.get_topics())
+        except Exception as e:
+            print(f"Trial {trial} cluster {cluster} gagal: {e}")
+            coherence, topics_count = 0.0, 0
+        per_cluster[cluster] = {"size": int(len(rows)), "coherence_score": coherence, "topics_count": topics_count}
+
+    coherence_scores = [info["coherence_score"] for info in per_cluster.values() if info["coherence_score"] > 0]
+    return {
+        "params": trial,
+        "silhouette_score": clustering["silhouette"],
+        "coherence_score": float(np.mean(coherence_scores)) if coherence_scores else 0.0,
+        "total_topics": sum(info["topics_count"] for info in per_cluster.values()),
+        "cluster_info": per_cluster,
+        "fit_seconds": time.perf_counter() - started,
+        "pid": os.getpid()
+    }
+
+# =========================
+# TRACKING
+# =========================
+
+def log_trial(result):
+    """One nested MLflow run per trial, with the metric names TopicModelling runs use."""
+    params = result["params"]
+    name = "-".join(f"{key}={value}" for key, value in params.items())
+    with mlflow.start_run(run_name=name, nested=True):
+        mlflow.log_params(params)
+        metrics = {
+            "silhouette_score": result["silhouette_score"],
+            "coherence_score": result["coherence_score"],
+            "total_topics": result["total_topics"],
+            "fit_seconds": result["fit_seconds"]
+        }
+        for cluster, info in result["cluster_info"].items():
+            metrics[f"coherence_score_cluster_{cluster}"] = info["coherence_score"]
+            metrics[f"num_topics_cluster_{cluster}"] = info["topics_count"]
+        mlflow.log_metrics(metrics)
+
+def best_trial(results, objective):
+    """Highest objective; the other metric breaks ties."""
+    other = [metric for metric in OBJECTIVES if metric != objective][0]
+    return max(results, key=lambda result: (result[objective], result[other]))
+
+# =========================
+# SWEEP
+# =========================
+
+def run_sweep(input_path, grid, n_trials=None, workers=None, objective="coherence_score", seed=42):
+    tm.configure_paths(input_path)
+    # Runs go to the repo's local mlruns/ file store; recent MLflow releases require this opt-in for it
+    os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri((tm.BASE_DIR / "mlruns").resolve().as_uri())
+    mlflow.set_experiment(EXPERIMENT_NAME)
+
+    df = tm.load_articles(tm.DATA_PATH)
+    documents = df["article"].tolist()
+    trials = build_trials(grid, n_trials, seed)
+    trials = [trial for trial in trials if trial["n_clusters"] <= len(documents)]
+    if not trials:
+        raise ValueError("Tidak ada konfigurasi yang valid untuk jumlah artikel ini.")
+
+    timings = {}
+    started = time.perf_counter()
+    _, features_pca = tm.vectorize_and_reduce(df)
+    timings["tfidf_pca_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    embeddings = np.asarray(tm.embed_documents(documents, cache_dir=tm.TOPICMODELLING_DIR / "embeddings"))
+    timings["embedding_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    clusterings = precompute(documents, features_pca, embeddings, trials)
+    timings["clustering_knn_seconds"] = time.perf_counter() - started
+
+    workers = workers or min(len(trials), os.cpu_count() or 1)
+    print(f"Running {len(trials)} trials on {workers} worker processes")
+
+    results = []
+    started = time.perf_counter()
+    with mlflow.start_run(run_name=f"sweep-{len(trials)}-trials") as parent:
+        mlflow.log_params({
+            "search": "random" if n_trials is not None else "grid",
+            "objective": objective,
+            "articles": len(documents),
+            **{f"grid_{key}": ",".join(map(str, values)) for key, values in grid.items()}
+        })
+        mlflow.log_metrics(timings)
+
+        # Spawned, not forked: forking after numba's kNN threads have started can deadlock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=init_worker, initargs=(documents, embeddings, clusterings)) as pool:
+            futures = [pool.submit(run_trial, trial) for trial in trials]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                log_trial(result)
+                print(f"[{len(results)}/{len(trials)}] {result['params']} "
+                      f"coherence {result['coherence_score']:.4f} silhouette {result['silhouette_score']:.4f} "
+                      f"topics {result['total_topics']} ({result['fit_seconds']:.1f}s)")
+
+        timings["trials_seconds"] = time.perf_counter() - started
+        best = best_trial(results, objective)
+        mlflow.log_params({f"best_{key}": value for key, value in best["params"].items()})
+        mlflow.log_metrics({
+            f"best_{objective}": best[objective],
+            "trials_seconds": timings["trials_seconds"]
+        })
+
+        report = {
+            "input": str(tm.DATA_PATH),
+            "objective": objective,
+            "mlflow_run_id": parent.info.run_id,
+            "timings": timings,
+            "best": best,
+            "trials": sorted(results, key=lambda result: result[objective], reverse=True)
+        }
+        report_path = tm.LOG_DIR / "sweep_results.json"
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        mlflow.log_artifact(str(report_path))
+
+    print(f"\nBest configuration ({objective}): {best['params']}")
+    print(f"Coherence Score: {best['coherence_score']:.4f}  Silhouette Score: {best['silhouette_score']:.4f}")
+    print(f"Sweep results saved to: {report_path}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for clustering and per-cluster BERTopic.")
+    parser.add_argument("input", nargs="?", help="cleaned_articles.json (default: data/cleaned/cleaned_articles.json)")
+    for key, values in DEFAULT_GRID.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", default=",".join(map(str, values)),
+                            help=f"Comma-separated values (default: %(default)s)")
+    parser.add_argument("--trials", type=int, help="Random search: sample this many configurations from the grid")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="coherence_score")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    grid = {key: parse_values(getattr(args, key)) for key in DEFAULT_GRID}
+    try:
+        run_sweep(args.input, grid, args.trials, args.workers, args.objective, args.seed)
+    except Exception as e:
+        print(f"Error during sweep: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
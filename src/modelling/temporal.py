@@ -0,0 +1,261 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from bertopic import BERTopic
+from sklearn.preprocessing import normalize
+
+import TopicModelling as tm
+
+YEAR_COLUMNS = ("year", "Tahun")
+N_WORDS = 5
+MIN_TOPIC_SIZE = 5
+
+# =========================
+# CORPUS
+# =========================
+
+def article_years(df):
+    """Publication year per row as a nullable integer, from `year` (scraper) or `Tahun` (older exports)."""
+    years = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    for column in YEAR_COLUMNS:
+        if column in df.columns:
+            parsed = pd.to_numeric(df[column].astype("string").str.extract(r"(\d{4})", expand=False), errors="coerce")
+            years = years.fillna(parsed.astype("Int64"))
+    return years
+
+def document_key(year, text):
+    return hashlib.sha1(f"{year}\0{text}".encode("utf-8")).hexdigest()
+
+def year_signature(keys):
+    return hashlib.sha1("\n".join(sorted(keys)).encode("utf-8")).hexdigest()
+
+# =========================
+# PER-YEAR REPRESENTATIONS
+# =========================
+
+def topic_representation_parts(topic_model):
+    """
+    What a per-year computation needs from the global model: the fitted vectorizer and
+    c-TF-IDF transformer, the L1-normalised global c-TF-IDF matrix, and its row per topic id.
+    All picklable, so pool workers get them without loading UMAP/HDBSCAN.
+    """
+    topic_ids = sorted(topic_model.get_topics())
+    return {
+        "vectorizer": topic_model.vectorizer_model,
+        "ctfidf": topic_model.ctfidf_model,
+        "global_c_tf_idf": normalize(topic_model.c_tf_idf_, axis=1, norm="l1"),
+        "rows": {topic: row for row, topic in enumerate(topic_ids)},
+        "words": topic_model.vectorizer_model.get_feature_names_out(),
+        "language": topic_model.language
+    }
+
+def clean_documents(documents, language):
+    """The basic cleaning BERTopic applies before its vectorizer (BERTopic._preprocess_text)."""
+    cleaned = [doc.replace("\n", " ").replace("\t", " ") for doc in documents]
+    if language == "english":
+        cleaned = [re.sub(r"[^A-Za-z0-9 ]+", "", doc) for doc in cleaned]
+    return [doc if doc != "" else "emptydoc" for doc in cleaned]
+
+def year_topics(parts, documents, topics, n_words=N_WORDS):
+    """
+    Topic frequencies and top words for one year's documents: the year's c-TF-IDF,
+    averaged with the global one (BERTopic's global_tuning), so years are independent.
+    """
+    frame = pd.DataFrame({"Document": documents, "Topic": topics})
+    per_topic = frame.groupby("Topic", sort=True).agg(Document=("Document", " ".join), Frequency=("Document", "size"))
+
+    documents_per_topic = clean_documents(per_topic["Document"], parts["language"])
+    c_tf_idf = parts["ctfidf"].transform(parts["vectorizer"].transform(documents_per_topic))
+    c_tf_idf = normalize(c_tf_idf, axis=1, norm="l1")
+    c_tf_idf = (parts["global_c_tf_idf"][[parts["rows"][topic] for topic in per_topic.index]] + c_tf_idf) / 2.0
+    c_tf_idf = c_tf_idf.toarray()
+
+    result = {}
+    for i, (topic, frequency) in enumerate(per_topic["Frequency"].items()):
+        top = np.argsort(c_tf_idf[i])[::-1][:n_words]
+        result[int(topic)] = {
+            "frequency": int(frequency),
+            "words": ", ".join(parts["words"][j] for j in top if c_tf_idf[i, j] > 0)
+        }
+    return result
+
+# Set in each pool worker by init_worker
+PARTS = {}
+
+def init_worker(parts):
+    PARTS.update(parts)
+
+def run_year(job):
+    year, documents, topics = job
+    return year, year_topics(PARTS, documents, topics)
+
+def compute_years(parts, jobs, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        init_worker(parts)
+        return dict(map(run_year, jobs))
+    # Spawned, not forked: the global fit has started numba threads in this process
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=init_worker, initargs=(parts,)) as pool:
+        return dict(pool.map(run_year, jobs))
+
+# =========================
+# STATE
+# =========================
+
+def temporal_paths():
+    temporal_dir = tm.TOPICMODELLING_DIR / "temporal"
+    return {
+        "dir": temporal_dir,
+        "model": temporal_dir / "global_model",
+        "state": temporal_dir / "state.json",
+        "artifact": tm.TOPICMODELLING_DIR / "topics_over_time.json"
+    }
+
+def write_json_atomically(path, data, indent=None):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_state(paths):
+    """Article topic assignments, per-year signatures and per-year results of the last run (None: refit)."""
+    if not paths["state"].exists() or not paths["model"].exists():
+        return None
+    with open(paths["state"], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def fit_global_model(documents, embeddings, paths):
+    """One topic model over every dated article, saved so later runs only assign new articles."""
+    topic_model = tm.fit_cluster_topic_model(documents, embeddings=embeddings, min_topic_size=MIN_TOPIC_SIZE)
+    paths["dir"].mkdir(parents=True, exist_ok=True)
+    topic_model.save(str(paths["model"]), serialization="pickle", save_embedding_model=False)
+    return topic_model, [int(topic) for topic in topic_model.topics_]
+
+# =========================
+# RUN
+# =========================
+
+def run_temporal(input_path=None, refit=False, workers=None):
+    tm.configure_paths(input_path)
+    paths = temporal_paths()
+
+    df = tm.load_articles(tm.DATA_PATH)
+    df["year"] = article_years(df)
+    undated = int(df["year"].isna().sum())
+    df = df[df["year"].notna()]
+    if len(df) < MIN_TOPIC_SIZE:
+        raise ValueError(f"Only {len(df)} articles have a publication year; need at least {MIN_TOPIC_SIZE}.")
+
+    documents = df["article"].tolist()
+    years = df["year"].astype(int).tolist()
+    keys = [document_key(year, text) for year, text in zip(years, documents)]
+    cache_dir = tm.TOPICMODELLING_DIR / "embeddings"
+    timings = {}
+
+    state = None if refit else load_state(paths)
+    started = time.perf_counter()
+    if state is None:
+        # New global model: every year is recomputed
+        embeddings = np.asarray(tm.embed_documents(documents, cache_dir=cache_dir))
+        topic_model, topics = fit_global_model(documents, embeddings, paths)
+        assigned = dict(zip(keys, topics))
+        state = {"model_version": f"{time.time():.0f}", "assigned": {}, "years": {}, "by_year": {}}
+        print(f"Fitted global topic model on {len(documents)} articles: {len(topic_model.get_topics())} topics")
+    else:
+        topic_model = BERTopic.load(str(paths["model"]))
+        current = set(keys)
+        assigned = {key: topic for key, topic in state["assigned"].items() if key in current}
+        new_rows = [i for i, key in enumerate(keys) if key not in assigned]
+        if new_rows:
+            # Only new articles are embedded and assigned to the existing topics
+            new_documents = [documents[i] for i in new_rows]
+            new_embeddings = np.asarray(tm.embed_documents(new_documents, cache_dir=cache_dir))
+            new_topics, _ = topic_model.transform(new_documents, new_embeddings)
+            assigned.update({keys[i]: int(topic) for i, topic in zip(new_rows, new_topics)})
+        print(f"Loaded global topic model; {len(new_rows)} new articles assigned")
+    timings["model_seconds"] = time.perf_counter() - started
+
+    # Years whose set of articles changed since the last run
+    keys_by_year = {}
+    for year, key in zip(years, keys):
+        keys_by_year.setdefault(year, []).append(key)
+    signatures = {str(year): year_signature(year_keys) for year, year_keys in keys_by_year.items()}
+    previous = state["by_year"]
+    dirty = sorted(int(year) for year, signature in signatures.items()
+                   if state["years"].get(year) != signature or year not in previous)
+
+    started = time.perf_counter()
+    rows_by_year = {}
+    for i, year in enumerate(years):
+        rows_by_year.setdefault(year, []).append(i)
+    jobs = [(year, [documents[i] for i in rows_by_year[year]], [assigned[keys[i]] for i in rows_by_year[year]])
+            for year in dirty]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    computed = compute_years(topic_representation_parts(topic_model), jobs, workers) if jobs else {}
+    timings["years_seconds"] = time.perf_counter() - started
+    print(f"Recomputed {len(dirty)} of {len(signatures)} years: {dirty}")
+
+    by_year = {year: previous[year] for year in signatures if int(year) not in computed}
+    by_year.update({str(year): {str(topic): value for topic, value in topics.items()} for year, topics in computed.items()})
+    artifact = build_artifact(topic_model, by_year, state["model_version"], dirty, undated, timings)
+    write_json_atomically(paths["artifact"], artifact)
+
+    state["assigned"] = assigned
+    state["years"] = signatures
+    state["by_year"] = by_year
+    write_json_atomically(paths["state"], state)
+
+    print(f"Topics over time saved to: {paths['artifact']}")
+    return artifact
+
+def build_artifact(topic_model, by_year, model_version, updated_years, undated, timings):
+    """
+    Compact time series: one frequency list and one top-words list per topic,
+    both aligned with `years`.
+    """
+    years = sorted(by_year, key=int)
+    info = topic_model.get_topic_info().set_index("Topic")
+    topics = []
+    for topic in sorted(info.index):
+        key = str(topic)
+        topics.append({
+            "topic": int(topic),
+            "name": str(info.loc[topic, "Name"]),
+            "frequency": [by_year[year].get(key, {}).get("frequency", 0) for year in years],
+            "words": [by_year[year].get(key, {}).get("words") for year in years]
+        })
+    return {
+        "model_version": model_version,
+        "years": [int(year) for year in years],
+        "articles_per_year": [sum(value["frequency"] for value in by_year[year].values()) for year in years],
+        "undated_articles": undated,
+        "updated_years": updated_years,
+        "timings": timings,
+        "topics": topics
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-year topic frequencies and representations from one global topic model.")
+    parser.add_argument("input", nargs="?", help="cleaned_articles.json (default: data/cleaned/cleaned_articles.json)")
+    parser.add_argument("--refit", action="store_true", help="Fit a new global model and recompute every year")
+    parser.add_argument("--workers", type=int, help="Processes for the per-year computation (default: CPU count)")
+    args = parser.parse_args()
+    try:
+        run_temporal(args.input, args.refit, args.workers)
+    except Exception as e:
+        print(f"Error during topics over time: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
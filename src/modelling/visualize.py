@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+TOPICMODELLING_DIR = BASE_DIR / "data" / "cleaned" / "topic-modelling"
+
+# Written by TopicModelling.save_cluster_points
+CLUSTER_POINTS_FILE = "cluster_points.npz"
+
+MAX_SCATTER_POINTS = 20000      # above this: density bins of all points plus a stratified sample on top
+MIN_POINTS_PER_CLUSTER = 200    # small clusters stay visible in the sample
+HEXBIN_GRIDSIZE = 120
+MAX_HTML_BYTES = 150_000        # per topic chart; plotly.js itself is loaded from the CDN
+TOP_N_TOPICS = 3
+N_WORDS = 5
+
+# =========================
+# HELPERS
+# =========================
+
+def replace_atomically(path, write):
+    """Call write(tmp_path), then move it over path so readers never see a half-written file."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.stem}.tmp{path.suffix}")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def stratified_sample(labels, max_points, min_per_cluster=MIN_POINTS_PER_CLUSTER, seed=42):
+    """
+    Row indices of a sample of about max_points, allocated to clusters in proportion
+    to their size but with at least min_per_cluster rows (or the whole cluster).
+    """
+    rng = np.random.default_rng(seed)
+    clusters, counts = np.unique(labels, return_counts=True)
+    quotas = np.maximum((counts * max_points) // counts.sum(), np.minimum(counts, min_per_cluster))
+    picked = [
+        rng.choice(np.flatnonzero(labels == cluster), size=min(quota, count), replace=False)
+        for cluster, quota, count in zip(clusters, quotas, counts)
+    ]
+    return np.sort(np.concatenate(picked))
+
+# =========================
+# CLUSTER SCATTER
+# =========================
+
+def plot_clusters(points_path, output_path, max_points=MAX_SCATTER_POINTS):
+    data = np.load(points_path)
+    points, labels, centroids = data["points"], data["labels"], data["centroids"]
+
+    plt.figure(figsize=(10, 6))
+    title = "Cluster Visualization with KMeans"
+    rows = np.arange(len(points))
+    marker = {}
+    if len(points) > max_points:
+        # Density of every point underneath, a per-cluster sample on top
+        plt.hexbin(points[:, 0], points[:, 1], gridsize=HEXBIN_GRIDSIZE, bins="log", cmap="Greys", mincnt=1)
+        rows = stratified_sample(labels, max_points)
+        title += f" ({len(rows):,} of {len(points):,} articles shown)"
+        marker = {"s": 10, "linewidth": 0}
+
+    sns.scatterplot(x=points[rows, 0], y=points[rows, 1], hue=labels[rows], palette="tab10", alpha=0.7, **marker)
+    plt.scatter(centroids[:, 0], centroids[:, 1], c='black', marker='X', s=300, label="Centroids")
+    plt.title(title)
+    plt.xlabel("PCA Component 1")
+    plt.ylabel("PCA Component 2")
+    plt.legend()
+    replace_atomically(output_path, lambda tmp: plt.savefig(tmp, dpi=150, bbox_inches='tight', format="png"))
+    plt.close()
+    print(f"Clustering visualization saved: {output_path.name} ({len(rows)} points drawn)")
+
+# =========================
+# TOPIC BAR CHARTS
+# =========================
+
+def topic_barchart(cluster_topics, top_n_topics=TOP_N_TOPICS, n_words=N_WORDS):
+    """Horizontal term-weight bars for the largest topics, in the layout of BERTopic's visualize_barchart."""
+    topics = [topic for topic in cluster_topics["topics"] if topic["topic"] != -1 and topic["terms"]]
+    topics = sorted(topics, key=lambda topic: topic["count"], reverse=True)[:top_n_topics]
+    columns = min(4, max(len(topics), 1))
+    rows = max((len(topics) + columns - 1) // columns, 1)
+
+    fig = make_subplots(rows=rows, cols=columns, shared_xaxes=False, horizontal_spacing=0.1,
+                        vertical_spacing=0.4 / rows if rows > 1 else 0,
+                        subplot_titles=[f"Topic {topic['topic']}" for topic in topics])
+    for i, topic in enumerate(topics):
+        terms = topic["terms"][:n_words][::-1]
+        fig.add_trace(
+            go.Bar(x=[term["weight"] for term in terms], y=[term["term"] + "  " for term in terms], orientation="h"),
+            row=i // columns + 1, col=i % columns + 1
+        )
+    fig.update_layout(
+        template="plotly_white",
+        showlegend=False,
+        title={"text": f"Topic Word Scores - Cluster {cluster_topics['cluster']}", "x": 0.5, "xanchor": "center"},
+        width=250 * columns,
+        height=250 * rows if rows > 1 else 250 * 1.3
+    )
+    return fig
+
+def write_topic_chart(topics_path, output_path, max_bytes=MAX_HTML_BYTES):
+    """Write the chart as HTML, dropping topics and then words until it fits max_bytes."""
+    with open(topics_path, "r", encoding="utf-8") as f:
+        cluster_topics = json.load(f)
+
+    top_n_topics, n_words = TOP_N_TOPICS, N_WORDS
+    while True:
+        html = topic_barchart(cluster_topics, top_n_topics, n_words).to_html(include_plotlyjs="cdn", full_html=True)
+        size = len(html.encode("utf-8"))
+        if size <= max_bytes or (top_n_topics == 1 and n_words == 1):
+            break
+        if top_n_topics > 1:
+            top_n_topics -= 1
+        else:
+            n_words -= 1
+
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    replace_atomically(output_path, write)
+    print(f"Visualization saved: {output_path.name} ({size / 1024:.1f} KB)")
+
+# =========================
+# STAGE
+# =========================
+
+def render_all(save_dir):
+    save_dir = Path(save_dir)
+    started = time.perf_counter()
+
+    points_path = save_dir / CLUSTER_POINTS_FILE
+    if points_path.exists():
+        try:
+            plot_clusters(points_path, save_dir / "clustering_visualization.png")
+        except Exception as e:
+            print(f"Error saving clustering visualization: {e}")
+    else:
+        print(f"Cluster points not found: {points_path}")
+
+    for topics_path in sorted(save_dir.glob("cluster_*_topics.json")):
+        try:
+            write_topic_chart(topics_path, topics_path.with_suffix(".html"))
+        except Exception as e:
+            print(f"Error saving visualization for {topics_path.name}: {e}")
+
+    print(f"Visualizations finished in {time.perf_counter() - started:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Render cluster and topic visualizations from saved modelling results.")
+    parser.add_argument("save_dir", nargs="?", default=str(TOPICMODELLING_DIR),
+                        help="Directory with cluster_points.npz and cluster_<n>_topics.json")
+    args = parser.parse_args()
+    render_all(args.save_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+from replay import PageArchive, ReplayServer
+from extraction import extract_article, extract_embedded_article
+from segmentlog import count_segment_records
+from driverprofile import LEAN_PROFILE, LEAN_PROFILE_ENV
+
+SCRAPPING_DIR = Path(__file__).resolve().parent
+STAGES = ("links", "titles", "extraction")
+PROFILES = ("lean", "normal")
+STAGE_TIMEOUT = 3600
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# SANDBOX HELPERS
+# =========================
+
+def seed_issue_links(archive, base_url, sandbox):
+    """Write article_links.json from the recorded results pages (used when the links stage is skipped)."""
+    issues = set()
+    for key, entry, _ in archive.items():
+        if entry.get("kind") != "results":
+            continue
+        parsed = urlparse(key)
+        query = [(k, v) for k, v in parse_qsl(parsed.query) if k not in ("sortType", "pageNumber")]
+        issues.add(f"{base_url}{parsed.path}?{urlencode(query)}")
+    raw_dir = sandbox / "data" / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    with open(raw_dir / "article_links.json", "w", encoding="utf-8") as f:
+        json.dump({"URL": sorted(issues)}, f, indent=4)
+    return len(issues)
+
+def run_stage(script, env):
+    started = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [sys.executable, str(SCRAPPING_DIR / script)],
+            env=env,
+            cwd=SCRAPPING_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=STAGE_TIMEOUT
+        )
+        returncode, output = process.returncode, process.stdout
+    except subprocess.TimeoutExpired as e:
+        returncode, output = None, e.stdout or ""
+    return {
+        "script": script,
+        "seconds": round(time.perf_counter() - started, 3),
+        "returncode": returncode,
+        "log_tail": output.splitlines()[-20:]
+    }
+
+def summarize_crawl(sandbox):
+    raw_dir = sandbox / "data" / "raw"
+    statuses = Counter()
+    journal = raw_dir / "processed_article_urls.jsonl"
+    if journal.exists():
+        latest = {}
+        with open(journal, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    url, status = json.loads(line)
+                except ValueError:
+                    continue
+                latest[url] = status
+        statuses.update(status for url, status in latest.items() if "/document/" in url)
+
+    stats = {}
+    stats_dir = sandbox / "logs" / "stats"
+    if stats_dir.exists():
+        for stats_file in stats_dir.glob("*.json"):
+            with open(stats_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stats[data.get("component", stats_file.stem)] = {k: data.get(k) for k in ("page_load", "rate_control")}
+
+    return {
+        "articles_stored": count_segment_records(raw_dir / "output" / "articles", "scraped_articles"),
+        "articles_ok": statuses.get("berhasil", 0),
+        "articles_failed": statuses.get("gagal", 0),
+        "scraper_stats": stats
+    }
+
+# =========================
+# STAGES
+# =========================
+
+def benchmark_extraction(archive):
+    """Parser throughput over the recorded article pages, DOM extractor vs. fast-path parser."""
+    pages = [(entry["url"], body.decode("utf-8", errors="replace"))
+             for _, entry, body in archive.items() if entry.get("kind") == "article"]
+    report = {"pages": len(pages)}
+    if not pages:
+        return report
+
+    for name, parse in (("lxml_dom", extract_article), ("embedded_metadata", extract_embedded_article)):
+        failures = 0
+        started = time.perf_counter()
+        for url, page_html in pages:
+            try:
+                article = parse(page_html, url)
+            except Exception:
+                article = None
+            if not article or article.get("title") == "Title Not Found":
+                failures += 1
+        seconds = time.perf_counter() - started
+        report[name] = {
+            "seconds": round(seconds, 4),
+            "pages_per_second": round(len(pages) / seconds, 1) if seconds else None,
+            "failures": failures
+        }
+    return report
+
+def run_crawl(archive, crawl_stages, profile, latency, jitter, error_rate, seed, keep_sandbox):
+    """Run the crawl stages in a fresh sandbox with the given driver profile ("lean" or "normal")."""
+    report = {"profile": profile, "stages": {}}
+    sandbox = Path(tempfile.mkdtemp(prefix=f"scraper-bench-{profile}-"))
+    with ReplayServer(archive, latency=latency, jitter=jitter, error_rate=error_rate, seed=seed) as server:
+        env = dict(os.environ, SCRAPER_BASE_DIR=str(sandbox), IEEE_BASE_URL=server.base_url)
+        env[LEAN_PROFILE_ENV] = "on" if profile == "lean" else "off"
+        env.pop("SCRAPER_RECORD_DIR", None)
+
+        if "links" not in crawl_stages:
+            report["seeded_issues"] = seed_issue_links(archive, server.base_url, sandbox)
+
+        for stage, script in (("links", "getLinks.py"), ("titles", "getTitle.py")):
+            if stage not in crawl_stages:
+                continue
+            before = server.stats.snapshot()
+            result = run_stage(script, env)
+            after = server.stats.snapshot()
+            served = after["served"] - before["served"]
+            result["replay"] = {key: after[key] - before[key] for key in after}
+            result["pages_per_second"] = round(served / result["seconds"], 2) if result["seconds"] else None
+            report["stages"][stage] = result
+
+    report["crawl"] = summarize_crawl(sandbox)
+    if keep_sandbox:
+        report["sandbox"] = str(sandbox)
+    return report
+
+def run_benchmark(archive_dir, stages=STAGES, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, keep_sandbox=False,
+                  profiles=None):
+    """
+    Benchmark the requested stages. The crawl stages run once per driver profile
+    (default: the one SCRAPER_LEAN_PROFILE selects); with several profiles their
+    results are reported side by side under "profiles".
+    """
+    archive = PageArchive(archive_dir)
+    profiles = list(profiles or ["lean" if LEAN_PROFILE else "normal"])
+    report = {
+        "archive_pages": len(archive),
+        "replay": {"latency": latency, "jitter": jitter, "error_rate": error_rate},
+        "stages": {}
+    }
+
+    if "extraction" in stages:
+        report["stages"]["extraction"] = benchmark_extraction(archive)
+
+    crawl_stages = [stage for stage in ("links", "titles") if stage in stages]
+    if not crawl_stages:
+        return report
+
+    crawls = {
+        profile: run_crawl(archive, crawl_stages, profile, latency, jitter, error_rate, seed, keep_sandbox)
+        for profile in profiles
+    }
+    if len(crawls) == 1:
+        crawl = crawls[profiles[0]]
+        report["stages"].update(crawl.pop("stages"))
+        report.update(crawl)
+    else:
+        report["profiles"] = crawls
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline against recorded pages.")
+    parser.add_argument("archive", help="Directory written with SCRAPER_RECORD_DIR")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of: links,titles,extraction")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-sandbox", action="store_true")
+    parser.add_argument("--profiles", help="Comma-separated driver profiles for the crawl stages: lean,normal "
+                                           "(default: the one SCRAPER_LEAN_PROFILE selects)")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    profiles = [profile.strip() for profile in (args.profiles or "").split(",") if profile.strip()]
+    unknown = set(profiles) - set(PROFILES)
+    if unknown:
+        parser.error(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+    report = run_benchmark(args.archive, stages, args.latency, args.jitter, args.error_rate, args.seed, args.keep_sandbox,
+                           profiles)
+
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,56 @@
 import pandas as pd
+import hashlib
 import json
 import os
+import sys
+import time
 from pathlib import Path
+from segmentlog import load_segments_frame
+from crawlstats import StatsPublisher
+
+# Cleaning kernels shared with src/modelling/preprocessing.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from textclean import (
+    ARROW_STRING, clean_authors_column, clean_text_columns, records_for_json,
+    remove_backslashes, clean_authors
+)
+from corpus import compact_frame
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 OUTPUT_DIR = BASE_DIR / "data" / "raw" / "output"
+ARTICLES_DIR = OUTPUT_DIR / "articles"
+ARTICLES_PREFIX = "scraped_articles"
 CLEANED_DIR = BASE_DIR / "data" / "cleaned"
+# Inputs already merged into cleaned_articles.json
+MERGE_MANIFEST_PATH = CLEANED_DIR / "merge_manifest.json"
+# [doi, title] of every row in cleaned_articles.json, appended as rows are merged
+MERGE_KEYS_PATH = CLEANED_DIR / "merge_keys.jsonl"
 
-def remove_backslashes(data):
-    if isinstance(data, str):
-        data = data.replace("\\/", "/").replace("\\", "")
-    return data
-
-def clean_authors(author_str):
-    if pd.isna(author_str):
-        return ""
-    
-    authors = [author.strip(" ;") for author in author_str.split(",") if author.strip(" ;")]
-    unique_authors = ", ".join(sorted(set(authors)))
-    return unique_authors
+# Cleaned-article counters read by the API's /metrics collector
+STATS = StatsPublisher("cleaningdata")
 
 def clean_json_file(json_file_path):
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
-        if isinstance(data, list):
-            df = pd.DataFrame(data)
-        elif isinstance(data, dict):
-            df = pd.DataFrame([data])
-        else:
-            print(f"Invalid structure in {json_file_path}. Skipping this file.")
-            return None
-       
-        if 'authors' in df.columns:
-            df["authors"] = df["authors"].apply(clean_authors)
-        
-        if 'doi' in df.columns:
-            df["doi"] = df["doi"].apply(remove_backslashes)
-        
-        if 'url' in df.columns:
-            df = df.drop(columns=['url'])
-        
-        if 'title' in df.columns:
-            df = df.drop_duplicates(subset=["title"], keep="first")
-        
-        df = df.applymap(remove_backslashes)
-        
-        return df
-    except (json.JSONDecodeError, ValueError) as e:
-        print(f"Error reading {json_file_path}: {e}")
-        return None  
+    records = read_json_records(json_file_path)
+    if records is None:
+        return None
+    df = clean_articles_frame(pd.DataFrame(records))
+    if 'title' in df.columns:
+        df = df.drop_duplicates(subset=["title"], keep="first")
+    return df
+
+def clean_articles_frame(df):
+    # Duplicates are left in: the merge drops them by DOI and title across all inputs in order
+    if 'authors' in df.columns:
+        df["authors"] = clean_authors_column(df["authors"])
+    
+    if 'url' in df.columns:
+        df = df.drop(columns=['url'])
+    
+    # remove_backslashes over every text column (doi included), column by column
+    df = clean_text_columns(df)
+    
+    # Publisher/journal/year as dictionary-encoded columns, the rest as Arrow strings
+    return compact_frame(df)
     
 def delete_problematic_file(file_path):
     try:
@@ -59,39 +59,273 @@ def delete_problematic_file(file_path):
     except Exception as e:
         print(f"Failed to delete problematic file {file_path}. Error: {e}")
 
-def merge_and_clean_data():
-    all_articles = []
-    scraped_files = list(OUTPUT_DIR.glob("scraped_articles_*.json"))
-    
-    for scraped_file in scraped_files:
-        cleaned_df = clean_json_file(scraped_file)
-        if cleaned_df is not None:
-            all_articles.append(cleaned_df)
-        else:
-            print(f"Skipping invalid file: {scraped_file}")
-            delete_problematic_file(scraped_file) 
+# =========================
+# INCREMENTAL MERGE
+# =========================
 
-    if not all_articles:
-        print("No valid data found after cleaning. Exiting.")
-        return
+def file_sha1(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    merged_df = pd.concat(all_articles, ignore_index=True)
+def file_signature(file_path):
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
 
-    if 'doi' in merged_df.columns:
-        merged_df = merged_df.drop_duplicates(subset=["doi"], keep="first")
+def empty_manifest():
+    return {"files": {}, "store_next_seq": 0, "output": None, "rows": 0, "keys_size": 0}
+
+def load_merge_manifest(output_path):
+    """
+    Return the merge manifest, or a fresh one when the cleaned output no longer
+    matches what the last merge wrote (deleted, edited, or a torn append).
+    """
+    if not MERGE_MANIFEST_PATH.exists() or not output_path.exists():
+        return empty_manifest()
+    try:
+        with open(MERGE_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"Error reading {MERGE_MANIFEST_PATH}: {e}. Rebuilding cleaned data.")
+        return empty_manifest()
+    if manifest.get("output") != file_signature(output_path):
+        print(f"{output_path} changed since the last merge. Rebuilding cleaned data.")
+        return empty_manifest()
+    return manifest
 
-    if 'url' in merged_df.columns:
-        merged_df = merged_df.drop(columns=['url'])
+def save_merge_manifest(manifest):
+    tmp_path = MERGE_MANIFEST_PATH.with_name(MERGE_MANIFEST_PATH.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, MERGE_MANIFEST_PATH)
+
+def read_json_records(json_file_path):
+    try:
+        with open(json_file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"Error reading {json_file_path}: {e}")
+        return None
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return [data]
+    print(f"Invalid structure in {json_file_path}. Skipping this file.")
+    return None
 
+def tracked_file_changed(manifest):
+    """
+    True when a scraped_articles_*.json that was already merged has been removed or
+    rewritten. Its earlier rows are in the output and cannot be told apart, so the
+    output has to be rebuilt for the merge to match a full run.
+    """
+    for name, known in manifest["files"].items():
+        scraped_file = OUTPUT_DIR / name
+        if not scraped_file.exists():
+            return True
+        signature = file_signature(scraped_file)
+        if known["size"] == signature["size"] and known["mtime"] == signature["mtime"]:
+            continue
+        if file_sha1(scraped_file) != known["sha1"]:
+            return True
+        # Touched but identical: only refresh the recorded mtime
+        known.update(signature)
+    return False
+
+def changed_scraped_files(manifest):
+    """Legacy scraped_articles_*.json files that are new or whose content changed since the last merge."""
+    changed = []
+    for scraped_file in sorted(OUTPUT_DIR.glob("scraped_articles_*.json")):
+        signature = file_signature(scraped_file)
+        known = manifest["files"].get(scraped_file.name)
+        if known and known["size"] == signature["size"] and known["mtime"] == signature["mtime"]:
+            continue
+        sha1 = file_sha1(scraped_file)
+        if known and known["sha1"] == sha1:
+            known.update(signature)
+            continue
+        changed.append((scraped_file, dict(signature, sha1=sha1)))
+    return changed
+
+def load_merge_keys(manifest, output_path):
+    """
+    DOI and title sets of the rows already in the cleaned output. Read from the
+    append-only keys file; when that does not match what the manifest recorded,
+    they are taken from the output itself and the keys file is rewritten.
+    """
+    dois, titles = set(), set()
+    if manifest["output"] is None:
+        return dois, titles
+
+    if MERGE_KEYS_PATH.exists() and os.path.getsize(MERGE_KEYS_PATH) == manifest.get("keys_size"):
+        with open(MERGE_KEYS_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                doi, title = json.loads(line)
+                if doi is not None:
+                    dois.add(doi)
+                if title is not None:
+                    titles.add(title)
+        return dois, titles
+
+    print(f"{MERGE_KEYS_PATH.name} does not match the last merge. Reading keys from {output_path.name}.")
+    records = read_json_records(output_path) or []
+    keys = [merge_key(record.get("doi"), record.get("title")) for record in records]
+    manifest["keys_size"] = write_merge_keys(keys, append=False)
+    dois.update(doi for doi, _ in keys if doi is not None)
+    titles.update(title for _, title in keys if title is not None)
+    return dois, titles
+
+def merge_key(doi, title):
+    return [None if pd.isna(doi) else str(doi), None if pd.isna(title) else str(title)]
+
+def write_merge_keys(keys, append):
+    """Append (or write) one [doi, title] line per merged row; returns the file size."""
+    with open(MERGE_KEYS_PATH, "a" if append else "w", encoding="utf-8") as f:
+        for key in keys:
+            f.write(json.dumps(key, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return os.path.getsize(MERGE_KEYS_PATH)
+
+def drop_known_articles(df, dois, titles):
+    """
+    Keep the first row for each DOI and each title, in row order, skipping rows
+    already in the cleaned dataset; the indexes are updated with the kept rows.
+
+    Only kept rows claim their keys, so the result does not depend on how the
+    input is split across merges.
+    """
+    doi_keys = df["doi"].astype(ARROW_STRING) if 'doi' in df.columns else pd.Series(pd.NA, index=df.index, dtype=ARROW_STRING)
+    title_keys = df["title"].astype(ARROW_STRING) if 'title' in df.columns else pd.Series(pd.NA, index=df.index, dtype=ARROW_STRING)
+    # Rows whose keys are already merged are dropped column-wise; only the rest need the ordered pass
+    candidates = ~(doi_keys.isin(dois) | title_keys.isin(titles))
+    keep = pd.Series(False, index=df.index)
+    for label, doi, title in zip(df.index[candidates], doi_keys[candidates], title_keys[candidates]):
+        doi = None if pd.isna(doi) else doi
+        title = None if pd.isna(title) else title
+        if doi in dois or title in titles:
+            continue
+        keep[label] = True
+        if doi is not None:
+            dois.add(doi)
+        if title is not None:
+            titles.add(title)
+    return df[keep.to_numpy()]
+
+def write_cleaned_records(output_path, records, append):
+    """
+    Write records as the indented JSON array. When appending, the closing bracket
+    is truncated and the new records are written in its place. merge_and_clean_data
+    only appends records that a full rebuild would also put after the existing
+    ones, so both end with the same records in the same order.
+    """
+    payload = json.dumps(records, ensure_ascii=False, indent=4)
+    if not append:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return
+
+    with open(output_path, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b""
+        while position > 0 and not tail.rstrip().endswith(b"]"):
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+        tail = tail.rstrip()[:-1].rstrip()
+        separator = b"" if tail.endswith(b"[") else b","
+        f.seek(position)
+        f.truncate()
+        f.write(tail + separator + payload[1:].encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+def merge_and_clean_data():
     output_cleaned_path = CLEANED_DIR / "cleaned_articles.json"
-    
     os.makedirs(CLEANED_DIR, exist_ok=True)
 
-    with open(output_cleaned_path, 'w', encoding='utf-8') as f:
-        json.dump(merged_df.to_dict(orient="records"), f, ensure_ascii=False, indent=4)
+    started = time.time()
+    manifest = load_merge_manifest(output_cleaned_path)
+    if manifest["output"] is not None and tracked_file_changed(manifest):
+        print("A merged scraped_articles file was changed or removed. Rebuilding cleaned data.")
+        manifest = empty_manifest()
+    # A full run puts the legacy files first, then the article store in seq order.
+    # Only the store grows past what was merged, so a new legacy file means a rebuild.
+    legacy_files = changed_scraped_files(manifest)
+    if manifest["output"] is not None and legacy_files:
+        print("New scraped_articles files found. Rebuilding cleaned data to keep the merge order.")
+        manifest = empty_manifest()
+        legacy_files = changed_scraped_files(manifest)
+    rebuild = manifest["output"] is None
+    STATS.update("progress", {"articles_cleaned": manifest["rows"], "running": True}, force=True)
+    dois, titles = load_merge_keys(manifest, output_cleaned_path)
+    new_articles = []
+
+    # One-file-per-article output from earlier crawls, collected into a single frame
+    legacy_records = []
+    for scraped_file, signature in legacy_files:
+        records = read_json_records(scraped_file)
+        if records is None:
+            print(f"Skipping invalid file: {scraped_file}")
+            manifest["files"].pop(scraped_file.name, None)
+            delete_problematic_file(scraped_file)
+            continue
+        legacy_records.extend(records)
+        manifest["files"][scraped_file.name] = signature
+    if legacy_records:
+        new_articles.append(clean_articles_frame(pd.DataFrame(legacy_records)))
+
+    # Segmented article store written by getTitle.py: only records past the last merged seq
+    stored_df = load_segments_frame(ARTICLES_DIR, ARTICLES_PREFIX, start_seq=manifest["store_next_seq"])
+    if not stored_df.empty:
+        manifest["store_next_seq"] = int(stored_df.index.max()) + 1
+        new_articles.append(clean_articles_frame(stored_df.reset_index(drop=True)))
+
+    if new_articles:
+        delta_df = drop_known_articles(pd.concat(new_articles, ignore_index=True), dois, titles)
+    else:
+        delta_df = pd.DataFrame()
+
+    if 'url' in delta_df.columns:
+        delta_df = delta_df.drop(columns=['url'])
+
+    if rebuild and delta_df.empty:
+        print("No valid data found after cleaning. Exiting.")
+        STATS.update("progress", {"articles_cleaned": 0, "running": False}, force=True)
+        return
+
+    if rebuild or not delta_df.empty:
+        write_cleaned_records(output_cleaned_path, records_for_json(delta_df), append=not rebuild)
+        keys = [
+            merge_key(doi, title) for doi, title in zip(
+                delta_df["doi"] if 'doi' in delta_df.columns else [None] * len(delta_df),
+                delta_df["title"] if 'title' in delta_df.columns else [None] * len(delta_df)
+            )
+        ]
+        manifest["keys_size"] = write_merge_keys(keys, append=not rebuild)
+
+    manifest["rows"] += len(delta_df)
+    manifest["output"] = file_signature(output_cleaned_path)
+    save_merge_manifest(manifest)
+
+    STATS.update("progress", {
+        "articles_cleaned": manifest["rows"],
+        "articles_merged_last_run": len(delta_df),
+        "rebuilt_last_run": rebuild,
+        "seconds_last_run": time.time() - started,
+        "running": False
+    }, force=True)
 
-    total_titles = len(merged_df)
-    print(f"\nTotal titles after cleaning: {total_titles}")
+    print(f"\nNew titles merged: {len(delta_df)}")
+    print(f"Total titles after cleaning: {manifest['rows']}")
     print(f"The merged and cleaned data has been saved to: {output_cleaned_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+BASE_DIR = Path(os.environ.get("SCRAPER_BASE_DIR", Path(__file__).resolve().parent.parent.parent))
+STATS_DIR = BASE_DIR / "logs" / "stats"
+
+DEFAULT_MIN_INTERVAL = 1.0
+
+class StatsPublisher:
+    """
+    Publish a component's live stats as a small JSON file in logs/stats.
+
+    The API process reads these files when Prometheus scrapes /metrics, so the
+    scraper and cleaner child processes can expose progress without sharing
+    memory with it. Writes are atomic and throttled to `min_interval`.
+    """
+
+    def __init__(self, component, stats_dir=STATS_DIR, min_interval=DEFAULT_MIN_INTERVAL):
+        self.component = component
+        self.path = Path(stats_dir) / f"{component}.json"
+        self.min_interval = min_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._data = {"component": component, "pid": os.getpid(), "started_at": time.time()}
+        self._last_write = 0.0
+
+    def update(self, section, values, force=False):
+        self._data[section] = values
+        if force or time.monotonic() - self._last_write >= self.min_interval:
+            self.flush()
+
+    def flush(self):
+        self._data["updated_at"] = time.time()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
+        self._last_write = time.monotonic()
+
+RATE_WINDOW_SECONDS = 60.0
+
+class CrawlProgress:
+    """
+    Running counters for one getTitle run, published through StatsPublisher.
+
+    `articles_per_second` is measured over the last RATE_WINDOW_SECONDS.
+    `pages_remaining` is an estimate: the expected page count of every issue
+    not finished yet (from the crawl frontier), minus the pages done so far.
+    """
+
+    def __init__(self, expected_pages, articles_stored=0):
+        self.expected_pages = dict(expected_pages)
+        self.articles_stored = articles_stored
+        self.articles_scraped = 0
+        self.articles_failed = 0
+        self.pages_done = 0
+        self.issues_done = 0
+        self.started_at = time.time()
+        self._current_issue = None
+        self._current_pages = 0
+        self._recent = deque()
+        self.running = True
+
+    def start_issue(self, issue_url):
+        self._current_issue = issue_url
+        self._current_pages = 0
+
+    def page_done(self):
+        self.pages_done += 1
+        self._current_pages += 1
+
+    def article_done(self, ok):
+        if ok:
+            self.articles_scraped += 1
+            self.articles_stored += 1
+        else:
+            self.articles_failed += 1
+        now = time.monotonic()
+        self._recent.append(now)
+        while self._recent and now - self._recent[0] > RATE_WINDOW_SECONDS:
+            self._recent.popleft()
+
+    def issue_done(self):
+        self.expected_pages.pop(self._current_issue, None)
+        self._current_issue = None
+        self._current_pages = 0
+        self.issues_done += 1
+
+    def finish(self):
+        self.running = False
+        self._recent.clear()
+
+    def snapshot(self):
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > RATE_WINDOW_SECONDS:
+            self._recent.popleft()
+        window = max(min(RATE_WINDOW_SECONDS, time.time() - self.started_at), 1.0)
+        pages_remaining = sum(self.expected_pages.values())
+        if self._current_issue in self.expected_pages:
+            pages_remaining -= min(self._current_pages, self.expected_pages[self._current_issue])
+        return {
+            "articles_stored": self.articles_stored,
+            "articles_scraped": self.articles_scraped,
+            "articles_failed": self.articles_failed,
+            "articles_per_second": len(self._recent) / window,
+            "pages_done": self.pages_done,
+            "pages_remaining": pages_remaining,
+            "issues_done": self.issues_done,
+            "issues_remaining": len(self.expected_pages),
+            "elapsed_seconds": time.time() - self.started_at,
+            "running": self.running
+        }
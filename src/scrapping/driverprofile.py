@@ -0,0 +1,169 @@
+import logging
+import os
+from pathlib import Path
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+# =========================
+# CONFIGURATION
+# =========================
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+CHROMEDRIVER_PATH = "/usr/local/bin/chromedriver"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Lean profile: block heavy / irrelevant resources, stop waiting at DOMContentLoaded
+# and keep a disk cache of static assets shared by getLinks.py and getTitle.py.
+# SCRAPER_LEAN_PROFILE=off runs the scrapers with the normal profile instead
+LEAN_PROFILE_ENV = "SCRAPER_LEAN_PROFILE"
+LEAN_PROFILE = os.environ.get(LEAN_PROFILE_ENV, "on").lower() not in ("0", "off", "false", "no")
+CHROME_CACHE_DIR = BASE_DIR / "data" / "cache" / "chrome"
+CHROME_CACHE_BYTES = 512 * 1024 * 1024
+
+BLOCKED_EXTENSIONS = [
+    # images and media
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "mp4", "webm",
+    # web fonts and stylesheets
+    "woff", "woff2", "ttf", "otf", "eot", "css"
+]
+# Assets are mostly versioned (style.css?v=3), so each extension also matches with a query string
+BLOCKED_URL_PATTERNS = [pattern for ext in BLOCKED_EXTENSIONS for pattern in (f"*.{ext}", f"*.{ext}?*")] + [
+    # analytics and third-party widgets
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*adobedtm.com*",
+    "*omtrdc.net*", "*demdex.net*", "*hotjar.com*", "*facebook.net*", "*connect.facebook*",
+    "*platform.twitter.com*", "*linkedin.com*", "*addthis.com*", "*crazyegg.com*", "*newrelic.com*",
+    "*nr-data.net*", "*qualtrics.com*", "*cookielaw.org*", "*onetrust.com*"
+]
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# DRIVER SETUP
+# =========================
+
+def build_options(lean=LEAN_PROFILE, extra_arguments=()):
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--enable-unsafe-swiftshader")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    for argument in extra_arguments:
+        options.add_argument(argument)
+
+    if not lean:
+        options.add_argument("--disable-cache")
+        return options
+
+    CHROME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    options.add_argument(f"--disk-cache-dir={CHROME_CACHE_DIR}")
+    options.add_argument(f"--disk-cache-size={CHROME_CACHE_BYTES}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Hand control back at DOMContentLoaded; readiness waits cover the rest
+    options.page_load_strategy = "eager"
+    return options
+
+def apply_lean_profile(driver):
+    """Block resource URLs through the DevTools Network domain."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+def create_driver(lean=LEAN_PROFILE, extra_arguments=()):
+    service = Service(CHROMEDRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=build_options(lean, extra_arguments))
+    if lean:
+        try:
+            apply_lean_profile(driver)
+        except Exception as e:
+            logger.warning(f"Gagal mengaktifkan pemblokiran resource via DevTools: {e}")
+    return driver
+
+# =========================
+# PAGE LOAD ACCOUNTING
+# =========================
+
+PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+return {
+    bytes: bytes,
+    resources: resources.length,
+    load_ms: nav ? Math.max(nav.domContentLoadedEventEnd, nav.responseEnd) - nav.startTime : 0
+};
+"""
+
+class PageLoadStats:
+    """Running bytes-per-page and load-time figures for the current driver profile."""
+
+    def __init__(self, lean=LEAN_PROFILE):
+        self.profile = "lean" if lean else "normal"
+        self.pages = 0
+        self.total_bytes = 0
+        self.total_resources = 0
+        self.total_load_ms = 0.0
+
+    def measure(self, driver):
+        try:
+            entry = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Gagal membaca performance timing: {e}")
+            return None
+        self.pages += 1
+        self.total_bytes += int(entry.get("bytes") or 0)
+        self.total_resources += int(entry.get("resources") or 0)
+        self.total_load_ms += float(entry.get("load_ms") or 0.0)
+        return entry
+
+    def snapshot(self):
+        pages = max(self.pages, 1)
+        return {
+            "profile": self.profile,
+            "pages": self.pages,
+            "bytes_per_page": round(self.total_bytes / pages, 1),
+            "resources_per_page": round(self.total_resources / pages, 2),
+            "load_seconds_per_page": round(self.total_load_ms / pages / 1000.0, 4)
+        }
+
+    def log_summary(self):
+        snapshot = self.snapshot()
+        logger.info(
+            f"Profil {snapshot['profile']}: {snapshot['pages']} halaman, "
+            f"rata-rata {snapshot['bytes_per_page'] / 1024:.1f} KiB dan "
+            f"{snapshot['load_seconds_per_page']:.2f} s per halaman"
+        )
+
+def compare_profiles(urls):
+    """Load the same pages with the normal and the lean profile and report the savings."""
+    results = {}
+    for lean in (False, True):
+        stats = PageLoadStats(lean)
+        driver = create_driver(lean)
+        try:
+            for url in urls:
+                driver.get(url)
+                stats.measure(driver)
+        finally:
+            driver.quit()
+        results[stats.profile] = stats.snapshot()
+
+    normal, lean = results["normal"], results["lean"]
+    results["savings"] = {
+        "bytes_per_page": round(normal["bytes_per_page"] - lean["bytes_per_page"], 1),
+        "bytes_ratio": round(1 - lean["bytes_per_page"] / normal["bytes_per_page"], 4) if normal["bytes_per_page"] else 0.0,
+        "load_seconds_per_page": round(normal["load_seconds_per_page"] - lean["load_seconds_per_page"], 4)
+    }
+    return results
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sample_urls = sys.argv[1:] or ["https://ieeexplore.ieee.org/xpl/issues?punumber=6287639&isnumber=10820123"]
+    print(json.dumps(compare_profiles(sample_urls), indent=4))
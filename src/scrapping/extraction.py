@@ -0,0 +1,201 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+
+# =========================
+# CONFIGURATION
+# =========================
+
+# Overridable so the scrapers can run against a local replay server
+IEEE_BASE_URL = os.environ.get("IEEE_BASE_URL", "https://ieeexplore.ieee.org").rstrip("/")
+JOURNAL_CONFERENCE_NAME = "IEEE Access"
+PUBLISHER = "IEEE"
+GROUP_NAME = "OpsA"
+DEFAULT_WORKERS = 4
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Targeted XPath selectors, equivalent to the BeautifulSoup lookups they replace
+TITLE_XPATH = f"(//h1[{_has_class('document-title')}])[1]"
+ABSTRACT_XPATH = "(//div[@xplmathjax])[1]"
+AUTHOR_XPATH = "//span[@_ngcontent-ng-c1131135293]"
+PUBDATE_XPATH = f"(//div[{_has_class('doc-abstract-pubdate')}])[1]"
+DOI_XPATH = f"(//div[{_has_class('stats-document-abstract-doi')}])[1]//a[@href]/@href"
+LINK_XPATH = "//a/@href"
+# Shown instead of the results list when an issue page has no articles
+NO_RESULTS_XPATH = f"//*[{_has_class('List-results-none')}] | //*[text()[contains(., 'No results found')]]"
+META_XPATH = "//meta[@content]"
+NEXT_BUTTON_XPATH = f"//li[{_has_class('next-btn')}]/button[starts-with(@class, 'stats-Pagination_arrow_next_')]"
+
+# Server-delivered pages embed the document record as xplGlobal.document.metadata = {...};
+METADATA_MARKER = re.compile(r"xplGlobal\.document\.metadata\s*=\s*")
+YEAR_PATTERN = re.compile(r"\b(?:1[89]|20)\d\d\b")
+
+# =========================
+# EXTRACTION
+# =========================
+
+def _parse(page_html):
+    return lxml.html.fromstring(page_html)
+
+def _first(tree, xpath):
+    found = tree.xpath(xpath)
+    return found[0] if found else None
+
+def _text(element):
+    # Text nodes only (comments excluded), like BeautifulSoup's get_text()
+    return "".join(element.xpath(".//text()"))
+
+def _stripped_text(element):
+    # Same as get_text(strip=True): strip every text node and drop the empty ones
+    return "".join(part.strip() for part in element.xpath(".//text()") if part.strip())
+
+# Field normalization shared by both extractors, so an article is stored the same
+# way whether the browser or the plain-HTTP fast path fetched it
+
+def html_text(fragment):
+    """Text of an HTML fragment (e.g. a metadata title with <i> tags) the way _stripped_text reads the rendered element."""
+    fragment = str(fragment or "").strip()
+    if not fragment:
+        return ""
+    return _stripped_text(lxml.html.fragment_fromstring(fragment, create_parent="div"))
+
+def join_authors(names):
+    names = (str(name).strip() for name in names)
+    return ", ".join(sorted(set(name for name in names if name))).strip(", ")
+
+def year_from_text(text):
+    """The last year in a publication date ("15 January 2024", "2024/01/15"), else its last token."""
+    years = YEAR_PATTERN.findall(text or "")
+    if years:
+        return years[-1]
+    tokens = (text or "").split()
+    return tokens[-1] if tokens else "Year Not Found"
+
+def normalize_doi(doi):
+    doi = str(doi or "").strip()
+    if not doi:
+        return "DOI Not Found"
+    return doi if doi.startswith("http") else f"https://doi.org/{doi}"
+
+def build_article(title, abstract, authors, year, doi, article_url):
+    return {
+        "title": title or "Title Not Found",
+        "abstract": abstract or "Abstract Not Found",
+        "authors": join_authors(authors),
+        "journal_conference_name": JOURNAL_CONFERENCE_NAME,
+        "publisher": PUBLISHER,
+        "year": year_from_text(year),
+        "doi": normalize_doi(doi),
+        "group_name": GROUP_NAME,
+        "url": article_url
+    }
+
+def extract_article(page_html, article_url):
+    """Parse a rendered /document/ page into the article dict used throughout the crawl."""
+    tree = _parse(page_html)
+
+    title = _first(tree, TITLE_XPATH)
+    abstract_section = _first(tree, ABSTRACT_XPATH)
+    pubdate = _first(tree, PUBDATE_XPATH)
+
+    return build_article(
+        title=_stripped_text(title) if title is not None else "",
+        abstract=_stripped_text(abstract_section) if abstract_section is not None else "",
+        authors=[_text(span) for span in tree.xpath(AUTHOR_XPATH)],
+        year=_stripped_text(pubdate) if pubdate is not None else "",
+        doi=_first(tree, DOI_XPATH),
+        article_url=article_url
+    )
+
+def _embedded_metadata(page_html):
+    match = METADATA_MARKER.search(page_html)
+    if not match:
+        return {}
+    try:
+        metadata, _ = json.JSONDecoder().raw_decode(page_html, match.end())
+        return metadata if isinstance(metadata, dict) else {}
+    except ValueError:
+        return {}
+
+def _meta_tags(tree):
+    meta = {}
+    for element in tree.xpath(META_XPATH):
+        key = element.get("name") or element.get("property")
+        if key:
+            meta.setdefault(key.lower(), []).append(element.get("content"))
+    return meta
+
+def extract_embedded_article(page_html, article_url):
+    """
+    Parse a server-delivered /document/ page (no JavaScript run) from its embedded
+    metadata and <meta> tags; None when it has no title, i.e. the browser is needed.
+    """
+    metadata = _embedded_metadata(page_html)
+    meta = _meta_tags(_parse(page_html))
+
+    def first_meta(*keys):
+        for key in keys:
+            if meta.get(key):
+                return meta[key][0]
+        return ""
+
+    title = html_text(metadata.get("title") or metadata.get("displayDocTitle") or first_meta("citation_title", "og:title"))
+    if not title:
+        return None
+
+    author_names = [a.get("name", "") for a in metadata.get("authors", []) if isinstance(a, dict)]
+    if not author_names:
+        author_names = meta.get("citation_author", [])
+
+    return build_article(
+        title=title,
+        abstract=html_text(metadata.get("abstract") or first_meta("description", "og:description")),
+        authors=[html_text(name) for name in author_names],
+        year=str(metadata.get("publicationDate") or metadata.get("publicationYear")
+                 or first_meta("citation_publication_date", "citation_date")),
+        doi=metadata.get("doi") or first_meta("citation_doi"),
+        article_url=article_url
+    )
+
+def extract_results_page(page_html, base_url=IEEE_BASE_URL):
+    """Return (article links, has_next_page) for an issue results page."""
+    tree = _parse(page_html)
+    # Deduplicated in page order, which is newest first for vol-only-newest sorting
+    article_links = list(dict.fromkeys(
+        f"{base_url}{href}"
+        for href in tree.xpath(LINK_XPATH)
+        if "/document/" in href and "/citations" not in href
+    ))
+    has_next = bool(tree.xpath(NEXT_BUTTON_XPATH))
+    return article_links, has_next
+
+# =========================
+# WORKER POOL
+# =========================
+
+class ExtractionPool:
+    """
+    Parse pages on worker threads so the browser can move on to the next URL.
+
+    lxml parses in C and releases the GIL while doing so, which lets parsing
+    overlap with the WebDriver round-trips on the main thread.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit_article(self, page_html, article_url):
+        return self._executor.submit(extract_article, page_html, article_url)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ratecontrol import RateControllerRegistry
+from extraction import extract_embedded_article
+
+# =========================
+# CONFIGURATION
+# =========================
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 20
+KEEPALIVE_TIMEOUT = 30
+PARSE_WORKERS = 2           # parsing runs off the event loop so it does not stall in-flight fetches
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# RATE LIMITING
+# =========================
+
+class HostGate:
+    """Cap in-flight requests per host at the AIMD controller's current concurrency window."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.controller.concurrency)
+            self.in_flight += 1
+        await self.controller.wait_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+# =========================
+# ASYNC FETCHER
+# =========================
+
+class ArticleFetcher:
+    """
+    Fetch article detail pages over plain HTTP with a pooled keep-alive session.
+
+    The event loop runs on a background thread so the same connection pool is
+    reused across results pages while the caller stays synchronous. With a
+    replay.PageRecorder, every page fetched successfully is recorded as well.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate_controllers=None, timeout=REQUEST_TIMEOUT,
+                 recorder=None):
+        self.concurrency = concurrency
+        self.rate_controllers = rate_controllers or RateControllerRegistry(max_concurrency=concurrency)
+        self.timeout = timeout
+        self.recorder = recorder
+        self._gates = {}
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="article-fetcher", daemon=True)
+        self._thread.start()
+        self._executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="fastparse")
+        asyncio.run_coroutine_threadsafe(self._open_session(), self._loop).result()
+
+    async def _open_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def _gate(self, host):
+        if host not in self._gates:
+            self._gates[host] = HostGate(self.rate_controllers.get(host))
+        return self._gates[host]
+
+    async def _fetch_one(self, article_url):
+        """(url, article or None); any failure only affects this URL, which then goes to Selenium."""
+        try:
+            page_html = await self._download(article_url)
+            if page_html is None:
+                return article_url, None
+            loop = asyncio.get_running_loop()
+            if self.recorder is not None:
+                await loop.run_in_executor(self._executor, self.recorder.record, article_url, page_html, "article")
+            return article_url, await loop.run_in_executor(self._executor, extract_embedded_article, page_html, article_url)
+        except Exception as e:
+            logger.warning(f"Fast path gagal memproses {article_url}: {e!r}")
+            return article_url, None
+
+    async def _download(self, article_url):
+        gate = self._gate(urlparse(article_url).netloc)
+        async with self._semaphore, gate:
+            started = time.monotonic()
+            try:
+                async with self._session.get(article_url) as response:
+                    page_html = await response.text(errors="replace")
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                gate.controller.record(time.monotonic() - started, ok=False)
+                logger.warning(f"Fast path gagal mengambil {article_url}: {e}")
+                return None
+
+            # 429 / 5xx mean the host is throttling or overloaded; a 404 is not congestion
+            gate.controller.record(time.monotonic() - started, ok=status != 429 and status < 500)
+            if status != 200:
+                logger.warning(f"Fast path HTTP {status}: {article_url}")
+                return None
+        return page_html
+
+    async def _fetch_many(self, article_urls):
+        results = await asyncio.gather(*(self._fetch_one(url) for url in article_urls), return_exceptions=True)
+        return {
+            url: None if isinstance(result, BaseException) else result[1]
+            for url, result in zip(article_urls, results)
+        }
+
+    def fetch_many(self, article_urls):
+        """Return {url: article dict or None}; None marks URLs that need the Selenium fallback."""
+        if not article_urls:
+            return {}
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._fetch_many(list(article_urls)), self._loop).result()
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# SCHEDULING DEFAULTS
+# =========================
+
+REFRESH_INTERVAL_HOURS = 24.0     # age at which an issue's expected novelty is fully "due"
+MAX_REVISIT_DAYS = 30.0           # every issue is rechecked (first page only) at least this often
+MIN_EXPECTED_NEW = 0.5            # skip issues expected to yield fewer new articles than this
+NOVELTY_SMOOTHING = 0.5           # EWMA weight of the latest run's new-article count
+LAST_SEEN_IDS = 50
+FAILURE_BACKOFF_HOURS = 1.0       # wait after a failed crawl, doubled for each further consecutive failure
+
+DOCUMENT_ID_PATTERN = re.compile(r"/document/(\d+)")
+
+def document_id(article_url):
+    match = DOCUMENT_ID_PATTERN.search(article_url)
+    return match.group(1) if match else article_url
+
+def issue_number(issue_url):
+    values = parse_qs(urlparse(issue_url).query).get("isnumber")
+    try:
+        return int(values[0]) if values else 0
+    except ValueError:
+        return 0
+
+class CrawlFrontier:
+    """
+    Persistent per-issue crawl state used to decide which issues to revisit.
+
+    For every issue it keeps page and article counts, the most recently seen
+    document IDs and an exponentially smoothed count of new articles per run.
+    Issues are scheduled by expected novelty (smoothed new articles scaled by
+    time since the last crawl); never-crawled issues come first, newest issue
+    number first. An issue whose crawl failed is held back for an exponentially
+    growing backoff before it is tried again.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.issues = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.issues = json.load(f).get("issues", {})
+            except (OSError, ValueError) as e:
+                logger.error(f"Gagal membaca crawl frontier {self.path}: {e}. Mulai dari kosong.")
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"issues": self.issues}, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def add_issues(self, issue_urls, processed_urls=None):
+        """Register issue URLs; issues already marked done by an older crawl count as crawled long ago."""
+        added = 0
+        for issue_url in issue_urls:
+            if issue_url in self.issues:
+                continue
+            already_done = processed_urls is not None and processed_urls.get(issue_url) == "berhasil"
+            self.issues[issue_url] = {
+                "isnumber": issue_number(issue_url),
+                "first_seen": time.time(),
+                "last_crawled": 0.0 if already_done else None,
+                "runs": 0,
+                "page_count": 0,
+                "article_count": 0,
+                "new_last_run": 0,
+                "novelty": 0.0,
+                "last_seen_ids": [],
+                "errors": 0,
+                "last_failed": None
+            }
+            added += 1
+        return added
+
+    def was_crawled(self, issue_url):
+        issue = self.issues.get(issue_url)
+        return issue is not None and issue["last_crawled"] is not None
+
+    def in_backoff(self, issue_url, now=None):
+        issue = self.issues[issue_url]
+        errors = issue.get("errors", 0)
+        if not errors or issue.get("last_failed") is None:
+            return False
+        now = now or time.time()
+        backoff_hours = min(FAILURE_BACKOFF_HOURS * 2 ** (errors - 1), MAX_REVISIT_DAYS * 24)
+        return now - issue["last_failed"] < backoff_hours * 3600.0
+
+    def expected_novelty(self, issue_url, now=None):
+        issue = self.issues[issue_url]
+        if self.in_backoff(issue_url, now):
+            return 0.0
+        if issue["last_crawled"] is None:
+            return float("inf")
+        now = now or time.time()
+        age_hours = max(now - issue["last_crawled"], 0.0) / 3600.0
+        expected = issue["novelty"] * age_hours / REFRESH_INTERVAL_HOURS
+        if age_hours >= MAX_REVISIT_DAYS * 24:
+            expected = max(expected, MIN_EXPECTED_NEW)
+        return expected
+
+    def schedule(self, issue_urls=None, now=None):
+        """Issue URLs worth crawling now, highest expected novelty first."""
+        now = now or time.time()
+        candidates = self.issues.keys() if issue_urls is None else [u for u in issue_urls if u in self.issues]
+        scored = [
+            (self.expected_novelty(url, now), -self.issues[url].get("errors", 0), self.issues[url]["isnumber"], url)
+            for url in candidates
+        ]
+        due = [item for item in scored if item[0] >= MIN_EXPECTED_NEW]
+        # At equal novelty, issues that failed before go after the ones that did not
+        due.sort(key=lambda item: item[:3], reverse=True)
+        logger.info(f"Frontier: {len(due)} dari {len(scored)} issue dijadwalkan.")
+        return [url for *_, url in due]
+
+    def expected_pages(self, issue_url):
+        """Pages seen on the issue's largest crawl so far (1 for issues never crawled)."""
+        issue = self.issues.get(issue_url)
+        return max(issue["page_count"], 1) if issue else 1
+
+    def page_is_known(self, issue_url, article_urls, processed_urls):
+        """True when a previously crawled issue's page holds no article we have not stored yet."""
+        if not self.was_crawled(issue_url):
+            return False
+        last_seen = set(self.issues[issue_url]["last_seen_ids"])
+        return all(
+            processed_urls.get(url) == "berhasil"
+            or (processed_urls.get(url) != "gagal" and document_id(url) in last_seen)
+            for url in article_urls
+        )
+
+    def record_issue(self, issue_url, pages, article_ids, new_articles):
+        """Update an issue after a crawl; `article_ids` are the IDs of stored articles, newest first."""
+        issue = self.issues[issue_url]
+        issue["runs"] += 1
+        issue["last_crawled"] = time.time()
+        issue["errors"] = 0
+        issue["page_count"] = max(issue["page_count"], pages)
+        issue["article_count"] += new_articles
+        issue["new_last_run"] = new_articles
+        if issue["runs"] == 1:
+            issue["novelty"] = float(new_articles)
+        else:
+            issue["novelty"] = NOVELTY_SMOOTHING * new_articles + (1 - NOVELTY_SMOOTHING) * issue["novelty"]
+
+        merged = list(dict.fromkeys(list(article_ids) + issue["last_seen_ids"]))
+        issue["last_seen_ids"] = merged[:LAST_SEEN_IDS]
+
+    def record_failure(self, issue_url):
+        """Note a failed crawl so the issue backs off instead of being retried first on every run."""
+        issue = self.issues.get(issue_url)
+        if issue is None:
+            return
+        issue["errors"] = issue.get("errors", 0) + 1
+        issue["last_failed"] = time.time()
+        logger.info(f"Frontier: crawl {issue_url} gagal ({issue['errors']}x), ditunda sebelum dicoba lagi.")
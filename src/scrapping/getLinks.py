@@ -1,34 +1,29 @@
 import pandas as pd
-import time
 import json
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from pathlib import Path
+from ratecontrol import RateControllerRegistry
+from readiness import paced_get, document_ready, all_present, stable_element_count
+from crawlstats import StatsPublisher
+from driverprofile import create_driver, PageLoadStats, LEAN_PROFILE
+from extraction import IEEE_BASE_URL
+from replay import recorder_from_env
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# SCRAPER_BASE_DIR redirects all data (e.g. to a sandbox for offline benchmarks)
+BASE_DIR = Path(os.environ.get("SCRAPER_BASE_DIR", Path(__file__).resolve().parent.parent.parent))
 DATA_DIR = BASE_DIR / "data" / "raw"
 DATA_PATH = DATA_DIR / "article_links.json"
 
+RATE_CONTROLLERS = RateControllerRegistry()
+STATS = StatsPublisher("getLinks")
+PAGE_LOADS = PageLoadStats(LEAN_PROFILE)
+RECORDER = recorder_from_env()
+
 def setup_driver():
-    # Use system-installed ChromeDriver
-    service = Service("/usr/local/bin/chromedriver")
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--enable-unsafe-swiftshader")
-    options.add_argument("--disable-cache")
-    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    
-    return webdriver.Chrome(service=service, options=options)
+    # Shared Chrome setup with getTitle.py (lean profile unless SCRAPER_LEAN_PROFILE=off)
+    return create_driver()
 
 def read_json(json_path):
     with open(json_path, "r", encoding="utf-8") as file:
@@ -38,9 +33,20 @@ def read_json(json_path):
 def scrape_ieee_links():
     driver = setup_driver()
     try:
-        target_url = "https://ieeexplore.ieee.org/xpl/issues?punumber=6287639&isnumber=10820123"
-        driver.get(target_url)
-        time.sleep(5)
+        target_url = f"{IEEE_BASE_URL}/xpl/issues?punumber=6287639&isnumber=10820123"
+        # Wait for the past-issues tabs and their links to finish rendering
+        issues_ready = all_present(
+            document_ready,
+            EC.presence_of_element_located((By.CLASS_NAME, "issue-details-past-tabs")),
+            stable_element_count((By.CSS_SELECTOR, ".issue-details-past-tabs a"))
+        )
+        if not paced_get(driver, target_url, RATE_CONTROLLERS, issues_ready, timeout=30):
+            print("Daftar issue belum lengkap dimuat, lanjut dengan elemen yang tersedia.")
+        PAGE_LOADS.measure(driver)
+        if RECORDER is not None:
+            RECORDER.record(target_url, driver.page_source, kind="issues")
+        STATS.update("rate_control", RATE_CONTROLLERS.snapshot())
+        STATS.update("page_load", PAGE_LOADS.snapshot(), force=True)
         
         posts = driver.find_elements(By.CLASS_NAME, "issue-details-past-tabs")
         volume_links = set()
@@ -50,21 +56,28 @@ def scrape_ieee_links():
             for link_tag in link_tags:
                 href = link_tag.get_attribute("href")
                 if href:
-                    base_link = "https://ieeexplore.ieee.org" + href if href.startswith("/xpl") else href
+                    base_link = IEEE_BASE_URL + href if href.startswith("/xpl") else href
                     volume_links.add(base_link)
         
         print(f"Ditemukan {len(volume_links)} link artikel unik:")
         for link in volume_links:
             print(link)
+
+        # Keep issues found by earlier runs; getTitle's frontier decides what to revisit
+        known_links = set(read_json(DATA_PATH)["URL"]) if DATA_PATH.exists() else set()
+        print(f"{len(volume_links - known_links)} link issue baru sejak run sebelumnya.")
+        volume_links |= known_links
         
         os.makedirs(DATA_DIR, exist_ok=True)
         with open(DATA_PATH, "w", encoding="utf-8") as file:
-            json.dump({"URL": list(volume_links)}, file, indent=4)
+            json.dump({"URL": sorted(volume_links)}, file, indent=4)
         
         print(f"Berhasil menyimpan {len(volume_links)} link ke {DATA_PATH}")
     
     finally:
         driver.quit()
+        if RECORDER is not None:
+            RECORDER.close()
 
 if __name__ == "__main__":
     scrape_ieee_links()
\ No newline at end of file
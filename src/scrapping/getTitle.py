@@ -1,31 +1,59 @@
 import pandas as pd
-import time
 import json
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import os
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from selenium.common.exceptions import TimeoutException
 from pathlib import Path
+from fastfetch import ArticleFetcher
+from urljournal import ProcessedUrlJournal
+from segmentlog import SegmentWriter, iter_segment_records
+from ratecontrol import RateControllerRegistry
+from readiness import paced_get, document_ready, all_present, any_present, stable_element_count
+from crawlstats import StatsPublisher, CrawlProgress
+from driverprofile import create_driver, PageLoadStats, LEAN_PROFILE
+from extraction import ExtractionPool, extract_article, extract_results_page, NO_RESULTS_XPATH
+from frontier import CrawlFrontier, document_id
+from replay import recorder_from_env
 
 # =========================
 # CONFIGURATION
 # =========================
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# SCRAPER_BASE_DIR redirects all data (e.g. to a sandbox for offline benchmarks)
+BASE_DIR = Path(os.environ.get("SCRAPER_BASE_DIR", Path(__file__).resolve().parent.parent.parent))
 DATA_DIR = BASE_DIR / "data" / "raw"
 OUTPUT_DIR = BASE_DIR / "data" / "raw" / "output"  
 PROCESSED_ARTICLE_URLS_FILE = BASE_DIR / "data" / "raw" / "processed_article_urls.json"
+PROCESSED_ARTICLE_URLS_JOURNAL = BASE_DIR / "data" / "raw" / "processed_article_urls.jsonl"
 processed_article_urls = {}
 DATA_PATH = DATA_DIR / "article_links.json"
-OUTPUT_PATH = OUTPUT_DIR / "scraped_articles.json"
+# Per-issue crawl state used to schedule refresh crawls by expected novelty
+CRAWL_FRONTIER_FILE = DATA_DIR / "crawl_frontier.json"
+# Per-page results (Judul/Tahun/Author) are appended as JSON Lines segments
+OUTPUT_PAGES_DIR = OUTPUT_DIR / "pages"
+OUTPUT_PAGES_PREFIX = "scraped_articles"
+# Article details go to size-bounded, gzip-sealed JSON Lines shards plus a manifest
+ARTICLES_DIR = OUTPUT_DIR / "articles"
+ARTICLES_PREFIX = "scraped_articles"
+ARTICLES_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Plain-HTTP fast path for article detail pages; Selenium is only used as fallback
+FAST_PATH_ENABLED = True
+FAST_PATH_CONCURRENCY = 8
+FAST_PATH_MAX_CONSECUTIVE_FAILURES = 20
+fast_path_failures = 0
+
+# Per-host AIMD pacing shared by Selenium navigation and the fast path
+RATE_CONTROLLERS = RateControllerRegistry(max_concurrency=FAST_PATH_CONCURRENCY)
+STATS = StatsPublisher("getTitle")
+# Pages are parsed on worker threads while the browser loads the next URL
+EXTRACTION_WORKERS = 4
+# Set SCRAPER_RECORD_DIR to capture every rendered page for offline replay
+RECORDER = recorder_from_env()
+PAGE_LOADS = PageLoadStats(LEAN_PROFILE)
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -48,27 +76,15 @@ if not logger.hasHandlers():
 
 def setup_driver():
     try:
-        # Use system-installed ChromeDriver (same as getLinks.py)
-        service = Service("/usr/local/bin/chromedriver")
-        options = Options()
-        
-        # Use consistent options with getLinks.py
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--enable-unsafe-swiftshader")
-        options.add_argument("--disable-cache")
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--window-size=1200,800")
-        options.add_argument("--lang=en-US")
-        options.add_argument("--ignore-certificate-errors")
-        options.add_argument("--ignore-ssl-errors")
-        options.add_argument("--disable-web-security")
-        options.add_argument("--allow-running-insecure-content")
-
-        driver = webdriver.Chrome(service=service, options=options)
+        # Shared Chrome setup with getLinks.py (lean profile unless SCRAPER_LEAN_PROFILE=off)
+        driver = create_driver(extra_arguments=[
+            "--window-size=1200,800",
+            "--lang=en-US",
+            "--ignore-certificate-errors",
+            "--ignore-ssl-errors",
+            "--disable-web-security",
+            "--allow-running-insecure-content"
+        ])
         logger.info("WebDriver berhasil diinisialisasi.")
         return driver
     except Exception as e:
@@ -93,156 +109,177 @@ def read_json(json_path):
         logger.critical(f"Kesalahan lainnya saat membaca JSON: {e}")
         raise
 
-def read_existing_output(output_path):
-    if Path(output_path).exists():
-        return pd.read_json(output_path)
+def read_existing_output(pages_dir=OUTPUT_PAGES_DIR):
+    records = list(iter_segment_records(pages_dir, OUTPUT_PAGES_PREFIX))
+    if records:
+        return pd.DataFrame(records)
     else:
         return pd.DataFrame(columns=["Judul", "Tahun", "Author"])
 
-def append_and_save(new_data, output_path):
-    output_path = Path(output_path)
+def append_and_save(new_data, page_writer):
+    page_writer.append(new_data.to_dict(orient="records"))
+    page_writer.flush()
+    print(f"Data dari halaman ini berhasil ditambahkan ke: {page_writer.active_path}")
 
-    if output_path.is_dir():
-        raise ValueError(f"output_path harus file, bukan folder: {output_path}")
-    
-    existing_data = read_existing_output(output_path)
-    combined_data = pd.concat([existing_data, new_data], ignore_index=True)
-    output_dir = Path(output_path).parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-    combined_data.to_json(output_path, orient="records", indent=4)
-    print(f"Data dari halaman ini berhasil ditambahkan ke: {output_path}")
-
-def save_article_separately(article_data, output_dir):
+def save_article(article_data, article_store):
     try:
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        file_count = len(list(output_dir.glob("scraped_articles_*.json"))) + 1
-        output_file = output_dir / f"scraped_articles_{file_count}.json"
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(article_data, f, ensure_ascii=False, indent=4)
-        
-        logger.info(f"Data berhasil disimpan ke: {output_file}")
+        seq = article_store.append(article_data)
+        article_store.flush()
+        logger.info(f"Data berhasil disimpan ke: {article_store.active_path} (seq {seq})")
     except Exception as e:
         logger.error(f"Gagal menyimpan artikel: {e}")
 
 def load_processed_article_urls():
-    if PROCESSED_ARTICLE_URLS_FILE.exists():
-        try:
-            with open(PROCESSED_ARTICLE_URLS_FILE, "r", encoding="utf-8") as f:
-                processed_article_urls = json.load(f)
-            return processed_article_urls 
-        except Exception as e:
-            logger.error(f"Gagal membaca daftar URL artikel yang sudah diproses: {e}")
-            return {}
-    return {}
-
-def save_processed_article_urls():
+    # Legacy processed_article_urls.json is imported once into the journal
+    return ProcessedUrlJournal(PROCESSED_ARTICLE_URLS_JOURNAL, legacy_path=PROCESSED_ARTICLE_URLS_FILE)
+
+def save_processed_article_urls(force=False):
     try:
-        with open(PROCESSED_ARTICLE_URLS_FILE, "w", encoding="utf-8") as f:
-            json.dump(processed_article_urls, f, ensure_ascii=False, indent=4)
-        logger.info("Daftar URL artikel yang sudah diproses berhasil disimpan.")
+        processed_article_urls.sync(force=force)
     except Exception as e:
         logger.error(f"Gagal menyimpan URL artikel yang sudah diproses: {e}")
 
-def scrape_article_details(driver, article_url):
-    driver.get(article_url)
-    
+def load_article_page(driver, article_url):
+    """Navigate to an article and return its rendered HTML, or None if it did not load."""
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "document-title"))
-        )
+        ready = paced_get(driver, article_url, RATE_CONTROLLERS,
+                          EC.presence_of_element_located((By.CLASS_NAME, "document-title")))
     except Exception as e:
         logger.warning(f"Gagal memuat detail artikel: {article_url} - Error: {e}")
+        return None
+    if not ready:
+        logger.warning(f"Gagal memuat detail artikel: {article_url} - Error: timeout")
+        return None
+    PAGE_LOADS.measure(driver)
+
+    # The abstract block renders after the title; wait for it instead of a fixed sleep
+    try:
+        WebDriverWait(driver, 5, poll_frequency=0.2).until(all_present(
+            document_ready,
+            EC.presence_of_element_located((By.CLASS_NAME, "doc-abstract-pubdate"))
+        ))
+    except TimeoutException:
+        logger.info(f"Blok abstrak belum lengkap, lanjut dengan DOM saat ini: {article_url}")
+
+    page_html = driver.page_source
+    if RECORDER is not None:
+        RECORDER.record(article_url, page_html, kind="article")
+    return page_html
+
+def scrape_article_details(driver, article_url):
+    page_html = load_article_page(driver, article_url)
+    if page_html is None:
         return pd.DataFrame()
+    return pd.DataFrame([extract_article(page_html, article_url)])
+
+def fetch_articles_fast(fetcher, article_urls):
+    global fast_path_failures
+
+    if fetcher is None or not article_urls:
+        return {}
+    if fast_path_failures >= FAST_PATH_MAX_CONSECUTIVE_FAILURES:
+        return {}
+
+    results = fetcher.fetch_many(article_urls)
+    fetched = sum(1 for article in results.values() if article is not None)
+    fast_path_failures = 0 if fetched else fast_path_failures + len(article_urls)
+    logger.info(f"Fast path: {fetched}/{len(article_urls)} artikel didapat tanpa Selenium.")
+    if fast_path_failures >= FAST_PATH_MAX_CONSECUTIVE_FAILURES:
+        logger.warning("Fast path terus gagal, beralih sepenuhnya ke Selenium.")
+    return results
 
-    time.sleep(1)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    
-    title = soup.find("h1", class_="document-title")
-    title = title.get_text(strip=True) if title else "Title Not Found"
-    
-    abstract_section = soup.find("div", attrs={"xplmathjax": True})
-    abstract = abstract_section.get_text(strip=True) if abstract_section else "Abstract Not Found"
-    
-    author_spans = soup.find_all("span", attrs={"_ngcontent-ng-c1131135293": True})
-    authors = ", ".join(sorted(set(span.text.strip() for span in author_spans if span.text.strip()))).strip(", ")
-
-    journal_conference_name = "IEEE Access"
-    publisher = "IEEE"
-    year = soup.find("div", class_="doc-abstract-pubdate").get_text(strip=True).split()[-1] if soup.find("div", class_="doc-abstract-pubdate") else "Year Not Found"
-    
-    doi_link = soup.find("div", class_="stats-document-abstract-doi")
-    doi = doi_link.find("a", href=True)["href"] if doi_link and doi_link.find("a", href=True) else "DOI Not Found"
-    
-    group_name = "OpsA"
-
-    article_data = {
-        "title": title,
-        "abstract": abstract,
-        "authors": authors,
-        "journal_conference_name": journal_conference_name,
-        "publisher": publisher,
-        "year": year,
-        "doi": doi,
-        "group_name": group_name,
-        "url": article_url
-    }
-
-    return pd.DataFrame([article_data])
-
-def scrape_from_url(row, driver, output_path):
+def scrape_from_url(row, driver, page_writer, article_store, extraction_pool, frontier, progress, fetcher=None):
     base_url = row["URL"]
+    progress.start_issue(base_url)
 
     try:
         logger.info(f"Mulai scraping {base_url}")
         page_number = 1
         visited_page_urls = []
+        seen_urls = []
+        new_articles = 0
 
         while True:
             url = f"{base_url}&sortType=vol-only-newest&pageNumber={page_number}"
             logger.info(f"Membuka halaman {page_number}: {url}")
-            driver.get(url)
 
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "col"))
+            # Ready once the results list has rendered and stopped growing, or the page
+            # says it has no results; an empty page is not a slow host and must not trigger backoff
+            results_ready = all_present(
+                document_ready,
+                any_present(
+                    all_present(
+                        EC.presence_of_element_located((By.CLASS_NAME, "col")),
+                        stable_element_count((By.CSS_SELECTOR, "a[href*='/document/']"))
+                    ),
+                    EC.presence_of_element_located((By.XPATH, NO_RESULTS_XPATH))
                 )
-            except Exception:
+            )
+            if not paced_get(driver, url, RATE_CONTROLLERS, results_ready):
                 logger.warning(f"Halaman {page_number} gagal dimuat.")
                 break
+            PAGE_LOADS.measure(driver)
 
-            time.sleep(3)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            article_links = list(set([
-                f"https://ieeexplore.ieee.org{a['href']}"
-                for a in soup.find_all("a", href=True)
-                if "/document/" in a['href'] and "/citations" not in a['href']
-            ]))
+            page_html = driver.page_source
+            if RECORDER is not None:
+                RECORDER.record(url, page_html, kind="results")
+            article_links, has_next_page = extract_results_page(page_html)
 
             if not article_links:
                 logger.warning(f"Tidak ada artikel ditemukan di halaman {page_number}.")
                 break
 
             logger.info(f"{len(article_links)} artikel ditemukan di halaman {page_number}")
+            seen_urls.extend(article_links)
+
+            # Results are sorted newest first, so a fully known page means the rest is known too
+            if frontier.page_is_known(base_url, article_links, processed_article_urls):
+                logger.info(f"Semua artikel di halaman {page_number} sudah pernah diambil, berhenti paginasi.")
+                visited_page_urls.append(url)
+                break
 
             titles, years, authors = [], [], []
 
+            pending_links = [u for u in article_links if processed_article_urls.get(u) != "berhasil"]
+            fast_results = fetch_articles_fast(fetcher, pending_links)
+
+            # Browser pass: load the pages the fast path missed, handing each one to the
+            # extraction pool so parsing overlaps with loading the next URL
+            parsed = {}
+            for article_url in pending_links:
+                if fast_results.get(article_url) is not None:
+                    continue
+                page_html = load_article_page(driver, article_url)
+                if page_html is not None:
+                    parsed[article_url] = extraction_pool.submit_article(page_html, article_url)
+
             for article_url in article_links:
                 if processed_article_urls.get(article_url) == "berhasil":
                     logger.info(f"Sudah diproses: {article_url}")
                     continue
 
-                article_data = scrape_article_details(driver, article_url)
+                if fast_results.get(article_url) is not None:
+                    article_data = pd.DataFrame([fast_results[article_url]])
+                elif article_url in parsed:
+                    try:
+                        article_data = pd.DataFrame([parsed[article_url].result()])
+                    except Exception as e:
+                        logger.warning(f"Gagal mengekstrak detail artikel: {article_url} - Error: {e}")
+                        article_data = pd.DataFrame()
+                else:
+                    article_data = pd.DataFrame()
                 if not article_data.empty:
-                    save_article_separately(article_data.to_dict(orient="records")[0], OUTPUT_DIR)
+                    save_article(article_data.to_dict(orient="records")[0], article_store)
                     processed_article_urls[article_url] = "berhasil"
+                    new_articles += 1
                 else:
                     processed_article_urls[article_url] = "gagal"
+                progress.article_done(not article_data.empty)
 
                 save_processed_article_urls()
+                STATS.update("rate_control", RATE_CONTROLLERS.snapshot())
+                STATS.update("page_load", PAGE_LOADS.snapshot())
+                STATS.update("progress", progress.snapshot())
 
                 title = article_data["title"].values[0] if not article_data.empty else "Judul Tidak Ditemukan"
                 year = article_data["year"].values[0] if not article_data.empty else "Tahun Tidak Ditemukan"
@@ -257,12 +294,12 @@ def scrape_from_url(row, driver, output_path):
                 "Tahun": years,
                 "Author": authors
             })
-            append_and_save(new_df, output_path)
+            append_and_save(new_df, page_writer)
 
             visited_page_urls.append(url)
+            progress.page_done()
 
-            next_btn_soup = soup.select_one("li.next-btn > button[class^='stats-Pagination_arrow_next_']")
-            if next_btn_soup:
+            if has_next_page:
                 logger.info("Tombol Next (>) ditemukan, lanjut ke halaman berikutnya.")
                 page_number += 1
             else:
@@ -270,7 +307,11 @@ def scrape_from_url(row, driver, output_path):
                 break
 
         processed_article_urls[base_url] = "berhasil"
-        save_processed_article_urls()
+        save_processed_article_urls(force=True)
+        # Only stored articles count as seen; failed ones must be fetched again next time
+        stored_ids = [document_id(u) for u in seen_urls if processed_article_urls.get(u) == "berhasil"]
+        frontier.record_issue(base_url, len(visited_page_urls), stored_ids, new_articles)
+        frontier.save()
 
         logger.info(f"Total {len(visited_page_urls)} halaman diproses dari base URL: {base_url}")
 
@@ -280,6 +321,11 @@ def scrape_from_url(row, driver, output_path):
         logger.error(f"Error saat scraping {base_url}: {e}")
         processed_article_urls[base_url] = "gagal"
         save_processed_article_urls()
+        frontier.record_failure(base_url)
+        frontier.save()
+
+    progress.issue_done()
+    STATS.update("progress", progress.snapshot(), force=True)
 
 # =========================
 # MAIN FUNCTION
@@ -291,17 +337,47 @@ def main():
         processed_article_urls = load_processed_article_urls()
         df = read_json(DATA_PATH)
         logger.info(f"Total URL dalam data: {len(df)}")
-        df_unprocessed = df[~df["URL"].isin(processed_article_urls.keys())]
-        logger.info(f"Total URL yang belum diproses: {len(df_unprocessed)}")
+        frontier = CrawlFrontier(CRAWL_FRONTIER_FILE)
+        new_issues = frontier.add_issues(df["URL"].tolist(), processed_article_urls)
+        frontier.save()
+        logger.info(f"Issue baru di frontier: {new_issues}")
+        scheduled_urls = frontier.schedule(df["URL"].tolist())
+        logger.info(f"Total URL yang dijadwalkan: {len(scheduled_urls)}")
         driver = setup_driver()
+        fetcher = ArticleFetcher(FAST_PATH_CONCURRENCY, RATE_CONTROLLERS, recorder=RECORDER) if FAST_PATH_ENABLED else None
+        page_writer = SegmentWriter(OUTPUT_PAGES_DIR, OUTPUT_PAGES_PREFIX)
+        article_store = SegmentWriter(ARTICLES_DIR, ARTICLES_PREFIX, max_segment_bytes=ARTICLES_SEGMENT_BYTES,
+                                      buffer_records=1, compress=True)
+        extraction_pool = ExtractionPool(EXTRACTION_WORKERS)
+        # Legacy one-file-per-article output is counted once by name; the store count comes from its manifest
+        legacy_articles = sum(1 for _ in OUTPUT_DIR.glob("scraped_articles_*.json"))
+        progress = CrawlProgress(
+            {url: frontier.expected_pages(url) for url in scheduled_urls},
+            articles_stored=article_store.next_seq + legacy_articles
+        )
+        STATS.update("progress", progress.snapshot(), force=True)
         try:
-            for row in df_unprocessed.to_dict("records"):
-                scrape_from_url(row, driver, OUTPUT_PATH)
+            for base_url in scheduled_urls:
+                scrape_from_url({"URL": base_url}, driver, page_writer, article_store, extraction_pool, frontier,
+                                progress, fetcher)
         finally:
+            extraction_pool.close()
+            article_store.close()
+            page_writer.close()
+            if fetcher is not None:
+                fetcher.close()
             driver.quit()
+            if RECORDER is not None:
+                RECORDER.close()
+            progress.finish()
+            STATS.update("rate_control", RATE_CONTROLLERS.snapshot())
+            STATS.update("progress", progress.snapshot())
+            STATS.update("page_load", PAGE_LOADS.snapshot(), force=True)
+            PAGE_LOADS.log_summary()
             logger.info("WebDriver ditutup.")
 
-        save_processed_article_urls()
+        processed_article_urls.close()
+        logger.info("Daftar URL artikel yang sudah diproses berhasil disimpan.")
 
     except Exception as e:
         logger.critical(f"Program gagal dijalankan: {e}")
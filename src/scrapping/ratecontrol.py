@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+# =========================
+# DEFAULTS
+# =========================
+
+DEFAULT_INITIAL_RATE = 1.0          # requests per second
+DEFAULT_MIN_RATE = 0.1
+DEFAULT_MAX_RATE = 10.0
+DEFAULT_RATE_INCREASE = 0.1         # additive step per healthy response
+DEFAULT_DECREASE_FACTOR = 0.5       # multiplicative step on errors / slow responses
+DEFAULT_SLOW_THRESHOLD = 8.0        # seconds; slower responses count as congestion
+DEFAULT_INITIAL_CONCURRENCY = 2
+DEFAULT_MAX_CONCURRENCY = 16
+
+class AimdRateController:
+    """
+    Additive-increase / multiplicative-decrease pacing for one host.
+
+    Healthy responses raise the request rate by `increase` and the concurrency
+    window by 1/window; an error or a response slower than `slow_threshold`
+    multiplies both by `decrease_factor`. Decreases are applied at most once
+    per current request interval so a burst of failures counts as one backoff.
+    """
+
+    def __init__(self, initial_rate=DEFAULT_INITIAL_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 increase=DEFAULT_RATE_INCREASE, decrease_factor=DEFAULT_DECREASE_FACTOR,
+                 slow_threshold=DEFAULT_SLOW_THRESHOLD, initial_concurrency=DEFAULT_INITIAL_CONCURRENCY,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.slow_threshold = slow_threshold
+        self.window = float(initial_concurrency)
+        self.max_concurrency = max_concurrency
+
+        self.requests = 0
+        self.errors = 0
+        self.slow_responses = 0
+        self.backoff_events = 0
+        self.last_latency = 0.0
+
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self._last_backoff = 0.0
+
+    @property
+    def concurrency(self):
+        return max(1, int(self.window))
+
+    def _reserve_slot(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        return slot - now
+
+    def wait(self):
+        """Block until the next request to this host may start."""
+        delay = self._reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self._reserve_slot()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, latency, ok=True):
+        """Feed back the outcome of one request."""
+        with self._lock:
+            self.requests += 1
+            self.last_latency = latency
+            slow = latency > self.slow_threshold
+            if not ok:
+                self.errors += 1
+            if slow:
+                self.slow_responses += 1
+
+            if ok and not slow:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+                return
+
+            now = time.monotonic()
+            if now - self._last_backoff < 1.0 / self.rate:
+                return
+            self._last_backoff = now
+            self.backoff_events += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.window = max(1.0, self.window * self.decrease_factor)
+            # Push the next slot out so the lower rate takes effect immediately
+            self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "rate": round(self.rate, 4),
+                "concurrency": self.concurrency,
+                "requests": self.requests,
+                "errors": self.errors,
+                "slow_responses": self.slow_responses,
+                "backoff_events": self.backoff_events,
+                "last_latency": round(self.last_latency, 4)
+            }
+
+class RateControllerRegistry:
+    """One AimdRateController per host, created on first use."""
+
+    def __init__(self, **controller_kwargs):
+        self.controller_kwargs = controller_kwargs
+        self._controllers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            if host not in self._controllers:
+                self._controllers[host] = AimdRateController(**self.controller_kwargs)
+            return self._controllers[host]
+
+    def snapshot(self):
+        with self._lock:
+            controllers = dict(self._controllers)
+        return {host: controller.snapshot() for host, controller in controllers.items()}
@@ -0,0 +1,85 @@
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_FREQUENCY = 0.2
+
+# =========================
+# READINESS CONDITIONS
+# =========================
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+class all_present:
+    """Every wrapped expected condition holds at the same time."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def __call__(self, driver):
+        for condition in self.conditions:
+            if not condition(driver):
+                return False
+        return True
+
+class any_present:
+    """At least one wrapped expected condition holds, e.g. results or the "no results" marker."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def __call__(self, driver):
+        for condition in self.conditions:
+            if condition(driver):
+                return True
+        return False
+
+class stable_element_count:
+    """
+    At least `minimum` elements match `locator` and the count has not changed
+    for `settle_polls` consecutive polls, i.e. the client-side render is done.
+    """
+
+    def __init__(self, locator, minimum=1, settle_polls=2):
+        self.locator = locator
+        self.minimum = minimum
+        self.settle_polls = settle_polls
+        self._last_count = None
+        self._stable_polls = 0
+
+    def __call__(self, driver):
+        count = len(driver.find_elements(*self.locator))
+        if count == self._last_count:
+            self._stable_polls += 1
+        else:
+            self._last_count = count
+            self._stable_polls = 0
+        return count >= self.minimum and self._stable_polls >= self.settle_polls
+
+# =========================
+# PACED NAVIGATION
+# =========================
+
+def paced_get(driver, url, rate_controllers, condition, timeout=15):
+    """
+    Load `url` once the host's rate controller allows it and wait until
+    `condition` holds. The load time and outcome are fed back to the
+    controller; returns False when the page did not become ready in time.
+    """
+    controller = rate_controllers.get(urlparse(url).netloc)
+    controller.wait()
+    started = time.monotonic()
+    try:
+        driver.get(url)
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+        ready = True
+    except TimeoutException:
+        ready = False
+    except Exception:
+        controller.record(time.monotonic() - started, ok=False)
+        raise
+    controller.record(time.monotonic() - started, ok=ready)
+    return ready
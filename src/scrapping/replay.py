@@ -0,0 +1,261 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+RECORD_DIR_ENV = "SCRAPER_RECORD_DIR"
+INDEX_FILE = "index.jsonl"
+LEGACY_INDEX_FILE = "index.json"
+
+# Inline scripts are dropped so the recorded DOM is served as-is instead of being
+# re-rendered by the site's JavaScript; the embedded metadata script is kept for
+# the plain-HTTP fast path.
+SCRIPT_PATTERN = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+KEEP_SCRIPT_MARKER = "xplGlobal.document.metadata"
+
+def archive_key(url):
+    """Host-independent key: path plus sorted query string."""
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return f"{parsed.path}?{query}" if query else parsed.path
+
+def strip_scripts(page_html):
+    return SCRIPT_PATTERN.sub(lambda m: m.group(0) if KEEP_SCRIPT_MARKER in m.group(0) else "", page_html)
+
+# =========================
+# ARCHIVE / RECORDER
+# =========================
+
+class PageArchive:
+    """
+    A directory of gzip'ed page bodies plus an index keyed by archive_key().
+
+    The index is index.jsonl, one {"key", ...entry} line per recorded page; a
+    later line for the same key replaces the earlier one. Archives recorded
+    before that format keep their index.json, which is read first.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_FILE
+        self.index = {}
+        legacy_path = self.directory / LEGACY_INDEX_FILE
+        if legacy_path.exists():
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash mid-append
+                        continue
+                    self.index[entry.pop("key")] = entry
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, url_or_key):
+        key = url_or_key if url_or_key.startswith("/") else archive_key(url_or_key)
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        with gzip.open(self.directory / entry["file"], "rb") as f:
+            return entry, f.read()
+
+    def items(self):
+        for key, entry in self.index.items():
+            with gzip.open(self.directory / entry["file"], "rb") as f:
+                yield key, entry, f.read()
+
+class PageRecorder(PageArchive):
+    """Capture rendered pages during a live crawl (enabled with SCRAPER_RECORD_DIR)."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+        if self._index_file.tell() > 0:
+            # Start on a fresh line in case the last append was cut short
+            self._index_file.write("\n")
+
+    def record(self, url, page_html, kind="page", status=200, content_type="text/html; charset=utf-8"):
+        body = strip_scripts(page_html).encode("utf-8")
+        key = archive_key(url)
+        file_name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".html.gz"
+        with gzip.open(self.directory / file_name, "wb") as f:
+            f.write(body)
+        entry = {
+            "file": file_name,
+            "url": url,
+            "kind": kind,
+            "status": status,
+            "content_type": content_type,
+            "bytes": len(body),
+            "recorded_at": time.time()
+        }
+        # One appended line per page instead of rewriting the whole index
+        with self._lock:
+            self.index[key] = entry
+            self._index_file.write(json.dumps(dict(entry, key=key)) + "\n")
+            self._index_file.flush()
+
+    def close(self):
+        with self._lock:
+            self._index_file.close()
+
+def recorder_from_env():
+    record_dir = os.environ.get(RECORD_DIR_ENV)
+    return PageRecorder(record_dir) if record_dir else None
+
+# =========================
+# REPLAY SERVER
+# =========================
+
+class ReplayStats:
+    def __init__(self):
+        self.requests = 0
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, field):
+        with self._lock:
+            self.requests += 1
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "served": self.served,
+                "missing": self.missing,
+                "injected_errors": self.injected_errors
+            }
+
+class ReplayServer:
+    """
+    Serve a PageArchive over HTTP with configurable latency and error injection.
+
+    Each request waits `latency` seconds (plus uniform jitter) and fails with
+    `error_status` with probability `error_rate`; unknown pages return 404.
+    """
+
+    def __init__(self, archive, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, seed=None):
+        self.archive = archive if isinstance(archive, PageArchive) else PageArchive(archive)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = ReplayStats()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._random_lock:
+            return self._random.random(), self._random.uniform(0, self.jitter) if self.jitter else 0.0
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                roll, jitter = server._draw()
+                delay = server.latency + jitter
+                if delay > 0:
+                    time.sleep(delay)
+
+                if roll < server.error_rate:
+                    server.stats.add("injected_errors")
+                    self._send(server.error_status, b"injected error", "text/plain")
+                    return
+
+                found = server.archive.get(archive_key(self.path))
+                if found is None:
+                    server.stats.add("missing")
+                    self._send(404, b"not recorded", "text/plain")
+                    return
+
+                entry, body = found
+                server.stats.add("served")
+                self._send(entry.get("status", 200), body, entry.get("content_type", "text/html; charset=utf-8"))
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Replay server berjalan di {self.base_url} ({len(self.archive)} halaman)")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded IEEE pages locally.")
+    parser.add_argument("archive", help="Directory written with SCRAPER_RECORD_DIR")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = ReplayServer(args.archive, args.host, args.port, args.latency, args.jitter, args.error_rate, args.error_status)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_BUFFER_RECORDS = 500
+PART_SUFFIX = ".jsonl.part"
+SEGMENT_SUFFIX = ".jsonl"
+COMPRESSED_SUFFIX = ".jsonl.gz"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+def _segment_name(prefix, index):
+    return f"{prefix}-{index:06d}"
+
+def _segment_index(prefix, name):
+    match = re.fullmatch(rf"{re.escape(prefix)}-(\d+)\.jsonl(\.part|\.gz)?", name)
+    return int(match.group(1)) if match else None
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _truncate_torn_tail(path):
+    """Cut a partially written last line left by a crash."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+def _open_segment(path):
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def _count_lines(path):
+    with _open_segment(path) as f:
+        return sum(1 for line in f if line.endswith("\n"))
+
+def manifest_path(directory, prefix):
+    return Path(directory) / (prefix + MANIFEST_SUFFIX)
+
+def _write_json_atomic(path, data):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+def read_manifest(directory, prefix):
+    path = manifest_path(directory, prefix)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class SegmentWriter:
+    """
+    Buffered JSON Lines writer that rolls over to a new segment file by size.
+
+    Records go to `<prefix>-NNNNNN.jsonl.part`; once the segment reaches
+    `max_segment_bytes` it is fsync'ed and sealed as `.jsonl` (or `.jsonl.gz`
+    when `compress` is set), so sealed segments are immutable and the cost of
+    an append does not depend on how much has been written before.
+
+    Every record gets a monotonic sequence number. Sealed segments and their
+    sequence ranges are listed in `<prefix>.manifest.json`, which is replaced
+    atomically on each seal; the writer never lists the directory except to
+    migrate segments written before the manifest existed.
+    """
+
+    def __init__(self, directory, prefix, max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES,
+                 buffer_records=DEFAULT_BUFFER_RECORDS, compress=False):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.buffer_records = buffer_records
+        self.compress = compress
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._buffer = []
+        self._file = None
+        self._manifest = read_manifest(self.directory, prefix) or self._build_manifest()
+        self._open_active_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def active_path(self):
+        return self.directory / (_segment_name(self.prefix, self._manifest["active"]["index"]) + PART_SUFFIX)
+
+    @property
+    def next_seq(self):
+        return self._next_seq
+
+    def _build_manifest(self):
+        """Create the manifest from segments already on disk (one-time directory scan)."""
+        manifest = {"version": MANIFEST_VERSION, "segments": [], "active": {"index": 1, "first_seq": 0}}
+        seq = 0
+        for path in segment_paths(self.directory, self.prefix):
+            index = _segment_index(self.prefix, path.name)
+            if path.name.endswith(PART_SUFFIX):
+                manifest["active"] = {"index": index, "first_seq": seq}
+                break
+            records = _count_lines(path)
+            manifest["segments"].append(self._segment_entry(path, index, seq, records))
+            seq += records
+            manifest["active"] = {"index": index + 1, "first_seq": seq}
+        _write_json_atomic(manifest_path(self.directory, self.prefix), manifest)
+        return manifest
+
+    @staticmethod
+    def _segment_entry(path, index, first_seq, records):
+        return {
+            "name": path.name,
+            "index": index,
+            "first_seq": first_seq,
+            "records": records,
+            "bytes": path.stat().st_size
+        }
+
+    def _open_active_segment(self):
+        active = self._manifest["active"]
+
+        # A crash between sealing a segment and committing the manifest leaves
+        # the sealed file without its manifest entry; adopt it here.
+        for suffix in (SEGMENT_SUFFIX, COMPRESSED_SUFFIX):
+            sealed_path = self.directory / (_segment_name(self.prefix, active["index"]) + suffix)
+            if sealed_path.exists() and not self.active_path.exists():
+                records = _count_lines(sealed_path)
+                self._commit_sealed(sealed_path, records)
+                break
+
+        if self.active_path.exists():
+            _truncate_torn_tail(self.active_path)
+            records = _count_lines(self.active_path)
+        else:
+            records = 0
+
+        self._next_seq = self._manifest["active"]["first_seq"] + records
+        self._file = open(self.active_path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def append(self, records):
+        """
+        Buffer records and return the sequence number of the first one.
+
+        Records reach the OS once `buffer_records` are pending or on flush().
+        """
+        if isinstance(records, dict):
+            records = [records]
+        first_seq = self._next_seq
+        for record in records:
+            self._buffer.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self._next_seq += 1
+        if len(self._buffer) >= self.buffer_records:
+            self.flush()
+        return first_seq
+
+    def _write_buffer(self):
+        if self._buffer:
+            data = "".join(self._buffer)
+            self._buffer = []
+            self._file.write(data)
+            self._size += len(data.encode("utf-8"))
+
+    def flush(self, sync=False):
+        self._write_buffer()
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        if self._size >= self.max_segment_bytes:
+            self.rotate()
+
+    def rotate(self):
+        """Seal the active segment, commit it to the manifest and start the next one."""
+        self._write_buffer()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        if self._size > 0:
+            records = self._next_seq - self._manifest["active"]["first_seq"]
+            sealed_path = self._seal(self.active_path)
+            self._commit_sealed(sealed_path, records)
+            logger.info(f"Segmen ditutup: {sealed_path} ({records} record)")
+
+        self._file = open(self.active_path, "a", encoding="utf-8")
+        self._size = 0
+
+    def _seal(self, part_path):
+        name = part_path.name[:-len(PART_SUFFIX)]
+        if not self.compress:
+            sealed_path = self.directory / (name + SEGMENT_SUFFIX)
+            os.replace(part_path, sealed_path)
+            _fsync_dir(self.directory)
+            return sealed_path
+
+        sealed_path = self.directory / (name + COMPRESSED_SUFFIX)
+        tmp_path = sealed_path.with_name(sealed_path.name + ".tmp")
+        with open(part_path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, sealed_path)
+        os.remove(part_path)
+        _fsync_dir(self.directory)
+        return sealed_path
+
+    def _commit_sealed(self, sealed_path, records):
+        active = self._manifest["active"]
+        self._manifest["segments"].append(self._segment_entry(sealed_path, active["index"], active["first_seq"], records))
+        self._manifest["active"] = {"index": active["index"] + 1, "first_seq": active["first_seq"] + records}
+        _write_json_atomic(manifest_path(self.directory, self.prefix), self._manifest)
+
+    def close(self):
+        if self._file is None or self._file.closed:
+            return
+        self.flush(sync=True)
+        self._file.close()
+
+def segment_paths(directory, prefix):
+    """Segments in write order, found by listing the directory."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    segments = []
+    for path in directory.iterdir():
+        index = _segment_index(prefix, path.name)
+        if index is not None:
+            segments.append((index, path.name.endswith(PART_SUFFIX), path))
+    return [path for _, _, path in sorted(segments)]
+
+def _manifest_segments(directory, prefix, start_seq=0):
+    """(first_seq, path) for every segment holding sequence numbers >= start_seq."""
+    directory = Path(directory)
+    manifest = read_manifest(directory, prefix)
+    if manifest is None:
+        seq = 0
+        for path in segment_paths(directory, prefix):
+            yield seq, path
+            seq += _count_lines(path)
+        return
+
+    for segment in manifest["segments"]:
+        if segment["first_seq"] + segment["records"] > start_seq:
+            yield segment["first_seq"], directory / segment["name"]
+    active = manifest["active"]
+    active_path = directory / (_segment_name(prefix, active["index"]) + PART_SUFFIX)
+    if active_path.exists():
+        yield active["first_seq"], active_path
+
+def iter_segment_records(directory, prefix, start_seq=0, with_seq=False):
+    """Stream records back from every segment without loading them all at once."""
+    for first_seq, path in _manifest_segments(directory, prefix, start_seq):
+        with _open_segment(path) as f:
+            for seq, line in enumerate(f, start=first_seq):
+                if not line.endswith("\n"):
+                    break
+                if seq < start_seq:
+                    continue
+                record = json.loads(line)
+                yield (seq, record) if with_seq else record
+
+def count_segment_records(directory, prefix):
+    """Total records in the store: manifest totals plus the lines of the active segment."""
+    manifest = read_manifest(directory, prefix)
+    if manifest is None:
+        return sum(_count_lines(path) for path in segment_paths(directory, prefix))
+    active = manifest["active"]
+    active_path = Path(directory) / (_segment_name(prefix, active["index"]) + PART_SUFFIX)
+    return active["first_seq"] + (_count_lines(active_path) if active_path.exists() else 0)
+
+def load_segments_frame(directory, prefix, start_seq=0):
+    """Bulk-load records with seq >= start_seq into one DataFrame indexed by sequence number."""
+    import pandas as pd
+
+    frames = []
+    for first_seq, path in _manifest_segments(directory, prefix, start_seq):
+        with _open_segment(path) as f:
+            lines = [line for line in f if line.endswith("\n")]
+        skip = max(start_seq - first_seq, 0)
+        if len(lines) <= skip:
+            continue
+        frame = pd.DataFrame.from_records([json.loads(line) for line in lines[skip:]])
+        frame.index = pd.RangeIndex(first_seq + skip, first_seq + len(lines))
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames)
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_EVERY = 100
+DEFAULT_SYNC_INTERVAL = 5.0
+DEFAULT_COMPACT_RATIO = 4
+DEFAULT_MIN_COMPACT_RECORDS = 10000
+
+class ProcessedUrlJournal:
+    """
+    Append-only journal of URL -> status ("berhasil" / "gagal").
+
+    Every status change is appended as one JSON line; the latest line for a URL
+    wins on replay. Writes are fsync'ed in batches, a torn last line left by a
+    crash is ignored on load, and the file is compacted (atomically rewritten
+    with one line per URL) once superseded lines outnumber live ones. Lookups
+    go through an in-memory dict, so membership checks are O(1).
+    """
+
+    def __init__(self, path, legacy_path=None, sync_every=DEFAULT_SYNC_EVERY, sync_interval=DEFAULT_SYNC_INTERVAL,
+                 compact_ratio=DEFAULT_COMPACT_RATIO, min_compact_records=DEFAULT_MIN_COMPACT_RECORDS):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+
+        self._entries = {}
+        self._records = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self._replay()
+        elif legacy_path is not None and Path(legacy_path).exists():
+            self._import_legacy(Path(legacy_path))
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._maybe_compact()
+
+    # ----- mapping interface -----
+
+    def get(self, url, default=None):
+        return self._entries.get(url, default)
+
+    def __getitem__(self, url):
+        return self._entries[url]
+
+    def __contains__(self, url):
+        return url in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        return self._entries.keys()
+
+    def items(self):
+        return self._entries.items()
+
+    def __setitem__(self, url, status):
+        if self._entries.get(url) == status:
+            return
+        self._entries[url] = status
+        self._file.write(json.dumps([url, status], ensure_ascii=False) + "\n")
+        self._records += 1
+        self._pending += 1
+
+    # ----- durability -----
+
+    def sync(self, force=False):
+        """fsync pending appends once enough records or time have accumulated."""
+        if not self._pending:
+            return
+        due = self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval
+        if not (force or due):
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._maybe_compact()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync(force=True)
+        self._file.close()
+
+    def compact(self):
+        """Atomically rewrite the journal with only the latest status per URL."""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for url, status in self._entries.items():
+                f.write(json.dumps([url, status], ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        if hasattr(self, "_file") and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        os.replace(tmp_path, self.path)
+        self._fsync_dir()
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._records = len(self._entries)
+        self._pending = 0
+        logger.info(f"Journal URL dipadatkan: {self._records} entri di {self.path}")
+
+    def _maybe_compact(self):
+        if self._records >= self.min_compact_records and self._records > self.compact_ratio * max(len(self._entries), 1):
+            self.compact()
+
+    def _fsync_dir(self):
+        try:
+            fd = os.open(self.path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # ----- loading -----
+
+    def _replay(self):
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Baris terakhir journal terpotong, dibuang ({self.path}:{line_number}).")
+                    break
+                valid_bytes += len(line)
+                try:
+                    url, status = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Baris journal rusak diabaikan ({self.path}:{line_number}).")
+                    continue
+                self._entries[url] = status
+                self._records += 1
+
+        # Drop a torn tail so the next append starts on a fresh line
+        if valid_bytes != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def _import_legacy(self, legacy_path):
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.error(f"Gagal membaca daftar URL lama {legacy_path}: {e}")
+            return
+        self._entries.update(legacy)
+        self.compact()
+        self._file.close()
+        logger.info(f"{len(self._entries)} URL dari {legacy_path} dipindahkan ke journal {self.path}")
@@ -0,0 +1,56 @@
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "src" / "scrapping"))
+import cleaningdata
+from crawlstats import StatsPublisher
+from segmentlog import SegmentWriter
+
+def article(doi, title):
+    return {"title": title, "abstract": "a\\/b", "authors": "B, A, A", "journal_conference_name": "IEEE Access",
+            "publisher": "IEEE", "year": "2020", "doi": doi, "group_name": "OpsA"}
+
+def use_dirs(monkeypatch, base):
+    """Point the merge at a scratch data tree."""
+    output_dir = base / "output"
+    cleaned_dir = base / "cleaned"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setattr(cleaningdata, "OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(cleaningdata, "ARTICLES_DIR", output_dir / "articles")
+    monkeypatch.setattr(cleaningdata, "CLEANED_DIR", cleaned_dir)
+    monkeypatch.setattr(cleaningdata, "MERGE_MANIFEST_PATH", cleaned_dir / "merge_manifest.json")
+    monkeypatch.setattr(cleaningdata, "MERGE_KEYS_PATH", cleaned_dir / "merge_keys.jsonl")
+    monkeypatch.setattr(cleaningdata, "STATS", StatsPublisher("cleaningdata", stats_dir=base / "stats"))
+    return cleaned_dir / "cleaned_articles.json"
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_merge_matches_full_rebuild(tmp_path, monkeypatch, seed):
+    rng = random.Random(seed)
+
+    def batch():
+        # Few distinct keys, so DOIs and titles collide separately and together
+        return [article(f"d{rng.randrange(30)}", f"t{rng.randrange(30)}") for _ in range(rng.randrange(1, 6))]
+
+    output_path = use_dirs(monkeypatch, tmp_path / "incremental")
+    legacy_files = 0
+    for _ in range(5):
+        with SegmentWriter(cleaningdata.ARTICLES_DIR, cleaningdata.ARTICLES_PREFIX) as writer:
+            writer.append(batch())
+        if rng.random() < 0.5:
+            legacy_files += 1
+            legacy_path = cleaningdata.OUTPUT_DIR / f"scraped_articles_{legacy_files:04d}.json"
+            legacy_path.write_text(json.dumps(batch()), encoding="utf-8")
+        cleaningdata.merge_and_clean_data()
+    incremental = output_path.read_bytes()
+
+    shutil.copytree(tmp_path / "incremental" / "output", tmp_path / "full" / "output")
+    output_path = use_dirs(monkeypatch, tmp_path / "full")
+    cleaningdata.merge_and_clean_data()
+
+    assert output_path.read_bytes() == incremental
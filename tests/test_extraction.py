@@ -0,0 +1,75 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "src" / "scrapping"))
+from extraction import extract_article, extract_embedded_article, join_authors, year_from_text, normalize_doi
+
+ARTICLE_URL = "https://ieeexplore.ieee.org/document/10400001/"
+
+def document_page(metadata, authors, title_html, abstract_html, pubdate, doi_href):
+    """
+    A /document/ page as the browser saves it: the rendered elements extract_article
+    reads, plus the embedded metadata the plain-HTTP fast path reads.
+    """
+    author_spans = "".join(f'<span _ngcontent-ng-c1131135293="">{name}</span>' for name in authors)
+    return f"""<html><head>
+<meta name="citation_title" content="fallback title">
+<script>xplGlobal.document.metadata={json.dumps(metadata)};</script>
+</head><body>
+<h1 class="document-title text-2xl-md-lh"><span>{title_html}</span></h1>
+<div class="authors-info-container">{author_spans}</div>
+<div class="abstract-text"><div xplmathjax="">{abstract_html}</div></div>
+<div class="u-pb-1 doc-abstract-pubdate"><strong>Date of Publication:</strong> {pubdate}</div>
+<div class="u-pb-1 stats-document-abstract-doi"><strong>DOI: </strong><a href="{doi_href}">{doi_href}</a></div>
+</body></html>"""
+
+PAGES = {
+    "plain": document_page(
+        {"title": "Topic Models for News", "abstract": "We study topic models.",
+         "authors": [{"name": "Budi Santoso"}, {"name": "Ani Wijaya"}],
+         "publicationDate": "15 January 2024", "publicationYear": "2024", "doi": "10.1109/ACCESS.2024.1000001"},
+        ["Budi Santoso", "Ani Wijaya"], "Topic Models for News", "We study topic models.",
+        "15 January 2024", "https://doi.org/10.1109/ACCESS.2024.1000001"
+    ),
+    "markup_and_entities": document_page(
+        {"title": "Fast <i>k</i>-Means on GPUs &amp; CPUs", "abstract": "<p>Results for <b>large</b> corpora.</p>",
+         "authors": [{"name": "Jürgen Müller"}, {"name": " Ani Wijaya "}, {"name": "Jürgen Müller"}],
+         "publicationDate": "3 March 2023", "publicationYear": "2023", "doi": "10.1109/ACCESS.2023.2000002"},
+        ["Jürgen M&uuml;ller", "Ani Wijaya", "Jürgen Müller"], "Fast <i>k</i>-Means on GPUs &amp; CPUs",
+        "<p>Results for <b>large</b> corpora.</p>", "3 March 2023", "https://doi.org/10.1109/ACCESS.2023.2000002"
+    ),
+}
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_fast_path_and_browser_path_store_the_same_article(name):
+    page_html = PAGES[name]
+    assert extract_embedded_article(page_html, ARTICLE_URL) == extract_article(page_html, ARTICLE_URL)
+
+def test_fast_path_falls_back_to_meta_tags():
+    page_html = """<html><head>
+<meta name="citation_title" content="Only Meta Tags">
+<meta name="citation_author" content="Wijaya, Ani"><meta name="citation_author" content="Budi">
+<meta name="citation_publication_date" content="2022/07/01">
+<meta name="citation_doi" content="10.1109/ACCESS.2022.3">
+</head><body></body></html>"""
+    article = extract_embedded_article(page_html, ARTICLE_URL)
+    assert article["title"] == "Only Meta Tags"
+    assert article["year"] == "2022"
+    assert article["doi"] == "https://doi.org/10.1109/ACCESS.2022.3"
+    assert article["abstract"] == "Abstract Not Found"
+
+def test_fast_path_without_title_needs_the_browser():
+    assert extract_embedded_article("<html><body>loading</body></html>", ARTICLE_URL) is None
+
+def test_shared_normalizers():
+    assert join_authors(["b", " a ", "", "b"]) == "a, b"
+    assert year_from_text("Date of Publication: 15 January 2024") == "2024"
+    assert year_from_text("2024/01/15") == "2024"
+    assert year_from_text("") == "Year Not Found"
+    assert normalize_doi(" 10.1/x ") == "https://doi.org/10.1/x"
+    assert normalize_doi("https://doi.org/10.1/x") == "https://doi.org/10.1/x"
+    assert normalize_doi(None) == "DOI Not Found"
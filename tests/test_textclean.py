@@ -0,0 +1,81 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "src" / "common"))
+from textclean import (
+    clean_authors,
+    clean_authors_column,
+    clean_text_columns,
+    remove_backslashes,
+    remove_backslashes_column,
+)
+
+# Article files already in the repo, in the shapes both pipelines read
+DATA_FILES = [
+    path for path in [
+        BASE_DIR / "data" / "raw" / "scrapped_articles.json",
+        BASE_DIR / "data" / "cleaned" / "cleaned_articles.json",
+        *sorted((BASE_DIR / "data" / "cleaned" / "clustered").glob("cluster_*.json")),
+    ]
+    if path.exists() and path.stat().st_size > 0 and not path.name.endswith("_topics.json")
+]
+
+def edge_case_frame():
+    """Inputs the data files may not contain: nulls, empty names, repeats, non-ASCII ordering, mixed types."""
+    return pd.DataFrame({
+        "authors": ["Zed, Ann; , ann,  Bob ;;, Ann", None, float("nan"), "", " ; , ;",
+                    "Émile, Zoë, Álvaro, Émile", "Single", "b,a,B,A"],
+        "title": ["A\\/B", "C\\\\D", None, "plain", "x", "y", "z", "w"],
+        "year": [2020, 2021, 2022, 2023, 2024, 2025, 2026, 2027],
+        "mixed": ["a\\b", 5, None, ["k\\"], "", 1.5, "\\/", None],
+    }, index=[10, 11, 12, 13, 14, 15, 16, 17])
+
+def load_frame(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return pd.DataFrame(data if isinstance(data, list) else [data])
+
+def same_value(got, want):
+    if isinstance(want, (list, dict)):
+        return got == want
+    if pd.isna(want):
+        return pd.isna(got)
+    return got == want
+
+def assert_authors_match(series):
+    actual = clean_authors_column(series)
+    assert list(actual.index) == list(series.index)
+    for label, got, want in zip(series.index, actual.astype(object), series.apply(clean_authors)):
+        assert got == want, f"row {label}: {got!r} != {want!r}"
+
+def assert_backslashes_match(df):
+    actual = clean_text_columns(df)
+    expected = df.map(remove_backslashes)
+    for column in df.columns:
+        for label, got, want in zip(df.index, actual[column].astype(object), expected[column]):
+            assert same_value(got, want), f"{column}[{label}]: {got!r} != {want!r}"
+
+def test_clean_authors_column_matches_clean_authors():
+    assert_authors_match(edge_case_frame()["authors"])
+
+def test_remove_backslashes_column_matches_remove_backslashes():
+    title = edge_case_frame()["title"]
+    actual = remove_backslashes_column(title)
+    for label, got, want in zip(title.index, actual.astype(object), title.map(remove_backslashes)):
+        assert same_value(got, want), f"row {label}: {got!r} != {want!r}"
+
+def test_clean_text_columns_matches_per_cell():
+    assert_backslashes_match(edge_case_frame())
+
+@pytest.mark.parametrize("path", DATA_FILES, ids=lambda path: path.name)
+def test_kernels_match_on_repo_data(path):
+    df = load_frame(path)
+    for column in ("authors", "Author"):
+        if column in df.columns:
+            assert_authors_match(df[column])
+    assert_backslashes_match(df)